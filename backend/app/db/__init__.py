@@ -1,4 +1,5 @@
 from .sql_alchelmy import DBManager
-from .models import ChatHistory, Youtube, Audio, TablenameEnum
+from .async_manager import AsyncDBManager
+from .models import ChatHistory, Youtube, Audio, Summary, IngestionJob, TablenameEnum
 
-__all__ = ["DBManager", "ChatHistory", "Youtube", "Audio", "TablenameEnum"]
\ No newline at end of file
+__all__ = ["DBManager", "AsyncDBManager", "ChatHistory", "Youtube", "Audio", "Summary", "IngestionJob", "TablenameEnum"]
\ No newline at end of file
@@ -0,0 +1,152 @@
+"""asyncpg-backed counterpart of DBManager for the chat hot path.
+
+Chat history reads and writes await the database directly instead of
+occupying an I/O pool thread per query. It shares DBManager's models,
+statements and pool settings; enable it with DB_ASYNC=true (needs asyncpg).
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, Sequence, Type
+
+from sqlalchemy import DateTime, delete, insert, text
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.db.sql_alchelmy import PoolTiming, filter_criteria, page_statement, pool_options, pool_stats
+from config import settings
+
+
+class TimedAsyncAdaptedQueuePool(PoolTiming, AsyncAdaptedQueuePool):
+    pass
+
+
+def async_database_url(db_url: str):
+    """The same database through asyncpg (which spells libpq's sslmode as ssl)."""
+    url = make_url(db_url).set(drivername="postgresql+asyncpg")
+    if "sslmode" in url.query:
+        query = dict(url.query)
+        query["ssl"] = query.pop("sslmode")
+        url = url.set(query=query)
+    return url
+
+
+def _row_values(model: Type[Any], item: Any) -> Dict[str, Any]:
+    """
+    item.model_dump() with aware datetimes made naive UTC for DateTime columns
+    without a timezone: psycopg2 drops the offset itself, asyncpg refuses them.
+    """
+    values = item.model_dump()
+    for name, value in values.items():
+        column = model.__table__.columns.get(name)
+        if (isinstance(value, datetime) and value.tzinfo is not None and column is not None
+                and isinstance(column.type, DateTime) and not column.type.timezone):
+            values[name] = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return values
+
+
+class AsyncDBManager:
+    def __init__(self, db_url: str):
+        server_settings = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS:
+            server_settings["statement_timeout"] = str(settings.DB_STATEMENT_TIMEOUT_MS)
+        self.engine = create_async_engine(
+            async_database_url(db_url),
+            poolclass=TimedAsyncAdaptedQueuePool,
+            connect_args={"server_settings": server_settings},
+            **pool_options()
+        )
+        self.SessionLocal = async_sessionmaker(bind=self.engine, expire_on_commit=False)
+
+    async def insert_data(self, model: Type[Any], data: Any):
+        async with self.SessionLocal() as session:
+            try:
+                instance = model(**_row_values(model, data))
+                session.add(instance)
+                await session.commit()
+                return instance
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise RuntimeError(f"Failed to insert data: {e}")
+
+    async def bulk_insert(self, model: Type[Any], items: Sequence[Any]) -> int:
+        """Insert many schema objects in one transaction (a single executemany); returns the row count."""
+        if not items:
+            return 0
+        async with self.SessionLocal() as session:
+            try:
+                await session.execute(insert(model), [_row_values(model, item) for item in items])
+                await session.commit()
+                return len(items)
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise RuntimeError(f"Failed to insert data: {e}")
+
+    async def select_page(self, model: Type[Any], columns: Sequence[str], order_by: Sequence[str], limit: int,
+                          before: Optional[Sequence[Any]] = None, **filters):
+        """See DBManager.select_page."""
+        async with self.SessionLocal() as session:
+            try:
+                result = await session.execute(page_statement(model, columns, order_by, limit, before, **filters))
+                return result.all()
+            except SQLAlchemyError as e:
+                raise RuntimeError(f"Failed to select data: {e}")
+
+    async def delete_where(self, model: Type[Any], **filters) -> int:
+        """See DBManager.delete_where."""
+        if not filters:
+            raise ValueError("delete_where needs at least one filter")
+        async with self.SessionLocal() as session:
+            try:
+                result = await session.execute(delete(model).where(*filter_criteria(model, filters)))
+                await session.commit()
+                return result.rowcount
+            except SQLAlchemyError as e:
+                await session.rollback()
+                raise RuntimeError(f"Failed to delete data: {e}")
+
+    async def warm_pool(self, connections: int = 1) -> int:
+        """Open up to `connections` pooled connections (SELECT 1 on each) and return them to the pool."""
+        opened = []
+        try:
+            for _ in range(max(1, connections)):
+                conn = await self.engine.connect()
+                opened.append(conn)
+                await conn.execute(text("SELECT 1"))
+            return len(opened)
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Failed to warm connection pool: {e}")
+        finally:
+            for conn in opened:
+                await conn.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return pool_stats(self.engine.sync_engine.pool)
+
+    async def aclose(self):
+        await self.engine.dispose()
+
+
+_async_db_manager: Optional[AsyncDBManager] = None
+
+
+def get_async_db_manager() -> Optional[AsyncDBManager]:
+    """Process-wide async manager, or None when DB_ASYNC is off (chat history goes through DBManager)."""
+    global _async_db_manager
+    if not settings.DB_ASYNC:
+        return None
+    if _async_db_manager is None:
+        _async_db_manager = AsyncDBManager(settings.DATABASE_URI)
+    return _async_db_manager
+
+
+def peek_async_db_manager() -> Optional[AsyncDBManager]:
+    """The manager if one was created, without creating it (for metrics)."""
+    return _async_db_manager
+
+
+async def close_async_db_manager():
+    global _async_db_manager
+    if _async_db_manager is not None:
+        await _async_db_manager.aclose()
+        _async_db_manager = None
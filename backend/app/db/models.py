@@ -1,5 +1,5 @@
 from app.db.sql_alchelmy import Base
-from sqlalchemy import Column, Integer, String, DateTime, Text
+from sqlalchemy import Column, Integer, String, DateTime, Text, JSON, Index, UniqueConstraint
 from app.enums import TablenameEnum
 
 class ChatHistory(Base):
@@ -10,6 +10,9 @@ class ChatHistory(Base):
     file_id = Column(String, nullable=True)  # video_id or audio file_id
     created_at = Column(DateTime, nullable=False)
 
+    # History is read newest-first per file; id breaks created_at ties for keyset pagination
+    __table_args__ = (Index("ix_conversations_file_id_created_at", "file_id", "created_at", "id"),)
+
     def __repr__(self):
         return f"""ChatHistory(id={self.id}, role={self.role}, file_id={self.file_id}, created_at={self.created_at})"""
 
@@ -20,6 +23,7 @@ class Youtube(Base):
     video_id = Column(String, nullable=False, unique=True, index=True)  # Add unique constraint
     content = Column(Text, nullable=False)  # Use Text for large content
     url = Column(String, nullable=False)
+    chunk_count = Column(Integer, nullable=True)  # Number of chunks in the vector store
     created_at = Column(DateTime, nullable=False)
 
     def __repr__(self):
@@ -30,8 +34,50 @@ class Audio(Base):
     __tablename__ = TablenameEnum.AUDIO.value
     id = Column(Integer, primary_key=True, autoincrement=True, index=True)
     file_id = Column(String, nullable=False, unique=True, index=True)  # Add unique constraint
+    content_hash = Column(String, nullable=True, unique=True, index=True)  # sha256 of the uploaded bytes
     content = Column(Text, nullable=False)  # Use Text for large content
+    chunk_count = Column(Integer, nullable=True)  # Number of chunks in the vector store
     created_at = Column(DateTime, nullable=False)
 
     def __repr__(self):
-        return f"""Audio(id={self.id}, file_id={self.file_id}, created_at={self.created_at})"""
\ No newline at end of file
+        return f"""Audio(id={self.id}, file_id={self.file_id}, created_at={self.created_at})"""
+
+
+class Summary(Base):
+    __tablename__ = TablenameEnum.SUMMARIES.value
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    file_id = Column(String, nullable=False, index=True)  # video_id or audio file_id
+    template_version = Column(String, nullable=False)  # Bumped whenever the summary prompt changes
+    model = Column(String, nullable=False)  # "<provider>:<model>"
+    summary = Column(Text, nullable=False)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=True)  # NULL never expires
+
+    __table_args__ = (UniqueConstraint("file_id", "template_version", "model", name="uq_summaries_key"),)
+
+    def __repr__(self):
+        return f"""Summary(id={self.id}, file_id={self.file_id}, template_version={self.template_version}, model={self.model})"""
+
+
+class IngestionJob(Base):
+    __tablename__ = TablenameEnum.INGESTION_JOBS.value
+    id = Column(String, primary_key=True)  # uuid4 hex, returned to the client as job_id
+    kind = Column(String, nullable=False)  # "youtube" or "audio"
+    status = Column(String, nullable=False)  # queued, running, succeeded or failed
+    stage = Column(String, nullable=True)  # Stage currently running
+    progress = Column(JSON, nullable=False, default=dict)  # Stage name -> status and timestamps
+    payload = Column(JSON, nullable=False)  # Handler arguments: url/query or spooled upload path
+    result = Column(JSON, nullable=True)
+    error = Column(Text, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    worker_id = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), nullable=False)
+    updated_at = Column(DateTime(timezone=True), nullable=False)  # Doubles as the worker heartbeat
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Workers claim the oldest queued job
+    __table_args__ = (Index("ix_ingestion_jobs_status_created_at", "status", "created_at"),)
+
+    def __repr__(self):
+        return f"""IngestionJob(id={self.id}, kind={self.kind}, status={self.status}, stage={self.stage})"""
\ No newline at end of file
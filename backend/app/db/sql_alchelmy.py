@@ -1,26 +1,99 @@
-from sqlalchemy import create_engine, pool
+import time
+from sqlalchemy import create_engine, pool, text, tuple_, delete, insert, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from config import settings
 from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.exc import SQLAlchemyError
-from typing import Any, Type, Dict, List, Optional
+from sqlalchemy.exc import SQLAlchemyError, TimeoutError as PoolTimeoutError
+from typing import Any, Type, Dict, List, Optional, Sequence
 from functools import lru_cache
 
 
+class PoolTiming:
+    """Pool mixin recording how long checkouts wait for a connection (including opening a new one)."""
+    checkouts = 0
+    timeouts = 0
+    wait_ms_total = 0.0
+    wait_ms_max = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            waited = (time.perf_counter() - start) * 1000
+            self.checkouts += 1
+            self.wait_ms_total += waited
+            self.wait_ms_max = max(self.wait_ms_max, waited)
+
+
+class TimedQueuePool(PoolTiming, pool.QueuePool):
+    pass
+
+
+def pool_stats(engine_pool) -> Dict[str, Any]:
+    """Occupancy and checkout wait of a (Timed)QueuePool."""
+    checkouts = getattr(engine_pool, "checkouts", 0)
+    return {
+        "size": engine_pool.size(),
+        "checked_out": engine_pool.checkedout(),
+        "checked_in": engine_pool.checkedin(),
+        "overflow": max(0, engine_pool.overflow()),
+        "checkouts": checkouts,
+        "timeouts": getattr(engine_pool, "timeouts", 0),
+        "wait_ms_mean": round(engine_pool.wait_ms_total / checkouts, 3) if checkouts else 0.0,
+        "wait_ms_max": round(getattr(engine_pool, "wait_ms_max", 0.0), 3),
+    }
+
+
+def pool_options() -> Dict[str, Any]:
+    """Engine pool arguments from settings, shared by the sync and async engines."""
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Verify connections before using (one round trip)
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+    }
+
+
 _engine = None
 
 def get_engine(db_url: str):
     global _engine
     if _engine is None:
+        connect_args = {}
+        if settings.DB_STATEMENT_TIMEOUT_MS and db_url.startswith("postgres"):
+            connect_args["options"] = f"-c statement_timeout={settings.DB_STATEMENT_TIMEOUT_MS}"
         _engine = create_engine(
             db_url,
-            poolclass=pool.QueuePool,
-            pool_size=5,
-            max_overflow=10,
-            pool_pre_ping=True,  # Verify connections before using
-            pool_recycle=3600   # Recycle connections after 1 hour
+            poolclass=TimedQueuePool,
+            connect_args=connect_args,
+            **pool_options()
         )
     return _engine
 
+
+def filter_criteria(model: Type[Any], filters: Dict[str, Any]) -> list:
+    """Equality filters; a list, tuple or set value matches any of its items (IN)."""
+    return [
+        getattr(model, name).in_(list(value)) if isinstance(value, (list, tuple, set)) else
+        getattr(model, name) == value
+        for name, value in filters.items()
+    ]
+
+
+def page_statement(model: Type[Any], columns: Sequence[str], order_by: Sequence[str], limit: int,
+                   before: Optional[Sequence[Any]] = None, **filters):
+    """SELECT for DBManager.select_page (and its async counterpart)."""
+    keys = [getattr(model, name) for name in order_by]
+    statement = select(*(getattr(model, name) for name in columns)).where(*filter_criteria(model, filters))
+    if before is not None:
+        statement = statement.where(tuple_(*keys) < tuple_(*before))
+    return statement.order_by(*(key.desc() for key in keys)).limit(limit)
+
 Base = declarative_base()
 
 class DBManager:
@@ -77,6 +150,56 @@ class DBManager:
         finally:
             session.close()
     
+    def insert_ignore(self, model: Type[Any], data: Any) -> bool:
+        """
+        INSERT ... ON CONFLICT DO NOTHING: False when a row with the same unique
+        key already exists, so concurrent inserts of one record are idempotent.
+        """
+        session = self._get_session_context()
+        try:
+            result = session.execute(pg_insert(model).values(**data.model_dump()).on_conflict_do_nothing())
+            session.commit()
+            return result.rowcount == 1
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to insert data: {e}")
+        finally:
+            session.close()
+
+    def bulk_insert(self, model: Type[Any], items: Sequence[Any]) -> int:
+        """Insert many schema objects in one transaction (a single executemany); returns the row count."""
+        if not items:
+            return 0
+        session = self._get_session_context()
+        try:
+            session.execute(insert(model), [item.model_dump() for item in items])
+            session.commit()
+            return len(items)
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to insert data: {e}")
+        finally:
+            session.close()
+
+    def delete_where(self, model: Type[Any], **filters) -> int:
+        """
+        DELETE every record matching the filters in a single statement; returns
+        the number of rows deleted. A list or tuple value matches any of its
+        items (IN). Refuses to run without filters (it would empty the table).
+        """
+        if not filters:
+            raise ValueError("delete_where needs at least one filter")
+        session = self._get_session_context()
+        try:
+            result = session.execute(delete(model).where(*filter_criteria(model, filters)))
+            session.commit()
+            return result.rowcount
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to delete data: {e}")
+        finally:
+            session.close()
+
     def delete_data(self, model: Type[Any], record_id: Any):
         session = self._get_session_context()
         try:
@@ -115,6 +238,61 @@ class DBManager:
         finally:
             session.close()
         
+    def filter_in(self, model: Type[Any], column: str, values: List[Any]):
+        """Return records whose `column` is one of `values`, in a single query."""
+        session = self._get_session_context()
+        try:
+            return session.query(model).filter(getattr(model, column).in_(list(values))).all()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to filter data: {e}")
+        finally:
+            session.close()
+
+    def select_columns(self, *columns, **filters):
+        """Return lightweight row tuples for the given columns (no ORM instances), optionally filtered."""
+        session = self._get_session_context()
+        try:
+            query = session.query(*columns)
+            if filters:
+                query = query.filter_by(**filters)
+            return query.all()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to select data: {e}")
+        finally:
+            session.close()
+
+    def select_page(self, model: Type[Any], columns: Sequence[str], order_by: Sequence[str], limit: int,
+                    before: Optional[Sequence[Any]] = None, **filters):
+        """
+        Newest-first page of lightweight row tuples: SELECT columns WHERE filters
+        ORDER BY order_by DESC LIMIT limit.
+
+        `before` holds the order_by values of the last row of the previous page
+        (keyset pagination), so every page is one index range scan however far
+        back it is. order_by should end in a unique column.
+        """
+        session = self._get_session_context()
+        try:
+            return session.execute(page_statement(model, columns, order_by, limit, before, **filters)).all()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to select data: {e}")
+        finally:
+            session.close()
+
+    def get_first(self, model: Type[Any], **kwargs):
+        """Return the first record matching the filters, or None."""
+        session = self._get_session_context()
+        try:
+            return session.query(model).filter_by(**kwargs).first()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to filter data: {e}")
+        finally:
+            session.close()
+
     def update(self, model: Type[Any], record_id: Any, data: Any):
         """
         Update an existing record by ID.
@@ -137,6 +315,24 @@ class DBManager:
         finally:
             session.close()
 
+    def warm_pool(self, connections: int = 1) -> int:
+        """Open up to `connections` pooled connections (SELECT 1 on each) and return them to the pool."""
+        opened = []
+        try:
+            for _ in range(max(1, connections)):
+                conn = self.engine.connect()
+                opened.append(conn)
+                conn.execute(text("SELECT 1"))
+            return len(opened)
+        except SQLAlchemyError as e:
+            raise RuntimeError(f"Failed to warm connection pool: {e}")
+        finally:
+            for conn in opened:
+                conn.close()
+
+    def pool_stats(self) -> Dict[str, Any]:
+        return pool_stats(self.engine.pool)
+
 
 
 # from sqlalchemy import create_engine, pool
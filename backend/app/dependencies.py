@@ -4,9 +4,16 @@ from app.db import DBManager
 from fastapi import Depends
 from typing import Annotated
 from app.ingestion import IngestionManager
+from app.ingestion.cache import IngestionCache
+from app.ingestion.manifest import ContentManifest, get_content_manifest
+from app.ingestion.pipeline import IngestionPipeline
+from app.jobs import JobStore
+from app.jobs.tasks import IngestionServices
 from app.retriever import RetrievalManager
 from app.embeddings import EmbeddingManager
 from app.embeddings.vectorstore import VectorStore
+from app.llm import LLMProvider
+from app.llm.registry import get_llm_registry
 
 
 _db_manager = None
@@ -29,17 +36,58 @@ def get_ingestion_manager():
         _ingestion_manager = IngestionManager()
     return _ingestion_manager
 
+def get_ingestion_cache(db_manager: Annotated[DBManager, Depends(get_db_manager)]):
+    return IngestionCache(db_manager=db_manager)
+
 def get_embedding_manager():
     global _embedding_manager
     if _embedding_manager is None:
         _embedding_manager = EmbeddingManager()
     return _embedding_manager 
 
+def get_ingestion_pipeline(embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)]):
+    settings = get_settings()
+    return IngestionPipeline(
+        embedding_manager=embedding_manager,
+        batch_size=settings.INGEST_BATCH_SIZE,
+        queue_size=settings.INGEST_QUEUE_SIZE
+    )
+
+def get_job_store(db_manager: Annotated[DBManager, Depends(get_db_manager)]):
+    return JobStore(db_manager=db_manager)
+
+def get_llm_provider() -> LLMProvider:
+    """Shared async LLM provider owned by the lifespan-managed client registry."""
+    return get_llm_registry().provider
+
 def get_vector_store(embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)]):
     return VectorStore(embedding_manager=embedding_manager)
 
-def get_retrieval_manager(vector_store: Annotated[VectorStore, Depends(get_vector_store)]):
-    return RetrievalManager(vector_store=vector_store)
+def get_retrieval_manager(
+        vector_store: Annotated[VectorStore, Depends(get_vector_store)],
+        llm: Annotated[LLMProvider, Depends(get_llm_provider)]
+):
+    return RetrievalManager(vector_store=vector_store, llm=llm)
+
+def get_ingestion_services(
+        ingestion_manager: Annotated[IngestionManager, Depends(get_ingestion_manager)],
+        embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)],
+        db_manager: Annotated[DBManager, Depends(get_db_manager)],
+        llm: Annotated[LLMProvider, Depends(get_llm_provider)],
+        ingestion_cache: Annotated[IngestionCache, Depends(get_ingestion_cache)],
+        manifest: Annotated[ContentManifest, Depends(get_content_manifest)],
+        pipeline: Annotated[IngestionPipeline, Depends(get_ingestion_pipeline)]
+) -> IngestionServices:
+    """Everything an ingestion run needs, for the endpoints and the job workers alike."""
+    return IngestionServices(
+        ingestion_manager=ingestion_manager,
+        embedding_manager=embedding_manager,
+        db_manager=db_manager,
+        llm=llm,
+        ingestion_cache=ingestion_cache,
+        manifest=manifest,
+        pipeline=pipeline
+    )
 
    
 
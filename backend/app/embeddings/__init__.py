@@ -1,44 +1,95 @@
-"""Generate embeddings for text using SentenceTransformers."""
+"""Generate embeddings for text using SentenceTransformers (PyTorch) or ONNX Runtime."""
 
-from sentence_transformers import SentenceTransformer
+import numpy as np
 from typing import List
 from functools import lru_cache
 
+from app.embeddings.cache import EmbeddingCache, cache_key, get_embedding_cache
+from app.embeddings.engines import encode_token_budgeted, load_encoder
+from config import settings
+
 _model_cache = {}   # Cache for loaded models
 
 class EmbeddingManager:
     # Use smaller model for production with limited RAM
-    def __init__(self, model_name: str = "all-MiniLM-L6-v2"):  # This is already small (~80MB)
+    def __init__(self, model_name: str = "all-MiniLM-L6-v2",  # This is already small (~80MB)
+                 cache: EmbeddingCache = None, engine: str = None):
         self.model_name = model_name
+        self.engine = (engine or settings.EMBEDDING_ENGINE).lower()
+        # int8 ONNX vectors are close to, not identical with, torch ones; keep their cache entries apart
+        self.cache_name = model_name if self.engine == "torch" else f"{model_name}@{self.engine}"
         self._model = None
+        self.cache = cache if cache is not None else get_embedding_cache()
     
     @property
     def model(self):
         """Lazy load model only when needed"""
         if self._model is None:
-            if self.model_name not in _model_cache:
-                print(f"Loading embedding model: {self.model_name}...")
-                _model_cache[self.model_name] = SentenceTransformer(self.model_name)
+            if self.cache_name not in _model_cache:
+                print(f"Loading embedding model: {self.model_name} ({self.engine})...")
+                _model_cache[self.cache_name] = load_encoder(
+                    self.engine,
+                    self.model_name,
+                    onnx_dir=settings.EMBEDDING_ONNX_DIR,
+                    max_length=settings.EMBEDDING_MAX_SEQ_LENGTH,
+                    intra_op_threads=settings.EMBEDDING_ONNX_THREADS
+                )
                 print(f"Embedding model loaded successfully!")
-            self._model = _model_cache[self.model_name]
+            self._model = _model_cache[self.cache_name]
         return self._model
     
     @model.setter
     def model(self, value):
         self._model = value
     
-    def create_embeddings(self, documents: List[str]):
+    def create_embeddings(self, documents: List[str], token_budget: int = None, bulk: bool = False):
+        """
+        Embed documents, encoding only the texts that are not already cached.
+
+        With token_budget, misses are encoded in length-bucketed batches capped
+        by padded tokens instead of a fixed batch size (see create_embeddings_bulk).
+        With bulk, the vectors bypass the memory tier of the cache (disk only).
+        """
         try:
-            # Disable progress bar and batch encode to save memory
-            embeddings = self.model.encode(
-                documents, 
-                show_progress_bar=False,
-                batch_size=32  # Process in smaller batches
-            )
-            return embeddings
+            cached = self.cache.get_many(self.cache_name, documents, memory=not bulk)
+            # Encode each distinct missing text once, even if repeated in the batch
+            missing = {}
+            for i, vector in enumerate(cached):
+                if vector is None:
+                    missing.setdefault(cache_key(self.cache_name, documents[i]), []).append(i)
+
+            if missing:
+                texts = [documents[positions[0]] for positions in missing.values()]
+                if token_budget:
+                    encoded = encode_token_budgeted(
+                        self.model,
+                        texts,
+                        max_tokens=token_budget,
+                        max_batch_size=settings.EMBEDDING_BULK_MAX_BATCH_SIZE,
+                        max_length=settings.EMBEDDING_MAX_SEQ_LENGTH
+                    )
+                else:
+                    # Disable progress bar and batch encode to save memory
+                    encoded = self.model.encode(
+                        texts,
+                        show_progress_bar=False,
+                        batch_size=32  # Process in smaller batches
+                    )
+                self.cache.put_many(self.cache_name, texts, encoded, memory=not bulk)
+                for positions, vector in zip(missing.values(), encoded):
+                    for i in positions:
+                        cached[i] = vector
+
+            if not cached:
+                return np.empty((0, 0), dtype=np.float32)
+            return np.vstack(cached).astype(np.float32, copy=False)
         except Exception as e:
             raise RuntimeError(f"Failed to create embeddings: {e}")
 
+    def create_embeddings_bulk(self, documents: List[str]):
+        """Ingestion-time embedding of many chunks, batched by token budget."""
+        return self.create_embeddings(documents, token_budget=settings.EMBEDDING_BULK_TOKEN_BUDGET, bulk=True)
+
 
 
 
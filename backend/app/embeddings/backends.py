@@ -0,0 +1,65 @@
+"""Vector backend selection: Chroma Cloud or the in-process FAISS store.
+
+Both backends expose the same collection API used by VectorStore:
+upsert(ids, embeddings, metadatas, documents), query(query_embeddings,
+n_results, where), get(ids, where, include), delete(ids, where) and count().
+"""
+import os
+import threading
+from functools import lru_cache
+from typing import Dict
+
+import chromadb
+
+from config import settings
+
+_faiss_collections: Dict[str, "FaissCollection"] = {}
+_faiss_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def get_chroma_client():
+    return chromadb.CloudClient(
+        api_key=settings.CHROMA_API_KEY,
+        tenant=settings.CHROMA_TENANT,
+        database=settings.CHROMA_DATABASE
+    )
+
+
+def get_faiss_collection(name: str):
+    """Open (once per process) the on-disk FAISS collection with this name."""
+    from app.embeddings.faiss_store import FaissCollection
+
+    with _faiss_lock:
+        if name not in _faiss_collections:
+            _faiss_collections[name] = FaissCollection(
+                name=name,
+                directory=os.path.join(settings.FAISS_INDEX_DIR, name),
+                index_type=settings.FAISS_INDEX_TYPE,
+                hnsw_m=settings.FAISS_HNSW_M,
+                hnsw_ef_search=settings.FAISS_HNSW_EF_SEARCH,
+                ivf_nlist=settings.FAISS_IVF_NLIST,
+                ivf_nprobe=settings.FAISS_IVF_NPROBE,
+                persist_every=settings.FAISS_PERSIST_EVERY,
+                persist_seconds=settings.FAISS_PERSIST_SECONDS,
+            )
+            print(f"📂 FAISS collection '{name}' opened ({settings.FAISS_INDEX_TYPE})")
+        return _faiss_collections[name]
+
+
+def get_collection(name: str):
+    """Return the collection for the configured VECTOR_BACKEND."""
+    backend = (settings.VECTOR_BACKEND or "chroma").lower()
+    if backend == "chroma":
+        return get_chroma_client().get_collection(name)
+    if backend == "faiss":
+        return get_faiss_collection(name)
+    raise ValueError(f"Unsupported VECTOR_BACKEND: {settings.VECTOR_BACKEND}")
+
+
+def close_collections():
+    """Close local collections on shutdown."""
+    with _faiss_lock:
+        for collection in _faiss_collections.values():
+            collection.close()
+        _faiss_collections.clear()
@@ -0,0 +1,160 @@
+"""Dynamic micro-batching for query embeddings.
+
+Concurrent callers enqueue single texts; one worker task flushes a batch when
+it reaches max_batch_size or when the oldest text has waited max_wait_ms,
+encodes it in one forward pass on the CPU pool, and resolves each caller's
+future with its own row.
+"""
+import asyncio
+import time
+from bisect import bisect_left
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.embeddings import EmbeddingManager
+from app.executors import run_cpu
+from config import settings
+
+
+class Histogram:
+    """Fixed-bucket histogram: per-bucket counts keyed by upper bound, plus count and sum."""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = list(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)  # Last bucket is +Inf
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def to_dict(self) -> dict:
+        labels = [str(bound) for bound in self.bounds] + ["+Inf"]
+        return {
+            "buckets": dict(zip(labels, self.counts)),
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else 0.0,
+        }
+
+
+_Pending = Tuple[str, asyncio.Future, float]
+
+
+class EmbeddingBatcher:
+    def __init__(self, embedding_manager: EmbeddingManager, max_batch_size: int = 32, max_wait_ms: float = 5.0):
+        self.embedding_manager = embedding_manager
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64])
+        self.queue_wait_ms = Histogram([0.5, 1, 2, 5, 10, 25, 50, 100, 250, 1000])
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._queue = self._queue or asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+
+    async def embed(self, text: str) -> np.ndarray:
+        """Embed one text, batched with whatever else arrives within max_wait_ms."""
+        self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((text, future, time.perf_counter()))
+        return await future
+
+    async def _collect(self) -> List[_Pending]:
+        batch = [await self._queue.get()]
+        deadline = batch[0][2] + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                # Take whatever is already queued without waiting any longer
+                while len(batch) < self.max_batch_size and not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _run(self):
+        while True:
+            batch = await self._collect()
+            # Callers that gave up (client disconnected) are dropped before encoding
+            batch = [item for item in batch if not item[1].done()]
+            if not batch:
+                continue
+
+            now = time.perf_counter()
+            self.batch_sizes.observe(len(batch))
+            for _, _, enqueued_at in batch:
+                self.queue_wait_ms.observe((now - enqueued_at) * 1000)
+
+            try:
+                vectors = await run_cpu(self.embedding_manager.create_embeddings, [text for text, _, _ in batch])
+            except Exception as e:
+                for _, future, _ in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future, _), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector)
+
+    def stats(self) -> dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "queued": self._queue.qsize() if self._queue else 0,
+            "batch_size": self.batch_sizes.to_dict(),
+            "queue_wait_ms": self.queue_wait_ms.to_dict(),
+        }
+
+    async def aclose(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # Fail anyone still waiting rather than leaving them hanging
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            if not future.done():
+                future.set_exception(RuntimeError("Embedding batcher is shutting down"))
+
+
+_batcher: Optional[EmbeddingBatcher] = None
+
+
+def get_query_batcher() -> EmbeddingBatcher:
+    """Process-wide batcher for query embeddings, over the shared EmbeddingManager."""
+    global _batcher
+    if _batcher is None:
+        from app.dependencies import get_embedding_manager  # app.dependencies imports the retriever
+
+        _batcher = EmbeddingBatcher(
+            get_embedding_manager(),
+            max_batch_size=settings.EMBED_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMBED_BATCH_MAX_WAIT_MS
+        )
+    return _batcher
+
+
+def peek_query_batcher() -> Optional[EmbeddingBatcher]:
+    """The batcher if one was created, without creating it (for metrics)."""
+    return _batcher
+
+
+async def close_query_batcher():
+    global _batcher
+    if _batcher is not None:
+        await _batcher.aclose()
+        _batcher = None
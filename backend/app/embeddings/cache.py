@@ -0,0 +1,169 @@
+"""Two-tier cache for embedding vectors: in-memory LRU with a byte budget, optional float16 disk store."""
+import hashlib
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from config import settings
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Normalize text before hashing so trivially different strings share an entry."""
+    return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+def cache_key(model_name: str, text: str) -> str:
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Caches embeddings by (model_name, normalized text hash).
+
+    The memory tier holds float32 vectors and evicts least recently used
+    entries once max_bytes is exceeded. When disk_dir is set, every vector is
+    also written there as a float16 .npy file, so entries survive restarts
+    and memory evictions at half the size. Bulk (ingestion) reads and writes
+    pass memory=False and only use the disk tier, so a large ingest cannot
+    evict the hot query vectors.
+    """
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir or None
+        self._entries: "OrderedDict[str, np.ndarray]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        if self.disk_dir:
+            os.makedirs(self.disk_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------ memory
+    def _remember(self, key: str, vector: np.ndarray):
+        if vector.nbytes > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._bytes -= previous.nbytes
+        self._entries[key] = vector
+        self._bytes += vector.nbytes
+        while self._bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    # -------------------------------------------------------------------- disk
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.npy")
+
+    def _read_disk(self, key: str) -> Optional[np.ndarray]:
+        try:
+            return np.load(self._disk_path(key)).astype(np.float32)
+        except (OSError, ValueError):
+            return None
+
+    def _write_disk(self, key: str, vector: np.ndarray):
+        path = self._disk_path(key)
+        if os.path.exists(path):
+            return
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                np.save(f, vector.astype(np.float16))
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"⚠️  Could not write embedding cache entry: {e}")
+
+    # --------------------------------------------------------------------- api
+    def get_many(self, model_name: str, texts: Sequence[str], memory: bool = True) -> List[Optional[np.ndarray]]:
+        """
+        Return the cached vector for each text, or None where it is missing.
+
+        With memory=False, disk hits are not promoted into the memory tier.
+        """
+        keys = [cache_key(model_name, text) for text in texts]
+        results: List[Optional[np.ndarray]] = []
+        missing: Dict[int, str] = {}
+        with self._lock:
+            for i, key in enumerate(keys):
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                elif self.disk_dir:
+                    missing[i] = key
+                else:
+                    self.misses += 1
+                results.append(vector)
+
+        # Disk reads happen outside the lock
+        for i, key in missing.items():
+            vector = self._read_disk(key)
+            with self._lock:
+                if vector is None:
+                    self.misses += 1
+                else:
+                    self.disk_hits += 1
+                    if memory:
+                        self._remember(key, vector)
+            results[i] = vector
+        return results
+
+    def put_many(self, model_name: str, texts: Sequence[str], vectors: Sequence[np.ndarray], memory: bool = True):
+        """Cache vectors; with memory=False they go to the disk tier only (and nowhere without one)."""
+        keys = [cache_key(model_name, text) for text in texts]
+        # Own copies: rows of the encoded batch would otherwise keep the whole matrix alive
+        stored = [np.array(vector, dtype=np.float32, copy=True) for vector in vectors]
+        if memory:
+            with self._lock:
+                for key, vector in zip(keys, stored):
+                    self._remember(key, vector)
+        if self.disk_dir:
+            for key, vector in zip(keys, stored):
+                self._write_disk(key, vector)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "disk_enabled": self.disk_dir is not None,
+            }
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+
+
+def get_embedding_cache() -> EmbeddingCache:
+    global _embedding_cache
+    if _embedding_cache is None:
+        _embedding_cache = EmbeddingCache(
+            max_bytes=settings.EMBEDDING_CACHE_MAX_BYTES,
+            disk_dir=settings.EMBEDDING_CACHE_DIR
+        )
+    return _embedding_cache
+
+
+def peek_embedding_cache() -> Optional[EmbeddingCache]:
+    """The cache if one was created, without creating it (for metrics)."""
+    return _embedding_cache
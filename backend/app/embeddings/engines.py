@@ -0,0 +1,125 @@
+"""Embedding engines: PyTorch SentenceTransformer, or an int8-quantized ONNX Runtime export.
+
+Both expose `encode(sentences, batch_size=32, show_progress_bar=False)` and
+return L2-normalised, mean-pooled float32 vectors, so vectors from either
+engine live in the same collections. Build the ONNX model once with:
+
+    python -m app.embeddings.onnx_export --output data/onnx/all-MiniLM-L6-v2
+"""
+import os
+from typing import List
+
+import numpy as np
+
+ONNX_MODEL_FILE = "model_int8.onnx"
+TOKENIZER_FILE = "tokenizer.json"
+
+
+class OnnxEncoder:
+    """Sentence encoder running an exported transformer in ONNX Runtime with `tokenizers` preprocessing."""
+
+    def __init__(self, model_dir: str, max_length: int = 256, intra_op_threads: int = 0):
+        import onnxruntime as ort
+        from tokenizers import Tokenizer
+
+        model_path = os.path.join(model_dir, ONNX_MODEL_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"ONNX embedding model not found at {model_path}; "
+                f"run `python -m app.embeddings.onnx_export --output {model_dir}`"
+            )
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(model_dir, TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=max_length)
+        pad_id = self.tokenizer.token_to_id("[PAD]") or 0
+        self.tokenizer.enable_padding(pad_id=pad_id, pad_token="[PAD]")  # Pads to the longest in each batch
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads:
+            options.intra_op_num_threads = intra_op_threads
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+
+    def _encode_batch(self, sentences: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(sentences)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        hidden = self.session.run(None, feeds)[0]
+        # Mean pooling over real tokens, then L2 normalisation (same as the SentenceTransformer pipeline)
+        mask = attention_mask[..., None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        return pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+
+    def token_lengths(self, sentences: List[str]) -> List[int]:
+        return [sum(e.attention_mask) for e in self.tokenizer.encode_batch(sentences)]
+
+    def encode(self, sentences: List[str], batch_size: int = 32, show_progress_bar: bool = False,
+               **kwargs) -> np.ndarray:
+        if not sentences:
+            return np.empty((0, 0), dtype=np.float32)
+        batches = [self._encode_batch(sentences[i:i + batch_size]) for i in range(0, len(sentences), batch_size)]
+        return np.vstack(batches).astype(np.float32, copy=False)
+
+
+def load_encoder(engine: str, model_name: str, onnx_dir: str = "", max_length: int = 256,
+                 intra_op_threads: int = 0):
+    """Load the encoder for an engine name ("torch" or "onnx")."""
+    engine = (engine or "torch").lower()
+    if engine == "torch":
+        # Imported lazily so ONNX-only deployments don't load torch at all
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+    if engine == "onnx":
+        return OnnxEncoder(onnx_dir, max_length=max_length, intra_op_threads=intra_op_threads)
+    raise ValueError(f"Unsupported EMBEDDING_ENGINE: {engine}")
+
+
+def token_lengths(encoder, sentences: List[str], max_length: int) -> List[int]:
+    """Tokenized length of each sentence (with special tokens, after truncation)."""
+    if isinstance(encoder, OnnxEncoder):
+        return encoder.token_lengths(sentences)
+    input_ids = encoder.tokenizer(sentences, add_special_tokens=True, truncation=True,
+                                  max_length=max_length)["input_ids"]
+    return [len(ids) for ids in input_ids]
+
+
+def plan_token_batches(lengths: List[int], max_tokens: int, max_batch_size: int) -> List[List[int]]:
+    """
+    Group indices into batches of similar length whose padded size fits the token budget.
+
+    Indices are sorted by length, so each batch pads only to its own longest
+    text; a batch closes when adding the next text would make
+    batch_len * longest exceed max_tokens, or at max_batch_size.
+    """
+    batches: List[List[int]] = []
+    current: List[int] = []
+    for index in sorted(range(len(lengths)), key=lengths.__getitem__):
+        longest = lengths[index]  # Sorted ascending, so the newest is the longest
+        if current and (len(current) >= max_batch_size or (len(current) + 1) * longest > max_tokens):
+            batches.append(current)
+            current = []
+        current.append(index)
+    if current:
+        batches.append(current)
+    return batches
+
+
+def encode_token_budgeted(encoder, sentences: List[str], max_tokens: int, max_batch_size: int,
+                          max_length: int) -> np.ndarray:
+    """Encode with length-bucketed, token-budgeted batches and return rows in the original order."""
+    if not sentences:
+        return np.empty((0, 0), dtype=np.float32)
+    lengths = token_lengths(encoder, sentences, max_length)
+    result = None
+    for batch in plan_token_batches(lengths, max_tokens, max_batch_size):
+        vectors = encoder.encode([sentences[i] for i in batch], batch_size=len(batch), show_progress_bar=False)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if result is None:
+            result = np.empty((len(sentences), vectors.shape[1]), dtype=np.float32)
+        result[batch] = vectors
+    return result
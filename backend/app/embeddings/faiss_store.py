@@ -0,0 +1,394 @@
+"""In-process FAISS vector collection persisted to disk with a SQLite metadata sidecar.
+
+Each collection lives in its own directory:
+
+    <FAISS_INDEX_DIR>/<collection>/index.<n>.faiss   FAISS index (IndexIDMap2 over flat/HNSW, or IVF)
+    <FAISS_INDEX_DIR>/<collection>/meta.sqlite       ids, documents and JSON metadata
+
+FaissCollection mirrors the subset of chromadb's Collection API that
+VectorStore uses (upsert/query/get/delete/count), so the two backends are
+interchangeable.
+"""
+import glob
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import faiss
+import numpy as np
+
+INDEX_FILE = "index.faiss"  # Generation 0, written before index files were numbered
+META_FILE = "meta.sqlite"
+
+# Metadata keys that get an expression index in the sidecar for fast filtering
+INDEXED_KEYS = ("file_id", "video_id")
+
+
+def _compile_where(where: Dict[str, Any], params: List[Any]) -> str:
+    """Translate a Chroma-style where filter ($and/$or/$eq/$ne/$in) into SQL over the metadata JSON."""
+    clauses = []
+    for key, condition in where.items():
+        if key in ("$and", "$or"):
+            parts = [_compile_where(sub, params) for sub in condition]
+            joiner = " AND " if key == "$and" else " OR "
+            clauses.append("(" + joiner.join(parts) + ")")
+            continue
+
+        column = f"json_extract(metadata, '$.{key}')"
+        if not isinstance(condition, dict):
+            condition = {"$eq": condition}
+        for op, value in condition.items():
+            if op == "$eq":
+                clauses.append(f"{column} = ?")
+                params.append(value)
+            elif op == "$ne":
+                clauses.append(f"({column} IS NULL OR {column} != ?)")
+                params.append(value)
+            elif op == "$in":
+                clauses.append(f"{column} IN ({', '.join('?' for _ in value)})")
+                params.extend(value)
+            else:
+                raise ValueError(f"Unsupported where operator for FAISS backend: {op}")
+    return " AND ".join(clauses) if clauses else "1"
+
+
+class FaissCollection:
+    """
+    A persistent FAISS collection.
+
+    Vectors are L2-normalised and searched by inner product (cosine). An IVF
+    index is opened with its inverted lists memory-mapped and loaded fully in
+    memory on the first write; faiss can only mmap IVF lists, so flat and HNSW
+    indexes are always read fully into memory.
+
+    Writes mark the index dirty; it is written once persist_every vectors
+    changed or persist_seconds passed since the last write, and on
+    flush()/close(). Sidecar changes stay in an open SQLite transaction until
+    then: each write goes to a new numbered index file, and the commit that
+    names it also commits the rows it holds. A crash therefore rolls back to
+    the last index and the rows matching it, never to rows without vectors or
+    to deletions whose vectors are still needed. Call flush() before recording
+    anything elsewhere that relies on the vectors being durable.
+
+    Filtered queries (one file's chunks) are scored exactly over just the
+    matching vectors, looked up by id, in blocks of brute_force_max.
+    """
+
+    def __init__(self, name: str, directory: str, index_type: str = "hnsw",
+                 hnsw_m: int = 32, hnsw_ef_search: int = 64,
+                 ivf_nlist: int = 1024, ivf_nprobe: int = 16,
+                 brute_force_max: int = 4096, persist_every: int = 50000,
+                 persist_seconds: float = 60.0):
+        self.name = name
+        self.directory = directory
+        self.index_type = index_type.lower()
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_search = hnsw_ef_search
+        self.ivf_nlist = ivf_nlist
+        self.ivf_nprobe = ivf_nprobe
+        self.brute_force_max = brute_force_max
+        self.persist_every = persist_every
+        self.persist_seconds = persist_seconds
+
+        if self.index_type not in ("flat", "hnsw", "ivf"):
+            raise ValueError(f"Unsupported FAISS index type: {index_type}")
+
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(os.path.join(directory, META_FILE), check_same_thread=False)
+        self._db.execute("""
+            CREATE TABLE IF NOT EXISTS chunks (
+                int_id INTEGER PRIMARY KEY,
+                id TEXT NOT NULL UNIQUE,
+                document TEXT,
+                metadata TEXT
+            )
+        """)
+        self._db.execute("CREATE TABLE IF NOT EXISTS state (key TEXT PRIMARY KEY, value INTEGER)")
+        for key in INDEXED_KEYS:
+            self._db.execute(
+                f"CREATE INDEX IF NOT EXISTS ix_chunks_{key} ON chunks(json_extract(metadata, '$.{key}'))"
+            )
+        self._db.commit()
+
+        self._index: Optional[faiss.Index] = None
+        self._writable = False
+        self._dirty = False
+        self._unpersisted = 0  # Vectors changed since the index was last written
+        self._persisted_at = time.monotonic()
+        row = self._db.execute("SELECT value FROM state WHERE key = 'index_generation'").fetchone()
+        self._generation = row[0] if row is not None else 0
+        self._index_path = self._index_file(self._generation)
+        self._remove_stale_index_files()
+        if os.path.exists(self._index_path):
+            self._index = self._read_index(mmap=True)
+            if self._writable:
+                print(f"📂 FAISS collection '{name}' read fully into memory (faiss only mmaps IVF lists)")
+
+        row = self._db.execute("SELECT value FROM state WHERE key = 'next_id'").fetchone()
+        if row is None:
+            row = self._db.execute("SELECT COALESCE(MAX(int_id), -1) + 1 FROM chunks").fetchone()
+        self._next_id = row[0]
+
+    # ----------------------------------------------------------------- index io
+    def _index_file(self, generation: int) -> str:
+        return os.path.join(self.directory, f"index.{generation}.faiss" if generation else INDEX_FILE)
+
+    def _remove_stale_index_files(self):
+        """Index files of other generations: superseded, or written by a persist whose commit never happened."""
+        for path in glob.glob(os.path.join(self.directory, "index*.faiss")):
+            if path != self._index_path:
+                os.remove(path)
+
+    def _read_index(self, mmap: bool) -> faiss.Index:
+        # IO_FLAG_MMAP only maps IVF inverted lists; anything else would be read into memory regardless
+        if mmap and self.index_type == "ivf":
+            try:
+                index = faiss.read_index(self._index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+            except RuntimeError:
+                # Not every index type supports mmap in every faiss build
+                pass
+            else:
+                if isinstance(index, faiss.IndexIVF):
+                    return self._with_direct_map(index)
+        self._writable = True
+        return self._with_direct_map(faiss.read_index(self._index_path))
+
+    @staticmethod
+    def _with_direct_map(index: faiss.Index) -> faiss.Index:
+        """IVF needs an id -> vector map to reconstruct a file's vectors (and to remove ids)."""
+        if isinstance(index, faiss.IndexIVF) and index.direct_map.type != faiss.DirectMap.Hashtable:
+            index.set_direct_map_type(faiss.DirectMap.Hashtable)
+        return index
+
+    def _ensure_writable(self, dim: int):
+        if self._index is None:
+            self._index = faiss.IndexIDMap2(self._new_base_index(dim, trained=False))
+            self._writable = True
+            self._db.execute("DELETE FROM chunks")  # Rows without an index file have no vectors
+        elif not self._writable:
+            self._index = self._read_index(mmap=False)
+        if self._index.d != dim:
+            raise ValueError(f"Embedding dimension {dim} does not match collection dimension {self._index.d}")
+
+    def _new_base_index(self, dim: int, trained: bool) -> faiss.Index:
+        if self.index_type == "hnsw":
+            index = faiss.IndexHNSWFlat(dim, self.hnsw_m, faiss.METRIC_INNER_PRODUCT)
+            index.hnsw.efSearch = self.hnsw_ef_search
+            return index
+        if self.index_type == "ivf" and trained:
+            return faiss.IndexIVFFlat(faiss.IndexFlatIP(dim), dim, self.ivf_nlist, faiss.METRIC_INNER_PRODUCT)
+        # flat, or IVF still collecting enough vectors to train on
+        return faiss.IndexFlatIP(dim)
+
+    def _maybe_train_ivf(self):
+        """Rebuild the flat staging index as IVF once there are enough vectors to train nlist centroids."""
+        if self.index_type != "ivf" or not isinstance(self._index, faiss.IndexIDMap2):
+            return
+        if self._index.ntotal < self.ivf_nlist * 39:
+            return
+        base = faiss.downcast_index(self._index.index)
+        ids = faiss.vector_to_array(self._index.id_map).astype(np.int64)
+        vectors = base.reconstruct_n(0, base.ntotal)
+        # IVF stores ids natively (and can remove them), so it is not wrapped in an IndexIDMap
+        ivf = self._with_direct_map(self._new_base_index(self._index.d, trained=True))
+        ivf.train(vectors)
+        ivf.add_with_ids(vectors, ids)
+        self._index = ivf
+        print(f"🧮 FAISS collection '{self.name}' promoted to IVF with {self.ivf_nlist} lists")
+
+    def _persist(self):
+        # The committed generation's file stays untouched until the commit naming the new one succeeds
+        generation = self._generation + 1
+        path = self._index_file(generation)
+        faiss.write_index(self._index, path)
+        self._db.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('index_generation', ?)", (generation,))
+        self._db.execute("INSERT OR REPLACE INTO state (key, value) VALUES ('next_id', ?)", (self._next_id,))
+        self._db.commit()
+        previous, self._index_path, self._generation = self._index_path, path, generation
+        if os.path.exists(previous):
+            os.remove(previous)
+        self._dirty = False
+        self._unpersisted = 0
+        self._persisted_at = time.monotonic()
+
+    def _mark_dirty(self, changed: int):
+        """Record index changes; write the index once enough changed or enough time passed."""
+        self._dirty = True
+        self._unpersisted += changed
+        if (self._unpersisted >= self.persist_every
+                or time.monotonic() - self._persisted_at >= self.persist_seconds):
+            self._persist()
+
+    def flush(self):
+        """Write the index and commit the sidecar now if there are unpersisted changes."""
+        with self._lock:
+            if self._dirty and self._index is not None:
+                self._persist()
+
+    @staticmethod
+    def _normalize(embeddings) -> np.ndarray:
+        vectors = np.ascontiguousarray(np.asarray(embeddings, dtype=np.float32))
+        if vectors.ndim == 1:
+            vectors = vectors.reshape(1, -1)
+        faiss.normalize_L2(vectors)
+        return vectors
+
+    # ------------------------------------------------------------- collection api
+    def count(self) -> int:
+        with self._lock:
+            return self._db.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+
+    def upsert(self, ids: Sequence[str], embeddings, metadatas: Sequence[Dict[str, Any]] = None,
+               documents: Sequence[str] = None):
+        if not ids:
+            return
+        vectors = self._normalize(embeddings)
+        metadatas = metadatas or [{} for _ in ids]
+        documents = documents or [None for _ in ids]
+        with self._lock:
+            self._ensure_writable(vectors.shape[1])
+            self._remove_ids(list(ids))
+
+            # Ids handed out since the last persist are rolled back with their rows and vectors on a crash
+            int_ids = np.arange(self._next_id, self._next_id + len(ids), dtype=np.int64)
+            self._next_id += len(ids)
+            self._db.executemany(
+                "INSERT INTO chunks (int_id, id, document, metadata) VALUES (?, ?, ?, ?)",
+                [(int(i), doc_id, doc, json.dumps(meta or {}))
+                 for i, doc_id, doc, meta in zip(int_ids, ids, documents, metadatas)]
+            )
+            self._index.add_with_ids(vectors, int_ids)
+            self._maybe_train_ivf()
+            self._mark_dirty(len(ids))
+
+    add = upsert
+
+    def _remove_ids(self, ids: List[str]):
+        """Drop rows for ids and remove their vectors where the index type supports it."""
+        placeholders = ", ".join("?" for _ in ids)
+        rows = self._db.execute(f"SELECT int_id FROM chunks WHERE id IN ({placeholders})", ids).fetchall()
+        if not rows:
+            return
+        int_ids = np.array([row[0] for row in rows], dtype=np.int64)
+        self._db.execute(f"DELETE FROM chunks WHERE id IN ({placeholders})", ids)
+        if self._index is not None and self.index_type != "hnsw":
+            self._ensure_writable(self._index.d)
+            # IVF's hashtable direct map only accepts an IDSelectorArray
+            self._index.remove_ids(faiss.IDSelectorArray(len(int_ids), faiss.swig_ptr(int_ids)))
+        # HNSW cannot remove vectors; their rows are gone, so search results skip them (tombstones)
+
+    def _select(self, where: Optional[Dict[str, Any]], columns: str) -> List[Tuple]:
+        params: List[Any] = []
+        clause = _compile_where(where, params) if where else "1"
+        return self._db.execute(f"SELECT {columns} FROM chunks WHERE {clause} ORDER BY int_id", params).fetchall()
+
+    def get(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None,
+            include: Sequence[str] = ("documents", "metadatas")) -> Dict[str, Any]:
+        with self._lock:
+            if ids is not None:
+                placeholders = ", ".join("?" for _ in ids)
+                rows = self._db.execute(
+                    f"SELECT id, document, metadata FROM chunks WHERE id IN ({placeholders})", list(ids)
+                ).fetchall()
+            else:
+                rows = self._select(where, "id, document, metadata")
+        result = {"ids": [row[0] for row in rows]}
+        if "documents" in include:
+            result["documents"] = [row[1] for row in rows]
+        if "metadatas" in include:
+            result["metadatas"] = [json.loads(row[2]) for row in rows]
+        return result
+
+    def delete(self, ids: Optional[Sequence[str]] = None, where: Optional[Dict[str, Any]] = None):
+        with self._lock:
+            if ids is None:
+                ids = [row[0] for row in self._select(where, "id")]
+            if not ids:
+                return
+            self._remove_ids(list(ids))
+            if self._index is None:
+                self._db.commit()  # No vectors to keep in step with
+            else:
+                self._mark_dirty(len(ids))
+
+    def query(self, query_embeddings, n_results: int = 10, where: Optional[Dict[str, Any]] = None,
+              include: Sequence[str] = ("documents", "metadatas", "distances")) -> Dict[str, Any]:
+        queries = self._normalize(query_embeddings)
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return {key: [[] for _ in queries] for key in ("ids", "documents", "metadatas", "distances")}
+
+            if where:
+                # Resolve the filter to int ids in the sidecar and score only those vectors
+                allowed = np.array([row[0] for row in self._select(where, "int_id")], dtype=np.int64)
+                scores, labels = self._search_subset(queries, allowed, n_results)
+            else:
+                scores, labels = self._search_index(queries, n_results)
+
+            return self._collect(scores, labels, n_results, include)
+
+    # ---------------------------------------------------------------- search impl
+    def _search_subset(self, queries: np.ndarray, allowed: np.ndarray, k: int):
+        """Exact search over the filtered vectors only, reconstructed by id in blocks of brute_force_max."""
+        k = min(k, len(allowed))
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_labels = np.empty((len(queries), 0), dtype=np.int64)
+        for start in range(0, len(allowed), self.brute_force_max):
+            block = allowed[start:start + self.brute_force_max]
+            scores = np.hstack([best_scores, queries @ self._index.reconstruct_batch(block).T])
+            labels = np.hstack([best_labels, np.broadcast_to(block, (len(queries), len(block)))])
+            top = np.argsort(-scores, axis=1)[:, :k]
+            best_scores = np.take_along_axis(scores, top, axis=1)
+            best_labels = np.take_along_axis(labels, top, axis=1)
+        return best_scores, best_labels
+
+    def _search_index(self, queries: np.ndarray, k: int):
+        if isinstance(self._index, faiss.IndexIVF):
+            params = faiss.SearchParametersIVF(nprobe=self.ivf_nprobe)
+        elif self.index_type == "hnsw":
+            params = faiss.SearchParametersHNSW(efSearch=max(self.hnsw_ef_search, k * 2))
+        else:
+            params = None
+
+        # Over-fetch so vectors whose rows were deleted (HNSW tombstones) can be skipped
+        fetch = min(self._index.ntotal, k * 2)
+        return self._index.search(queries, fetch, params=params)
+
+    def _collect(self, scores: np.ndarray, labels: np.ndarray, k: int, include: Sequence[str]) -> Dict[str, Any]:
+        wanted = {int(label) for label in labels.ravel() if label >= 0}
+        rows = {}
+        if wanted:
+            placeholders = ", ".join("?" for _ in wanted)
+            for int_id, doc_id, document, metadata in self._db.execute(
+                f"SELECT int_id, id, document, metadata FROM chunks WHERE int_id IN ({placeholders})",
+                list(wanted)
+            ):
+                rows[int_id] = (doc_id, document, metadata)
+
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query_scores, query_labels in zip(scores, labels):
+            ids, documents, metadatas, distances = [], [], [], []
+            for score, label in zip(query_scores, query_labels):
+                row = rows.get(int(label))
+                if row is None:
+                    continue
+                ids.append(row[0])
+                documents.append(row[1])
+                metadatas.append(json.loads(row[2]))
+                distances.append(float(1.0 - score))  # cosine distance, like Chroma's cosine space
+                if len(ids) == k:
+                    break
+            result["ids"].append(ids)
+            result["documents"].append(documents)
+            result["metadatas"].append(metadatas)
+            result["distances"].append(distances)
+        return {key: value for key, value in result.items() if key == "ids" or key in include}
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._db.close()
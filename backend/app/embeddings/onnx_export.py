@@ -0,0 +1,72 @@
+"""Export a SentenceTransformer model to ONNX and quantize it to int8 for the "onnx" embedding engine.
+
+Needs torch, transformers and onnxruntime at export time only; the service
+then runs the result with onnxruntime and tokenizers.
+
+Usage (from the `backend` directory):
+    python -m app.embeddings.onnx_export --output data/onnx/all-MiniLM-L6-v2
+"""
+import argparse
+import os
+
+from app.embeddings.engines import ONNX_MODEL_FILE
+
+FP32_MODEL_FILE = "model_fp32.onnx"
+
+
+def export(model_name: str, output_dir: str, opset: int = 14) -> str:
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    from transformers import AutoModel, AutoTokenizer
+
+    repo_id = model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+    os.makedirs(output_dir, exist_ok=True)
+
+    tokenizer = AutoTokenizer.from_pretrained(repo_id)
+    model = AutoModel.from_pretrained(repo_id).eval()
+
+    class _Encoder(torch.nn.Module):
+        """Returns only the token embeddings; pooling and normalisation run in numpy."""
+
+        def __init__(self, base):
+            super().__init__()
+            self.base = base
+
+        def forward(self, input_ids, attention_mask, token_type_ids):
+            return self.base(input_ids=input_ids, attention_mask=attention_mask,
+                             token_type_ids=token_type_ids).last_hidden_state
+
+    sample = tokenizer(["export sample"], return_tensors="pt")
+    fp32_path = os.path.join(output_dir, FP32_MODEL_FILE)
+    dynamic = {0: "batch", 1: "sequence"}
+    torch.onnx.export(
+        _Encoder(model),
+        (sample["input_ids"], sample["attention_mask"], sample["token_type_ids"]),
+        fp32_path,
+        input_names=["input_ids", "attention_mask", "token_type_ids"],
+        output_names=["last_hidden_state"],
+        dynamic_axes={"input_ids": dynamic, "attention_mask": dynamic,
+                      "token_type_ids": dynamic, "last_hidden_state": dynamic},
+        opset_version=opset,
+    )
+
+    int8_path = os.path.join(output_dir, ONNX_MODEL_FILE)
+    quantize_dynamic(fp32_path, int8_path, weight_type=QuantType.QInt8)
+    os.remove(fp32_path)
+    tokenizer.save_pretrained(output_dir)  # Writes tokenizer.json for the `tokenizers` runtime
+
+    print(f"✅ Exported {repo_id} to {int8_path} ({os.path.getsize(int8_path) / 1e6:.1f} MB)")
+    return int8_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export an int8 ONNX embedding model")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--output", default="data/onnx/all-MiniLM-L6-v2")
+    parser.add_argument("--opset", type=int, default=14)
+    args = parser.parse_args()
+    export(args.model, args.output, args.opset)
+
+
+if __name__ == "__main__":
+    main()
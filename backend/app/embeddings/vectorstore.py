@@ -1,33 +1,13 @@
 """Store embeddings in a vector store and perform similarity search."""
-import chromadb
 import numpy as np
 from app.embeddings import EmbeddingManager
 from app.schema import YoutubeStoreSchema, AudioStoreSchema
 from app.db.models import Youtube, Audio
-from app.utils import extract_video_id
+from app.utils import require_video_id
 import uuid
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime, timezone
-from config import settings
-from functools import lru_cache
-
-CHROMA_API_KEY = settings.CHROMA_API_KEY
-CHROMA_TENANT_ID = settings.CHROMA_TENANT
-CHROMA_DATABASE = settings.CHROMA_DATABASE
-
-# Remove global db_manager - will be passed as parameter
-# db_manager = DBManager(settings.DATABASE_URI)
-
-_chroma_client = None
-
-
-@lru_cache(maxsize=1)
-def get_chroma_client():
-    return chromadb.CloudClient(
-        api_key=CHROMA_API_KEY,
-        tenant=CHROMA_TENANT_ID,
-        database=CHROMA_DATABASE
-    )
+from app.embeddings.backends import get_collection
 
 
 class VectorStore:
@@ -37,147 +17,193 @@ class VectorStore:
                  db_manager=None):  # Add db_manager parameter
         self.embedding_manager = embedding_manager
         self.collection_name = collection_name
-        self.client = get_chroma_client()  # reuse singleton
-        self.collection = self.client.get_collection(self.collection_name)
+        self.collection = get_collection(self.collection_name)  # Chroma or FAISS, per VECTOR_BACKEND
         self.db_manager = db_manager  # Store for use in methods
 
-    def add_youtube_documents(self, documents: List[Any], embeddings: List[np.ndarray]):
-        """Adds documents and their embeddings to the vector store."""
-        if len(documents) != len(embeddings):
+    def upsert_youtube_chunks(self, video_id: str, documents: List[Any], embeddings: List[np.ndarray],
+                              start_index: int = 0):
+        """Upsert one batch of a video's chunks; start_index is the batch's offset in the transcript."""
+        self.upsert_youtube_batch(
+            [(video_id, i, doc) for i, doc in enumerate(documents, start=start_index)],
+            embeddings
+        )
+
+    def upsert_youtube_batch(self, entries: List[Tuple[str, int, Any]], embeddings: List[np.ndarray]):
+        """Upsert chunks of any number of videos in one call; entries are (video_id, doc_index, document)."""
+        if len(entries) != len(embeddings):
             raise ValueError("The number of documents must match the number of embeddings.")
-        
-        # Prepare data for ChromaDB
+
         ids = []
         metadatas = []
-        documents_text = []
-        embeddings_list = []
-        
-        # Get video_id once (all docs from same video)
-        video_id = extract_video_id(documents[0].metadata["source"])
-        
-        for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-            # Generate unique ID
-            doc_id = f"doc_{uuid.uuid4().hex[:8]}_{i}"
-            ids.append(doc_id)
-            
-            # Prepare metadata
+        for video_id, i, doc in entries:
+            # Deterministic ID so re-ingesting the same video overwrites instead of duplicating
+            ids.append(f"{video_id}_{i}")
+
             metadata = dict(doc.metadata)
             metadata['doc_index'] = i
             metadata['content_length'] = len(doc.page_content)
             metadata["video_id"] = video_id
             metadatas.append(metadata)
-            
-            # Document content
-            documents_text.append(doc.page_content)
-            
-            # Embedding
-            embeddings_list.append(embedding)
+
+        self.collection.upsert(
+            ids=ids,
+            embeddings=list(embeddings),
+            metadatas=metadatas,
+            documents=[doc.page_content for _, _, doc in entries]
+        )
+
+    def flush(self):
+        """
+        Make upserted chunks durable before a row records them as ingested.
+
+        The FAISS backend persists its index lazily; Chroma writes through, so there is nothing to do.
+        """
+        flush = getattr(self.collection, "flush", None)
+        if flush is not None:
+            flush()
+
+    def record_youtube(self, url: str, video_id: str, content: str, chunk_count: int) -> bool:
+        """
+        Store the video row once per video (not per chunk), if db_manager is provided.
+
+        Returns False if the row already existed, e.g. a concurrent ingest of
+        the same video recorded it first; its chunks are the same either way.
+        """
+        if self.db_manager:
+            data = YoutubeStoreSchema(
+                url=url,
+                video_id=video_id,
+                content=content,
+                chunk_count=chunk_count,
+                created_at=datetime.now(timezone.utc)
+            )
+            return self.db_manager.insert_ignore(Youtube, data)
+        return False
+
+    def add_youtube_documents(self, documents: List[Any], embeddings: List[np.ndarray]):
+        """Adds documents and their embeddings to the vector store."""
+        if len(documents) != len(embeddings):
+            raise ValueError("The number of documents must match the number of embeddings.")
+        
+        # Get video_id once (all docs from same video)
+        video_id = require_video_id(documents[0].metadata["source"])
         
         # Add to collection
         try:
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings_list,
-                metadatas=metadatas,
-                documents=documents_text
+            self.upsert_youtube_chunks(video_id, documents, embeddings)
+            self.flush()
+            self.record_youtube(
+                url=documents[0].metadata["source"],
+                video_id=video_id,
+                content="\n\n".join(doc.page_content for doc in documents),  # Combine all chunks
+                chunk_count=len(documents)
             )
-            
-            # Add to database only if db_manager is provided
-            if self.db_manager:
-                # Store only once per video, not per chunk
-                data = YoutubeStoreSchema(
-                    url=documents[0].metadata["source"], 
-                    video_id=video_id, 
-                    content="\n\n".join(documents_text),  # Combine all chunks
-                    created_at=datetime.now(timezone.utc)
-                )
-                
-                self.db_manager.insert_data(Youtube, data)
             print(f"Successfully added {len(documents)} documents to vector store")
             print(f"Total documents in collection: {self.collection.count()}")
             return video_id
         
         except Exception as e:
             raise RuntimeError(f"Failed to add documents to vector store: {e}")
-    
-    def add_audio_documents(self, filename: str, documents: List[Any], embeddings: List[np.ndarray]):
-        """Adds documents and their embeddings to the vector store."""
+
+    @staticmethod
+    def audio_file_id(filename: str, content_hash: Optional[str] = None) -> str:
+        """file_id for an upload, derived from the content hash when available."""
+        return filename + (content_hash[:8] if content_hash else uuid.uuid4().hex[:4])
+
+    def upsert_audio_chunks(self, file_id: str, documents: List[str], embeddings: List[np.ndarray],
+                            start_index: int = 0):
+        """Upsert one batch of an audio file's chunks; start_index is the batch's offset in the transcript."""
         if len(documents) != len(embeddings):
             raise ValueError("The number of documents must match the number of embeddings.")
-        
-        # Prepare data for ChromaDB
-        file_id = filename + uuid.uuid4().hex[:4]
-        ids = []
-        metadatas = []
-        documents_text = []
-        embeddings_list = []
-        created_at = datetime.now(timezone.utc)
-
-        for i, (doc, embedding) in enumerate(zip(documents, embeddings)):
-            # Generate unique ID
-            doc_id = f"doc_{uuid.uuid4().hex[:8]}_{i}"
-            ids.append(doc_id)
-
-            # Prepare metadata
-            metadata = {
-                "doc_index": i,
-                "context_length": len(doc),
-                "file_id": file_id
-            }
-            metadatas.append(metadata)
 
-            # Document content
-            documents_text.append(doc)
+        # Deterministic IDs so re-ingesting the same file overwrites instead of duplicating
+        ids = [f"{file_id}_{i}" for i in range(start_index, start_index + len(documents))]
+        metadatas = [
+            {"doc_index": i, "context_length": len(doc), "file_id": file_id}
+            for i, doc in enumerate(documents, start=start_index)
+        ]
+        self.collection.upsert(
+            ids=ids,
+            embeddings=list(embeddings),
+            metadatas=metadatas,
+            documents=list(documents)
+        )
+
+    def record_audio(self, file_id: str, content_hash: Optional[str], content: str, chunk_count: int) -> bool:
+        """Store the audio row once per file, if db_manager is provided; False if it already existed."""
+        if self.db_manager:
+            data = AudioStoreSchema(
+                file_id=file_id,
+                content_hash=content_hash,
+                content=content,
+                chunk_count=chunk_count,
+                created_at=datetime.now(timezone.utc)
+            )
+            return self.db_manager.insert_ignore(Audio, data)
+        return False
 
-            # Embedding
-            embeddings_list.append(embedding)
+    def add_audio_documents(self, filename: str, documents: List[Any], embeddings: List[np.ndarray],
+                            content_hash: Optional[str] = None):
+        """Adds documents and their embeddings to the vector store."""
+        if len(documents) != len(embeddings):
+            raise ValueError("The number of documents must match the number of embeddings.")
+        
+        file_id = self.audio_file_id(filename, content_hash)
 
         # Add to collection
         try:
-            # Add to ChromaDB
-            self.collection.add(
-                ids=ids,
-                embeddings=embeddings_list,
-                metadatas=metadatas,
-                documents=documents_text
+            self.upsert_audio_chunks(file_id, documents, embeddings)
+            self.flush()
+            self.record_audio(
+                file_id=file_id,
+                content_hash=content_hash,
+                content="\n\n".join(documents),  # Combine all chunks
+                chunk_count=len(documents)
             )
-
-            # Add to database only if db_manager is provided
-            if self.db_manager:
-                data = AudioStoreSchema(
-                    file_id=file_id, 
-                    content="\n\n".join(documents_text),  # Combine all chunks
-                    created_at=created_at
-                )
-                
-                self.db_manager.insert_data(Audio, data)
             print(f"Successfully added {len(documents)} documents to vector store")
             print(f"Total documents in collection: {self.collection.count()}")
             return file_id
 
-
         except Exception as e:
             raise RuntimeError(f"Failed to add documents to vector store: {e}")
 
-    def similarity_search(self, query_embedding: List[float], top_k: int = 5):
-        """Search for the top_k most similar documents to the query embedding."""
+    @staticmethod
+    def file_filter(file_id: str) -> Dict[str, Any]:
+        """Metadata filter matching chunks of one audio file (file_id) or video (video_id)."""
+        return {"$or": [{"file_id": file_id}, {"video_id": file_id}]}
+
+    def similarity_search(self, query_embedding: List[float], top_k: int = 5,
+                          where: Optional[Dict[str, Any]] = None):
+        """
+        Search for the top_k most similar documents to the query embedding.
+
+        The optional where filter is applied inside the index query, so top_k
+        is taken only from matching chunks instead of the whole collection.
+        """
         results = self.collection.query(
             query_embeddings=query_embedding,
-            n_results=top_k
+            n_results=top_k,
+            where=where
         )
         return results['documents'][0]
     
-    def query(self, query_text: str, top_k: int = 5) -> List[Dict[str, Any]]:
+    def query(self, query_text: str, top_k: int = 5,
+              where: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         """Generate embedding for the query text and perform similarity search."""
         query_embedding = self.embedding_manager.create_embeddings([query_text])
-        return self.similarity_search(query_embedding, top_k=top_k)
+        return self.similarity_search(query_embedding, top_k=top_k, where=where)
     
     def query_by_metadata(self, metadata_filter: Dict[str, Any]):
         """Query documents based on metadata filters."""
         results = self.collection.get(where=metadata_filter)
         return results['documents']
     
+    def get_ordered_documents(self, metadata_filter: Dict[str, Any]) -> List[str]:
+        """Documents matching the filter, in transcript order (by doc_index)."""
+        results = self.collection.get(where=metadata_filter, include=["documents", "metadatas"])
+        pairs = zip(results['metadatas'], results['documents'])
+        return [doc for _, doc in sorted(pairs, key=lambda pair: (pair[0] or {}).get("doc_index", 0))]
+    
     def clear_collection(self) -> None:
         """Clear all data from the collection."""
         self.collection.delete(ids=self.collection.get()['ids'])
@@ -7,6 +7,8 @@ class TablenameEnum(str, Enum):
     PODCAST = "podcast"
     CONVERSATIONS = "conversations"
     USERS = "users"
+    INGESTION_JOBS = "ingestion_jobs"
+    SUMMARIES = "summaries"
 
 class EmbedddingCollectionEnum(str, Enum):
     YOUTUBE_EMBEDDINGS = "youtube_embeddings"
@@ -0,0 +1,111 @@
+"""Bounded thread pools for running blocking work off the event loop."""
+import asyncio
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict
+
+from config import settings
+
+CPU_POOL = "cpu"
+IO_POOL = "io"
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a pool already holds its maximum number of pending tasks."""
+
+    def __init__(self, pool_name: str, limit: int):
+        self.pool_name = pool_name
+        self.limit = limit
+        super().__init__(f"The {pool_name} pool is at capacity ({limit} queued tasks), try again shortly")
+
+
+class BoundedExecutor:
+    """
+    Thread pool that rejects new work once its queue depth limit is reached.
+
+    Pass `executor` to apply the same limit to another pool (e.g. a ProcessPoolExecutor).
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int, executor: Executor = None):
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = executor or ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{name}-pool")
+        self._pending = 0
+        self.completed = 0
+        self.rejected = 0
+
+    @property
+    def pending(self) -> int:
+        """Tasks running or waiting for a worker thread."""
+        return self._pending
+
+    def _release(self):
+        self._pending -= 1
+        self.completed += 1
+
+    async def run(self, func: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run func in the pool, raising PoolSaturatedError instead of queueing without bound."""
+        if self._pending >= self.max_workers + self.max_queue:
+            self.rejected += 1
+            raise PoolSaturatedError(self.name, self.max_queue)
+
+        loop = asyncio.get_running_loop()
+        self._pending += 1
+        try:
+            future = self._executor.submit(partial(func, *args, **kwargs))
+        except Exception:
+            self._pending -= 1
+            raise
+        # Release the slot when the thread finishes, not when the caller stops waiting,
+        # so a cancelled request cannot hide work that is still occupying a worker.
+        future.add_done_callback(lambda _: loop.call_soon_threadsafe(self._release))
+        return await asyncio.wrap_future(future)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": self._pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+
+_pools: Dict[str, BoundedExecutor] = {}
+
+
+def get_pool(name: str) -> BoundedExecutor:
+    """Get or create one of the process-wide pools."""
+    if name not in _pools:
+        if name == CPU_POOL:
+            _pools[name] = BoundedExecutor(CPU_POOL, settings.CPU_POOL_WORKERS, settings.CPU_POOL_MAX_QUEUE)
+        elif name == IO_POOL:
+            _pools[name] = BoundedExecutor(IO_POOL, settings.IO_POOL_WORKERS, settings.IO_POOL_MAX_QUEUE)
+        else:
+            raise ValueError(f"Unknown executor pool: {name}")
+    return _pools[name]
+
+
+async def run_cpu(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run CPU-bound work (embedding) in the CPU pool."""
+    return await get_pool(CPU_POOL).run(func, *args, **kwargs)
+
+
+async def run_io(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """Run blocking I/O (LLM, Chroma, database) in the I/O pool."""
+    return await get_pool(IO_POOL).run(func, *args, **kwargs)
+
+
+def pool_stats() -> Dict[str, Dict[str, int]]:
+    return {name: executor.stats() for name, executor in _pools.items()}
+
+
+def shutdown_pools(wait: bool = True):
+    """Shut down all pools; called from the application lifespan."""
+    for executor in _pools.values():
+        executor.shutdown(wait=wait)
+    _pools.clear()
@@ -1,8 +1,10 @@
 """Script for ingesting documents from youtube url, podcast rss feed, or audio files"""
-from typing import Optional
+import asyncio
+import os
+from typing import Iterator, List, Optional
 from langchain_community.document_loaders.youtube import YoutubeLoader, TranscriptFormat
 from langchain_text_splitters import RecursiveCharacterTextSplitter
-from groq import Groq
+from groq import AsyncGroq
 
 
 class IngestionManager:
@@ -25,9 +27,45 @@ class IngestionManager:
 
         return documents
 
+    def iter_youtube_documents(self, url: str) -> Iterator:
+        """Yield a youtube video's 30-second transcript chunks one at a time (for the streaming pipeline)"""
+        loader = YoutubeLoader.from_youtube_url(
+            youtube_url=url,
+            transcript_format=TranscriptFormat.CHUNKS,
+            chunk_size_seconds=30
+        )
+        return loader.lazy_load()
+
+    def list_playlist_videos(self, url: str, limit: Optional[int] = None) -> List[str]:
+        """
+        Video URLs of a playlist or channel, listed with yt-dlp (metadata only, nothing is downloaded).
+
+        Channel pages list their tabs (videos, shorts, ...) instead of videos;
+        those are expanded in turn until `limit` videos are found.
+        """
+        from yt_dlp import YoutubeDL
+
+        options = {"extract_flat": "in_playlist", "quiet": True, "no_warnings": True, "skip_download": True}
+        if limit:
+            options["playlistend"] = limit
+        urls: List[str] = []
+        with YoutubeDL(options) as ydl:
+            pending = [ydl.extract_info(url, download=False)]
+            while pending and (not limit or len(urls) < limit):
+                info = pending.pop(0)
+                for entry in (info or {}).get("entries") or []:
+                    if entry.get("ie_key") == "Youtube" and entry.get("id"):
+                        urls.append(f"https://www.youtube.com/watch?v={entry['id']}")
+                    elif entry.get("ie_key") == "YoutubeTab" and entry.get("url"):
+                        pending.append(ydl.extract_info(entry["url"], download=False))
+        return urls[:limit] if limit else urls
+
     def load_audio_file(self, file_path: str, source_language: Optional[str] = None) -> str:
         """
         Load and transcribe an audio file using Groq's Whisper model.
+
+        Long files are split at silences and transcribed in parallel segments.
+        For scripts only: it runs its own event loop and Groq client.
         
         Args:
             file_path (str): Path to the audio
@@ -35,14 +73,19 @@ class IngestionManager:
         Returns:
             str: Transcribed text from the audio file
         """
-        client = Groq()
-        response = client.audio.transcriptions.create(
-            file=open(file_path, "rb"),
-            model="whisper-large-v3",
-            language=source_language
-        )
-        
-        return response.text
+        from app.transcription import GroqTranscriptionProvider
+        from app.transcription.engine import create_transcriber
+        from config import settings
+
+        async def transcribe():
+            client = AsyncGroq()
+            try:
+                transcriber = create_transcriber(GroqTranscriptionProvider(client, model=settings.TRANSCRIPTION_MODEL))
+                return await transcriber.transcribe_file(file_path, os.path.basename(file_path), source_language)
+            finally:
+                await client.close()
+
+        return asyncio.run(transcribe()).text
     
     def split_text(self,text: str, chunk_size: int = 1000, chunk_overlap: int = 20):
         """
@@ -65,4 +108,26 @@ class IngestionManager:
 
         
         return text_splitter.split_text(text)
-    
+
+    def iter_text_chunks(self, text: str, chunk_size: int = 1000, chunk_overlap: int = 20,
+                         window_chunks: int = 64) -> Iterator[str]:
+        """
+        Yield split_text chunks lazily (for the streaming pipeline).
+
+        The text is split one window of about window_chunks * chunk_size
+        characters at a time, each window ending at a paragraph, line or word
+        break, so only one window's chunks exist at once.
+        """
+        window = chunk_size * window_chunks
+        start = 0
+        while start < len(text):
+            end = min(len(text), start + window)
+            if end < len(text):
+                # Cut at the last break in the second half of the window; a hard cut only if there is none
+                for separator in ("\n\n", "\n", " "):
+                    cut = text.rfind(separator, start + window // 2, end)
+                    if cut != -1:
+                        end = cut + len(separator)
+                        break
+            yield from self.split_text(text[start:end], chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+            start = end
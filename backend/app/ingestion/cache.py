@@ -0,0 +1,35 @@
+"""Content-addressed lookup of already ingested YouTube videos and audio files."""
+from typing import Dict, List, Optional
+
+from app.db import DBManager
+from app.db.models import Youtube, Audio
+
+
+class IngestionCache:
+    """
+    Answers "has this source been ingested already?" from the youtube/audio tables.
+
+    YouTube videos are keyed by video_id and audio uploads by the sha256 of
+    their bytes, so a repeat submission skips transcription, embedding and the
+    vector upload. Summaries are cached separately (app.retriever.summary_cache).
+    """
+
+    def __init__(self, db_manager: DBManager):
+        self.db_manager = db_manager
+
+    def get_youtube(self, video_id: Optional[str]) -> Optional[Youtube]:
+        if not video_id:
+            return None
+        return self.db_manager.get_first(Youtube, video_id=video_id)
+
+    def get_youtube_many(self, video_ids: List[str]) -> Dict[str, Youtube]:
+        """Already ingested videos among video_ids, by video_id (one query for a whole batch)."""
+        video_ids = [video_id for video_id in video_ids if video_id]
+        if not video_ids:
+            return {}
+        return {record.video_id: record for record in self.db_manager.filter_in(Youtube, "video_id", video_ids)}
+
+    def get_audio(self, content_hash: Optional[str]) -> Optional[Audio]:
+        if not content_hash:
+            return None
+        return self.db_manager.get_first(Audio, content_hash=content_hash)
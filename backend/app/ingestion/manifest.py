@@ -0,0 +1,81 @@
+"""In-process index of ingested content: file_id -> source type, collection, chunk count."""
+from typing import Dict, Optional
+
+from pydantic import BaseModel
+
+from app.db import DBManager
+from app.db.models import Youtube, Audio
+from app.enums import TablenameEnum, EmbedddingCollectionEnum
+
+
+class ManifestEntry(BaseModel):
+    file_id: str
+    source_type: str  # TablenameEnum.YOUTUBE or TablenameEnum.AUDIO
+    collection: str
+    chunk_count: Optional[int] = None
+
+
+_SOURCES = {
+    TablenameEnum.YOUTUBE.value: (Youtube, "video_id", EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value),
+    TablenameEnum.AUDIO.value: (Audio, "file_id", EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value),
+}
+
+
+class ContentManifest:
+    """
+    Answers "does this file_id have indexed content, and in which collection?"
+    from memory instead of fetching its chunks from the vector store.
+
+    Loaded from the youtube/audio tables at startup and updated on ingest.
+    Entries written by another process are picked up by a single indexed
+    lookup on the first miss.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, ManifestEntry] = {}
+
+    def __contains__(self, file_id: str) -> bool:
+        return file_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, file_id: str) -> Optional[ManifestEntry]:
+        return self._entries.get(file_id)
+
+    def register(self, file_id: str, source_type: str, chunk_count: Optional[int] = None) -> ManifestEntry:
+        entry = ManifestEntry(
+            file_id=file_id,
+            source_type=source_type,
+            collection=_SOURCES[source_type][2],
+            chunk_count=chunk_count
+        )
+        self._entries[file_id] = entry
+        return entry
+
+    def load(self, db_manager: DBManager) -> int:
+        """Load every ingested file_id from the database; returns the number of entries."""
+        for source_type, (model, key, _) in _SOURCES.items():
+            for file_id, chunk_count in db_manager.select_columns(getattr(model, key), model.chunk_count):
+                self.register(file_id, source_type, chunk_count)
+        print(f"📇 Content manifest loaded with {len(self._entries)} entries")
+        return len(self._entries)
+
+    def lookup(self, db_manager: DBManager, file_id: str) -> Optional[ManifestEntry]:
+        """Resolve a file_id missing from memory with one indexed query per source table."""
+        entry = self.get(file_id)
+        if entry is not None:
+            return entry
+        for source_type, (model, key, _) in _SOURCES.items():
+            # Only chunk_count: the row's content column holds the whole transcript
+            rows = db_manager.select_columns(model.chunk_count, **{key: file_id})
+            if rows:
+                return self.register(file_id, source_type, rows[0][0])
+        return None
+
+
+_manifest = ContentManifest()
+
+
+def get_content_manifest() -> ContentManifest:
+    return _manifest
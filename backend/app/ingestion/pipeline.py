@@ -0,0 +1,322 @@
+"""Streaming ingestion: chunks -> embedder -> vector upserts, as concurrent stages joined by bounded queues.
+
+    source iterator --(embed_queue)--> embed batch (CPU pool) --(upsert_queue)--> upsert batch (IO pool)
+
+Each queue holds at most `queue_size` batches, so memory is bounded by
+queue_size * batch_size chunks and their vectors, not by transcript length.
+Chunk texts are not kept once upserted; a video's transcript, needed for its
+row, is assembled in a TranscriptBuffer that spills to disk.
+While one batch is upserted, the next is embedded and the one after is read,
+so wall-clock approaches the slowest stage instead of the sum of all three.
+"""
+import asyncio
+import tempfile
+import time
+from dataclasses import dataclass, field
+from itertools import islice
+from typing import Any, AsyncIterable, Awaitable, Callable, Dict, Iterable, List, Optional, Union
+
+import numpy as np
+
+from app.embeddings import EmbeddingManager
+from app.embeddings.vectorstore import VectorStore
+from app.executors import run_cpu, run_io
+from app.ingestion import IngestionManager
+from app.ingestion.ratelimit import HostRateLimiter
+from app.utils import require_video_id
+
+_DONE = object()
+
+
+@dataclass
+class PipelineStats:
+    chunks: int = 0
+    batches: int = 0
+    wall_seconds: float = 0.0
+    stage_seconds: Dict[str, float] = field(default_factory=lambda: {"read": 0.0, "embed": 0.0, "upsert": 0.0})
+    max_queue_depth: Dict[str, int] = field(default_factory=lambda: {"embed": 0, "upsert": 0})
+
+    def to_dict(self) -> dict:
+        return {
+            "chunks": self.chunks,
+            "batches": self.batches,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "stage_seconds": {name: round(value, 3) for name, value in self.stage_seconds.items()},
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+def _take(iterator, count: int) -> List[Any]:
+    return list(islice(iterator, count))
+
+
+class TranscriptBuffer:
+    """A transcript assembled chunk by chunk; kept in memory up to max_memory characters, then in a temp file."""
+
+    def __init__(self, max_memory: int = 256 * 1024, separator: str = "\n\n"):
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory, mode="w+", encoding="utf-8")
+        self.separator = separator
+        self._empty = True
+
+    def append(self, text: str):
+        if not self._empty:
+            self._file.write(self.separator)
+        self._file.write(text)
+        self._empty = False
+
+    def read(self) -> str:
+        self._file.seek(0)
+        return self._file.read()
+
+    def close(self):
+        self._file.close()
+
+
+class IngestionPipeline:
+    def __init__(self, embedding_manager: EmbeddingManager, batch_size: int = 64, queue_size: int = 4):
+        self.embedding_manager = embedding_manager
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+
+    async def run(
+        self,
+        source: Union[Iterable[Any], AsyncIterable[Any]],
+        sink: Callable[[List[Any], np.ndarray, int], None],
+        text_of: Callable[[Any], str] = lambda chunk: chunk
+    ) -> PipelineStats:
+        """
+        Stream chunks from `source` through the embedder into `sink`.
+
+        sink(batch, vectors, start_index) runs on the IO pool once per batch, in
+        source order; start_index is the position of the batch's first chunk.
+        An async source is consumed directly; a plain iterator is read on the IO pool.
+        """
+        stats = PipelineStats()
+        embed_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        upsert_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+        async def read_async():
+            batch = []
+            start = time.perf_counter()
+            async for item in source:
+                batch.append(item)
+                if len(batch) == self.batch_size:
+                    stats.stage_seconds["read"] += time.perf_counter() - start
+                    await embed_queue.put(batch)
+                    stats.max_queue_depth["embed"] = max(stats.max_queue_depth["embed"], embed_queue.qsize())
+                    batch = []
+                    start = time.perf_counter()
+            if batch:
+                await embed_queue.put(batch)
+            await embed_queue.put(_DONE)
+
+        async def read():
+            if hasattr(source, "__aiter__"):
+                return await read_async()
+            iterator = iter(source)
+            while True:
+                start = time.perf_counter()
+                # Pull a batch at a time so each thread hop carries batch_size chunks
+                batch = await run_io(_take, iterator, self.batch_size)
+                stats.stage_seconds["read"] += time.perf_counter() - start
+                if not batch:
+                    break
+                await embed_queue.put(batch)
+                stats.max_queue_depth["embed"] = max(stats.max_queue_depth["embed"], embed_queue.qsize())
+            await embed_queue.put(_DONE)
+
+        async def embed():
+            while (batch := await embed_queue.get()) is not _DONE:
+                start = time.perf_counter()
+                vectors = await run_cpu(self.embedding_manager.create_embeddings_bulk, [text_of(c) for c in batch])
+                stats.stage_seconds["embed"] += time.perf_counter() - start
+                await upsert_queue.put((batch, vectors))
+                stats.max_queue_depth["upsert"] = max(stats.max_queue_depth["upsert"], upsert_queue.qsize())
+            await upsert_queue.put(_DONE)
+
+        async def upsert():
+            while (item := await upsert_queue.get()) is not _DONE:
+                batch, vectors = item
+                start = time.perf_counter()
+                await run_io(sink, batch, vectors, stats.chunks)
+                stats.stage_seconds["upsert"] += time.perf_counter() - start
+                stats.chunks += len(batch)
+                stats.batches += 1
+
+        started = time.perf_counter()
+        tasks = [asyncio.create_task(stage()) for stage in (read, embed, upsert)]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # A failed stage would leave the others blocked on a full or empty queue
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        stats.wall_seconds = time.perf_counter() - started
+        return stats
+
+
+async def ingest_youtube_stream(
+    url: str,
+    ingestion_manager: IngestionManager,
+    vector_store: VectorStore,
+    pipeline: IngestionPipeline
+) -> Dict[str, Any]:
+    """Stream a video's transcript chunks into the vector store, then record the video row."""
+    video_id = require_video_id(url)
+    transcript = TranscriptBuffer()
+    source: Dict[str, Optional[str]] = {"url": None}
+
+    def sink(documents, vectors, start_index):
+        vector_store.upsert_youtube_chunks(video_id, documents, vectors, start_index)
+        source["url"] = source["url"] or documents[0].metadata.get("source", url)
+        for doc in documents:
+            transcript.append(doc.page_content)
+
+    try:
+        documents = ingestion_manager.iter_youtube_documents(url)
+        stats = await pipeline.run(documents, sink, text_of=lambda doc: doc.page_content)
+        if stats.chunks == 0:
+            raise ValueError(f"No transcript found for YouTube video: {url}")
+
+        await run_io(vector_store.flush)  # The row marks the video as ingested, so its vectors must be durable first
+        await run_io(vector_store.record_youtube, source["url"], video_id, transcript.read(), stats.chunks)
+    finally:
+        transcript.close()
+    print(f"🚰 Streamed {stats.chunks} chunks for video {video_id}: {stats.to_dict()}")
+    return {"video_id": video_id, "chunk_count": stats.chunks, "stats": stats}
+
+
+async def ingest_text_stream(
+    filename: str,
+    text: str,
+    content_hash: Optional[str],
+    ingestion_manager: IngestionManager,
+    vector_store: VectorStore,
+    pipeline: IngestionPipeline
+) -> Dict[str, Any]:
+    """Stream a transcript's split_text chunks into the vector store, then record the audio row."""
+    file_id = vector_store.audio_file_id(filename, content_hash)
+
+    def sink(chunks, vectors, start_index):
+        vector_store.upsert_audio_chunks(file_id, chunks, vectors, start_index)
+
+    stats = await pipeline.run(ingestion_manager.iter_text_chunks(text), sink)
+    await run_io(vector_store.flush)  # The row marks the file as ingested, so its vectors must be durable first
+    # The row holds the transcript itself, not the (overlapping) chunks joined back together
+    await run_io(vector_store.record_audio, file_id, content_hash, text, stats.chunks)
+    print(f"🚰 Streamed {stats.chunks} chunks for audio {file_id}: {stats.to_dict()}")
+    return {"file_id": file_id, "chunk_count": stats.chunks, "stats": stats}
+
+
+@dataclass
+class BatchItem:
+    """One video of a batch ingestion and its outcome."""
+    url: str
+    video_id: Optional[str]
+    status: str = "pending"  # pending, fetched, ingested, cached or failed
+    chunk_count: int = 0
+    error: Optional[str] = None
+    expected_chunks: int = 0
+    source_url: Optional[str] = None
+    transcript: Optional[TranscriptBuffer] = field(default=None, repr=False)
+
+    def to_dict(self) -> dict:
+        return {"url": self.url, "video_id": self.video_id, "status": self.status,
+                "chunk_count": self.chunk_count, "error": self.error}
+
+
+async def ingest_youtube_batch_stream(
+    items: List[BatchItem],
+    ingestion_manager: IngestionManager,
+    vector_store: VectorStore,
+    pipeline: IngestionPipeline,
+    limiter: HostRateLimiter,
+    concurrency: int = 8,
+    on_fetched: Optional[Callable[[BatchItem], Awaitable[None]]] = None
+) -> PipelineStats:
+    """
+    Ingest many videos through one pipeline run.
+
+    Transcripts are fetched `concurrency` at a time, each fetch waiting for its
+    host's rate limit. Their chunks are merged into one stream, so embedding
+    batches and vector upserts span videos. A video's row is recorded as soon
+    as its last chunk is upserted and flushed. Failures are recorded on the item; the
+    other videos carry on.
+    """
+    chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=pipeline.batch_size * pipeline.queue_size)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def fetch(item: BatchItem):
+        # Chunks are queued while the slot is held, so at most `concurrency` transcripts wait in memory
+        async with semaphore:
+            await limiter.acquire(item.url)
+            try:
+                documents = await run_io(ingestion_manager.load_youtube_video, item.url)
+                if not documents:
+                    raise ValueError(f"No transcript found for YouTube video: {item.url}")
+            except Exception as e:
+                item.status, item.error = "failed", str(e)
+                documents = []
+            else:
+                item.status, item.expected_chunks = "fetched", len(documents)
+                item.source_url = documents[0].metadata.get("source", item.url)
+            if on_fetched is not None:
+                await on_fetched(item)
+            for document in documents:
+                await chunk_queue.put((item, document))
+
+    async def fetch_all(tasks):
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await chunk_queue.put(_DONE)
+
+    async def chunks():
+        tasks = [asyncio.create_task(fetch(item)) for item in items]
+        closer = asyncio.create_task(fetch_all(tasks))
+        try:
+            while (entry := await chunk_queue.get()) is not _DONE:
+                yield entry
+        finally:
+            for task in tasks + [closer]:
+                task.cancel()
+
+    def sink(batch, vectors, start_index):
+        entries = []
+        for item, document in batch:
+            entries.append((item.video_id, item.chunk_count, document))
+            item.chunk_count += 1
+            item.transcript = item.transcript or TranscriptBuffer()
+            item.transcript.append(document.page_content)
+        vector_store.upsert_youtube_batch(entries, vectors)
+
+        finished = [item for item in {id(item): item for item, _ in batch}.values()
+                    if item.chunk_count == item.expected_chunks]
+        if finished:
+            vector_store.flush()  # Once for every video finished in this batch, before their rows
+        for item in finished:
+            try:
+                vector_store.record_youtube(item.source_url, item.video_id, item.transcript.read(),
+                                            item.chunk_count)
+                item.status = "ingested"
+            except Exception as e:
+                item.status, item.error = "failed", str(e)
+            item.transcript.close()
+            item.transcript = None
+
+    try:
+        stats = await pipeline.run(chunks(), sink, text_of=lambda entry: entry[1].page_content)
+    except Exception as e:
+        # Embedding or upsert failed: whatever wasn't fully ingested yet failed with it
+        stats = PipelineStats()
+        for item in items:
+            if item.status in ("pending", "fetched"):
+                item.status, item.error = "failed", str(e)
+    finally:
+        for item in items:
+            if item.transcript is not None:
+                item.transcript.close()
+                item.transcript = None
+    print(f"🚰 Batch-ingested {sum(item.status == 'ingested' for item in items)}/{len(items)} videos: "
+          f"{stats.to_dict()}")
+    return stats
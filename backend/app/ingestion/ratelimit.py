@@ -0,0 +1,84 @@
+"""Per-host token buckets, so batch ingestion doesn't hammer one site with concurrent fetches."""
+import asyncio
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+# Hosts served by the same backend share one bucket
+_HOST_ALIASES = {"youtu.be": "youtube.com", "music.youtube.com": "youtube.com"}
+
+
+def rate_limit_host(url: str) -> str:
+    host = (urlparse(url).hostname or "").lower()
+    for prefix in ("www.", "m."):
+        if host.startswith(prefix):
+            host = host[len(prefix):]
+    return _HOST_ALIASES.get(host, host)
+
+
+class _Bucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+        self.requests = 0
+        self.waited_seconds = 0.0
+
+
+class HostRateLimiter:
+    """
+    At most `rate` requests per second per host, allowing bursts of `burst`.
+    `overrides` maps a host (e.g. "youtube.com") to its own rate.
+    """
+
+    def __init__(self, rate: float = 2.0, burst: int = 4, overrides: Optional[Dict[str, float]] = None):
+        self.rate = rate
+        self.burst = burst
+        self.overrides = {rate_limit_host(f"//{host}"): value for host, value in (overrides or {}).items()}
+        self._buckets: Dict[str, _Bucket] = {}
+
+    def _bucket(self, host: str) -> _Bucket:
+        if host not in self._buckets:
+            self._buckets[host] = _Bucket(self.overrides.get(host, self.rate), self.burst)
+        return self._buckets[host]
+
+    async def acquire(self, url: str):
+        """Wait until a request to url's host is allowed."""
+        bucket = self._bucket(rate_limit_host(url))
+        if bucket.rate <= 0:  # Unlimited
+            bucket.requests += 1
+            return
+        # The lock queues waiters in order, so one sleeper holds it at a time
+        async with bucket.lock:
+            now = time.monotonic()
+            bucket.tokens = min(bucket.capacity, bucket.tokens + (now - bucket.updated) * bucket.rate)
+            bucket.updated = now
+            if bucket.tokens < 1:
+                wait = (1 - bucket.tokens) / bucket.rate
+                bucket.waited_seconds += wait
+                await asyncio.sleep(wait)
+                bucket.tokens = 1.0
+                bucket.updated = time.monotonic()
+            bucket.tokens -= 1
+            bucket.requests += 1
+
+    def stats(self) -> Dict[str, dict]:
+        return {
+            host: {"rate": bucket.rate, "requests": bucket.requests, "waited_seconds": round(bucket.waited_seconds, 3)}
+            for host, bucket in self._buckets.items()
+        }
+
+
+_limiter: Optional[HostRateLimiter] = None
+
+
+def get_host_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter, so concurrent batch jobs share each host's budget."""
+    global _limiter
+    if _limiter is None:
+        from config import settings
+        _limiter = HostRateLimiter(settings.BATCH_HOST_RATE_PER_SECOND, settings.BATCH_HOST_BURST,
+                                   settings.BATCH_HOST_RATE_OVERRIDES)
+    return _limiter
@@ -0,0 +1,163 @@
+"""Ingestion jobs persisted in Postgres, so work survives restarts and runs outside the HTTP request."""
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.db import DBManager
+from app.db.models import IngestionJob
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+TERMINAL_STATUSES = (SUCCEEDED, FAILED)
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _isoformat(value: Optional[datetime]) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def job_to_dict(job: IngestionJob) -> Dict[str, Any]:
+    """Client-facing view of a job; the payload (paths, internal arguments) is not exposed."""
+    return {
+        "job_id": job.id,
+        "kind": job.kind,
+        "status": job.status,
+        "stage": job.stage,
+        "progress": job.progress or {},
+        "result": job.result,
+        "error": job.error,
+        "attempts": job.attempts,
+        "created_at": _isoformat(job.created_at),
+        "updated_at": _isoformat(job.updated_at),
+        "started_at": _isoformat(job.started_at),
+        "finished_at": _isoformat(job.finished_at),
+    }
+
+
+class JobStore:
+    """
+    Job rows in the ingestion_jobs table. Blocking; call through run_io.
+
+    Workers claim jobs with SELECT ... FOR UPDATE SKIP LOCKED, so any number
+    of worker processes can share the table without handing a job out twice.
+    """
+
+    def __init__(self, db_manager: DBManager):
+        self.db_manager = db_manager
+
+    def _session(self):
+        return self.db_manager.SessionLocal()
+
+    def create(self, kind: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        now = _now()
+        job = IngestionJob(id=uuid.uuid4().hex, kind=kind, status=QUEUED, progress={}, payload=payload,
+                           attempts=0, created_at=now, updated_at=now)
+        session = self._session()
+        try:
+            session.add(job)
+            session.commit()
+            return job_to_dict(job)
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to create job: {e}")
+        finally:
+            session.close()
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        session = self._session()
+        try:
+            job = session.get(IngestionJob, job_id)
+            return job_to_dict(job) if job else None
+        finally:
+            session.close()
+
+    def claim(self, worker_id: str) -> Optional[Dict[str, Any]]:
+        """Mark the oldest queued job as running for this worker; returns it with its payload."""
+        session = self._session()
+        try:
+            job = session.execute(
+                select(IngestionJob)
+                .where(IngestionJob.status == QUEUED)
+                .order_by(IngestionJob.created_at)
+                .limit(1)
+                .with_for_update(skip_locked=True)
+            ).scalar_one_or_none()
+            if job is None:
+                session.rollback()
+                return None
+            now = _now()
+            job.status = RUNNING
+            job.worker_id = worker_id
+            job.attempts += 1
+            job.started_at = job.started_at or now
+            job.updated_at = now
+            session.commit()
+            return {**job_to_dict(job), "payload": job.payload}
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to claim job: {e}")
+        finally:
+            session.close()
+
+    def _update(self, job_id: str, **values):
+        session = self._session()
+        try:
+            session.execute(update(IngestionJob).where(IngestionJob.id == job_id).values(updated_at=_now(), **values))
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to update job {job_id}: {e}")
+        finally:
+            session.close()
+
+    def set_progress(self, job_id: str, stage: Optional[str], progress: Dict[str, Any]):
+        self._update(job_id, stage=stage, progress=progress)
+
+    def heartbeat(self, job_id: str):
+        self._update(job_id)
+
+    def succeed(self, job_id: str, result: Dict[str, Any], progress: Dict[str, Any]):
+        self._update(job_id, status=SUCCEEDED, stage=None, progress=progress, result=result, error=None,
+                     finished_at=_now())
+
+    def fail(self, job_id: str, error: str, progress: Dict[str, Any]):
+        self._update(job_id, status=FAILED, progress=progress, error=error, finished_at=_now())
+
+    def requeue(self, job_id: str):
+        """Hand a job back to the queue (e.g. its worker is shutting down)."""
+        self._update(job_id, status=QUEUED, worker_id=None)
+
+    def requeue_stale(self, stale_seconds: float, max_attempts: int) -> int:
+        """
+        Recover jobs whose worker died: running jobs without a heartbeat for
+        stale_seconds go back to the queue, or fail after max_attempts.
+        """
+        cutoff = _now() - timedelta(seconds=stale_seconds)
+        stale = (IngestionJob.status == RUNNING) & (IngestionJob.updated_at < cutoff)
+        session = self._session()
+        try:
+            failed = session.execute(
+                update(IngestionJob)
+                .where(stale & (IngestionJob.attempts >= max_attempts))
+                .values(status=FAILED, error="Worker stopped responding", finished_at=_now(), updated_at=_now())
+            ).rowcount
+            requeued = session.execute(
+                update(IngestionJob).where(stale).values(status=QUEUED, worker_id=None, updated_at=_now())
+            ).rowcount
+            session.commit()
+            if failed or requeued:
+                print(f"♻️  Recovered stale jobs: {requeued} requeued, {failed} failed")
+            return requeued
+        except SQLAlchemyError as e:
+            session.rollback()
+            raise RuntimeError(f"Failed to requeue stale jobs: {e}")
+        finally:
+            session.close()
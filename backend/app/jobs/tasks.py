@@ -0,0 +1,259 @@
+"""YouTube and audio ingestion as staged coroutines, shared by the synchronous endpoints and the job workers."""
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.db import DBManager
+from app.embeddings import EmbeddingManager
+from app.embeddings.vectorstore import VectorStore
+from app.enums import EmbedddingCollectionEnum, TablenameEnum
+from app.executors import run_io
+from app.ingestion import IngestionManager
+from app.ingestion.cache import IngestionCache
+from app.ingestion.manifest import ContentManifest
+from app.ingestion.pipeline import (IngestionPipeline, BatchItem, ingest_youtube_stream, ingest_text_stream,
+                                    ingest_youtube_batch_stream)
+from app.ingestion.ratelimit import get_host_rate_limiter
+from app.llm import LLMProvider
+from app.retriever import RetrievalManager
+from app.retriever.summary_cache import get_summary_cache
+from app.retriever.answer_cache import peek_answer_cache
+from app.utils import SpooledUpload, extract_video_id, require_video_id, generate_audio_transcript
+from config import settings
+
+
+@dataclass
+class IngestionServices:
+    ingestion_manager: IngestionManager
+    embedding_manager: EmbeddingManager
+    db_manager: DBManager
+    llm: LLMProvider
+    ingestion_cache: IngestionCache
+    manifest: ContentManifest
+    pipeline: IngestionPipeline
+
+
+class StageReporter:
+    """
+    Tracks which ingestion stage is running. The synchronous endpoints use it
+    as is; job workers subclass it to persist every transition.
+    """
+
+    def __init__(self, progress: Optional[Dict[str, Any]] = None):
+        self.progress: Dict[str, Any] = dict(progress or {})
+        self.current: Optional[str] = None
+
+    def _close_current(self, status: str):
+        if self.current is not None:
+            self.progress[self.current] = {**self.progress[self.current], "status": status,
+                                           "finished_at": datetime.now(timezone.utc).isoformat()}
+
+    async def stage(self, name: str):
+        self._close_current("done")
+        self.current = name
+        self.progress[name] = {"status": "running", "started_at": datetime.now(timezone.utc).isoformat()}
+        await self._publish()
+
+    async def update(self, **detail):
+        """Attach counters (e.g. videos fetched so far) to the running stage."""
+        if self.current is not None:
+            self.progress[self.current] = {**self.progress[self.current], **detail}
+            await self._publish()
+
+    def finish(self):
+        self._close_current("done")
+        self.current = None
+
+    def fail(self):
+        self._close_current("failed")
+
+    async def _publish(self):
+        pass
+
+
+def invalidate_answers(file_ids: List[str]):
+    """Drop this process's cached chat answers about re-ingested files."""
+    answer_cache = peek_answer_cache()
+    if answer_cache is not None:
+        for file_id in file_ids:
+            answer_cache.invalidate(file_id)
+
+
+async def ingest_youtube(services: IngestionServices, url: str, query: Optional[str] = None,
+                         progress: Optional[StageReporter] = None) -> Dict[str, Any]:
+    """Ingest a video (unless already cached) and summarize it or answer `query`."""
+    requested_id = require_video_id(url)  # Fails the job before any work for a non-video URL
+    progress = progress or StageReporter()
+    await progress.stage("checking_cache")
+    yt_vector_store = await run_io(
+        VectorStore,
+        embedding_manager=services.embedding_manager,
+        db_manager=services.db_manager,
+        collection_name=EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
+    )
+    yt_retriever = RetrievalManager(vector_store=yt_vector_store, llm=services.llm, db_manager=services.db_manager)
+
+    # Skip transcript, embedding and upload if this video was already ingested
+    cached = await run_io(services.ingestion_cache.get_youtube, requested_id)
+
+    if cached is not None:
+        print(f"♻️  Ingestion cache hit for video {cached.video_id}")
+        video_id = cached.video_id
+        if video_id not in services.manifest:
+            services.manifest.register(video_id, TablenameEnum.YOUTUBE.value, cached.chunk_count)
+    else:
+        # Transcript fetch, embedding and vector upload are streamed through one pipeline
+        await progress.stage("ingesting")
+        ingested = await ingest_youtube_stream(url, services.ingestion_manager, yt_vector_store, services.pipeline)
+        video_id = ingested["video_id"]
+        services.manifest.register(video_id, TablenameEnum.YOUTUBE.value, ingested["chunk_count"])
+        # Summaries and answers from an earlier ingestion of this video no longer match its chunks
+        await run_io(get_summary_cache(services.db_manager).invalidate, video_id)
+        invalidate_answers([video_id])
+
+    await progress.stage("summarizing")
+    if query is None:
+        # Served from the summary cache unless this prompt version/model hasn't summarized it yet
+        summary = await yt_retriever.summarize_youtube_video(url)
+    else:
+        summary = await yt_retriever.search_and_summarize(query, file_id=video_id)
+
+    progress.finish()
+    return {"summary": summary, "video_id": video_id, "cached": cached is not None}
+
+
+async def ingest_audio(services: IngestionServices, upload: SpooledUpload, query: Optional[str] = None,
+                       transcription_model: Optional[str] = None,
+                       progress: Optional[StageReporter] = None) -> Dict[str, Any]:
+    """Transcribe and ingest a spooled upload (unless already cached) and summarize it or answer `query`."""
+    progress = progress or StageReporter()
+    await progress.stage("checking_cache")
+    audio_vector_store = await run_io(
+        VectorStore,
+        collection_name=EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value,
+        embedding_manager=services.embedding_manager,
+        db_manager=services.db_manager
+    )
+    audio_retriever = RetrievalManager(vector_store=audio_vector_store, llm=services.llm,
+                                       db_manager=services.db_manager)
+
+    # Identical uploads share a content hash; skip transcription if already ingested
+    cached = await run_io(services.ingestion_cache.get_audio, upload.sha256)
+
+    if cached is not None:
+        print(f"♻️  Ingestion cache hit for audio {cached.file_id}")
+        file_id = cached.file_id
+        if file_id not in services.manifest:
+            services.manifest.register(file_id, TablenameEnum.AUDIO.value, cached.chunk_count)
+    else:
+        # transcription_model picks e.g. a smaller Whisper size for faster, rougher transcripts
+        await progress.stage("transcribing")
+        response = await generate_audio_transcript(upload, model=transcription_model)
+
+        # Stream split chunks through embedding into batched upserts
+        await progress.stage("ingesting")
+        ingested = await ingest_text_stream(
+            upload.filename,
+            response.text,
+            upload.sha256,
+            services.ingestion_manager,
+            audio_vector_store,
+            services.pipeline
+        )
+        file_id = ingested["file_id"]
+        services.manifest.register(file_id, TablenameEnum.AUDIO.value, ingested["chunk_count"])
+        await run_io(get_summary_cache(services.db_manager).invalidate, file_id)
+        invalidate_answers([file_id])
+
+    await progress.stage("summarizing")
+    if query is None:
+        summary = await audio_retriever.summarize_audio_file(file_id)
+    else:
+        summary = await audio_retriever.search_and_summarize(query, file_id=file_id)
+
+    progress.finish()
+    return {"summary": summary, "file_id": file_id, "cached": cached is not None}
+
+
+async def ingest_youtube_batch(services: IngestionServices, urls: List[str], playlists: List[str] = (),
+                               max_videos: Optional[int] = None,
+                               progress: Optional[StageReporter] = None) -> Dict[str, Any]:
+    """
+    Ingest a list of videos and/or every video of some playlists or channels.
+
+    Videos are only indexed (no summaries), and already ingested ones are
+    skipped. Returns per-video results and the throughput in videos/minute.
+    """
+    progress = progress or StageReporter()
+    started = time.perf_counter()
+    max_videos = min(max_videos or settings.BATCH_MAX_VIDEOS, settings.BATCH_MAX_VIDEOS)
+
+    await progress.stage("expanding")
+    candidates = list(urls)
+    for playlist in playlists:
+        candidates.extend(await run_io(services.ingestion_manager.list_playlist_videos, playlist, max_videos))
+
+    items: List[BatchItem] = []
+    seen = set()
+    for url in candidates:
+        video_id = extract_video_id(url)
+        if (video_id or url) in seen:
+            continue
+        seen.add(video_id or url)
+        item = BatchItem(url=url, video_id=video_id)
+        if video_id is None:
+            item.status, item.error = "failed", "Not a YouTube video URL"
+        items.append(item)
+        if len(items) >= max_videos:
+            break
+
+    await progress.stage("checking_cache")
+    cached = await run_io(services.ingestion_cache.get_youtube_many, [item.video_id for item in items])
+    for item in items:
+        record = cached.get(item.video_id)
+        if record is not None and item.status == "pending":
+            item.status, item.chunk_count = "cached", record.chunk_count or 0
+            if item.video_id not in services.manifest:
+                services.manifest.register(item.video_id, TablenameEnum.YOUTUBE.value, record.chunk_count)
+    pending = [item for item in items if item.status == "pending"]
+
+    await progress.stage("ingesting")
+    await progress.update(total=len(pending), fetched=0, failed=0)
+    vector_store = await run_io(
+        VectorStore,
+        embedding_manager=services.embedding_manager,
+        db_manager=services.db_manager,
+        collection_name=EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
+    )
+    # Larger batches than single-video ingestion: chunks from many videos fill them
+    pipeline = IngestionPipeline(services.embedding_manager, batch_size=settings.BATCH_INGEST_BATCH_SIZE,
+                                 queue_size=settings.INGEST_QUEUE_SIZE)
+    counts = {"fetched": 0, "failed": 0}
+
+    async def on_fetched(item: BatchItem):
+        counts["fetched" if item.status == "fetched" else "failed"] += 1
+        await progress.update(**counts)
+
+    stats = await ingest_youtube_batch_stream(
+        pending, services.ingestion_manager, vector_store, pipeline, get_host_rate_limiter(),
+        concurrency=settings.BATCH_FETCH_CONCURRENCY, on_fetched=on_fetched
+    )
+    ingested = [item for item in pending if item.status == "ingested"]
+    for item in ingested:
+        services.manifest.register(item.video_id, TablenameEnum.YOUTUBE.value, item.chunk_count)
+    if ingested:
+        await run_io(get_summary_cache(services.db_manager).invalidate_many, [item.video_id for item in ingested])
+        invalidate_answers([item.video_id for item in ingested])
+    progress.finish()
+
+    wall_seconds = time.perf_counter() - started
+    totals = {status: sum(item.status == status for item in items) for status in ("ingested", "cached", "failed")}
+    return {
+        "items": [item.to_dict() for item in items],
+        "total": len(items),
+        **totals,
+        "wall_seconds": round(wall_seconds, 3),
+        "videos_per_minute": round(totals["ingested"] / (wall_seconds / 60), 2) if wall_seconds else 0.0,
+        "pipeline": stats.to_dict(),
+    }
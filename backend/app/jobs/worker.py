@@ -0,0 +1,277 @@
+"""
+Workers that claim ingestion jobs from Postgres and run them stage by stage.
+
+The API process runs JOB_WORKERS of them in its event loop (0 disables
+that). To scale ingestion separately from the web tier, run dedicated
+worker processes against the same database and upload directory:
+
+    python -m app.jobs.worker --concurrency 4
+"""
+import argparse
+import asyncio
+import os
+import signal
+import socket
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from app.executors import run_io, PoolSaturatedError
+from app.jobs import JobStore
+from app.jobs.tasks import IngestionServices, StageReporter, ingest_audio, ingest_youtube, ingest_youtube_batch
+from app.utils import SpooledUpload
+from config import Settings, get_settings
+
+
+class JobProgress(StageReporter):
+    """Persists each stage transition on the job row, where polling and SSE clients read it."""
+
+    def __init__(self, store: JobStore, job_id: str, progress: Optional[Dict[str, Any]] = None):
+        super().__init__(progress)
+        self.store = store
+        self.job_id = job_id
+
+    async def _publish(self):
+        await run_io(self.store.set_progress, self.job_id, self.current, dict(self.progress))
+
+
+async def run_youtube_job(services: IngestionServices, payload: Dict[str, Any], progress: StageReporter):
+    return await ingest_youtube(services, payload["url"], payload.get("query"), progress)
+
+
+async def run_youtube_batch_job(services: IngestionServices, payload: Dict[str, Any], progress: StageReporter):
+    return await ingest_youtube_batch(services, payload.get("urls") or [], payload.get("playlists") or [],
+                                      payload.get("max_videos"), progress)
+
+
+async def run_audio_job(services: IngestionServices, payload: Dict[str, Any], progress: StageReporter):
+    upload = SpooledUpload(**payload["upload"])
+    try:
+        result = await ingest_audio(services, upload, payload.get("query"), payload.get("transcription_model"),
+                                    progress)
+    except Exception:
+        upload.cleanup()  # Failed for good; a cancelled (requeued) job keeps its file
+        raise
+    upload.cleanup()
+    return result
+
+
+JobHandler = Callable[[IngestionServices, Dict[str, Any], StageReporter], Awaitable[Dict[str, Any]]]
+
+HANDLERS: Dict[str, JobHandler] = {
+    "youtube": run_youtube_job,
+    "youtube_batch": run_youtube_batch_job,
+    "audio": run_audio_job,
+}
+
+
+class JobWorkerPool:
+    """
+    `concurrency` worker loops in the current event loop. Each claims the
+    oldest queued job, heartbeats while running it and records the outcome.
+    A job whose worker dies is requeued once its heartbeat is stale_seconds old.
+    """
+
+    def __init__(self, store: JobStore, services: IngestionServices, concurrency: int = 2,
+                 poll_seconds: float = 1.0, heartbeat_seconds: float = 15.0, stale_seconds: float = 120.0,
+                 max_attempts: int = 3):
+        self.store = store
+        self.services = services
+        self.concurrency = concurrency
+        self.poll_seconds = poll_seconds
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.max_attempts = max_attempts
+        self.worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._running: Dict[str, str] = {}  # worker_id -> job_id
+        self.succeeded = 0
+        self.failed = 0
+
+    async def start(self):
+        await run_io(self.store.requeue_stale, self.stale_seconds, self.max_attempts)
+        self._tasks = [asyncio.create_task(self._work(f"{self.worker_prefix}/{i}")) for i in range(self.concurrency)]
+        self._tasks.append(asyncio.create_task(self._reap()))
+        print(f"👷 {self.concurrency} ingestion job workers started ({self.worker_prefix})")
+
+    def notify(self):
+        """Wake idle workers now instead of at their next poll (jobs queued by this process)."""
+        self._wakeup.set()
+
+    async def _idle(self):
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.poll_seconds)
+        except asyncio.TimeoutError:
+            pass
+        self._wakeup.clear()
+
+    async def _work(self, worker_id: str):
+        while True:
+            try:
+                job = await run_io(self.store.claim, worker_id)
+            except Exception as e:
+                print(f"⚠️  Job claim failed on {worker_id}: {e}")
+                job = None
+            if job is None:
+                await self._idle()
+                continue
+            await self._run(worker_id, job)
+
+    async def _heartbeat(self, job_id: str):
+        while True:
+            await asyncio.sleep(self.heartbeat_seconds)
+            try:
+                await run_io(self.store.heartbeat, job_id)
+            except Exception as e:
+                print(f"⚠️  Heartbeat failed for job {job_id}: {e}")
+
+    async def _reap(self):
+        """Periodically requeue jobs abandoned by workers in other (crashed) processes."""
+        while True:
+            await asyncio.sleep(self.stale_seconds)
+            try:
+                await run_io(self.store.requeue_stale, self.stale_seconds, self.max_attempts)
+            except Exception as e:
+                print(f"⚠️  Stale job recovery failed: {e}")
+
+    async def _run(self, worker_id: str, job: Dict[str, Any]):
+        job_id = job["job_id"]
+        progress = JobProgress(self.store, job_id, job["progress"])
+        heartbeat = asyncio.create_task(self._heartbeat(job_id))
+        self._running[worker_id] = job_id
+        print(f"⚙️  {worker_id} running {job['kind']} job {job_id} (attempt {job['attempts']})")
+        try:
+            handler = HANDLERS.get(job["kind"])
+            if handler is None:
+                raise ValueError(f"Unknown job kind: {job['kind']}")
+            result = await handler(self.services, job["payload"], progress)
+            await run_io(self.store.succeed, job_id, result, progress.progress)
+            self.succeeded += 1
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back rather than waiting for it to go stale
+            await asyncio.shield(run_io(self.store.requeue, job_id))
+            raise
+        except PoolSaturatedError:
+            # Transient backpressure, not a job failure
+            await run_io(self.store.requeue, job_id)
+            await asyncio.sleep(self.poll_seconds)
+        except Exception as e:
+            progress.fail()
+            print(f"❌ Job {job_id} failed: {e}")
+            await run_io(self.store.fail, job_id, str(e), progress.progress)
+            self.failed += 1
+        finally:
+            heartbeat.cancel()
+            self._running.pop(worker_id, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency": self.concurrency,
+            "running": len(self._running),
+            "succeeded": self.succeeded,
+            "failed": self.failed,
+        }
+
+    async def aclose(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+
+def build_ingestion_services(settings: Settings) -> IngestionServices:
+    """The same shared managers the endpoints receive through Depends."""
+    from app.dependencies import (get_db_manager, get_embedding_manager, get_ingestion_manager,
+                                  get_ingestion_cache, get_ingestion_pipeline, get_ingestion_services,
+                                  get_llm_provider)
+    from app.ingestion.manifest import get_content_manifest
+
+    db_manager = get_db_manager(settings)
+    embedding_manager = get_embedding_manager()
+    return get_ingestion_services(
+        ingestion_manager=get_ingestion_manager(),
+        embedding_manager=embedding_manager,
+        db_manager=db_manager,
+        llm=get_llm_provider(),
+        ingestion_cache=get_ingestion_cache(db_manager),
+        manifest=get_content_manifest(),
+        pipeline=get_ingestion_pipeline(embedding_manager)
+    )
+
+
+_workers: Optional[JobWorkerPool] = None
+
+
+def get_job_workers() -> Optional[JobWorkerPool]:
+    """Workers running in this process, or None when jobs are left to dedicated worker processes."""
+    return _workers
+
+
+async def start_job_workers(settings: Settings, concurrency: Optional[int] = None) -> Optional[JobWorkerPool]:
+    global _workers
+    concurrency = settings.JOB_WORKERS if concurrency is None else concurrency
+    if _workers is None and concurrency > 0:
+        from app.dependencies import get_db_manager
+
+        workers = JobWorkerPool(
+            JobStore(get_db_manager(settings)),
+            build_ingestion_services(settings),
+            concurrency=concurrency,
+            poll_seconds=settings.JOB_POLL_SECONDS,
+            heartbeat_seconds=settings.JOB_HEARTBEAT_SECONDS,
+            stale_seconds=settings.JOB_STALE_SECONDS,
+            max_attempts=settings.JOB_MAX_ATTEMPTS
+        )
+        await workers.start()
+        _workers = workers
+    return _workers
+
+
+async def stop_job_workers():
+    global _workers
+    if _workers is not None:
+        await _workers.aclose()
+        _workers = None
+        print("👷 Ingestion job workers stopped")
+
+
+async def _serve(concurrency: int):
+    from app.embeddings.backends import close_collections
+    from app.executors import shutdown_pools
+    from app.llm.registry import init_llm_registry, close_llm_registry
+    from app.retriever.history_writer import close_history_writer
+    from app.db.async_manager import close_async_db_manager
+    from app.transcription.engine import close_transcriber
+    from app.warmup import warm_up
+
+    settings = get_settings()
+    init_llm_registry(settings)
+    await warm_up(settings)
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await start_job_workers(settings, concurrency=concurrency)
+    await stop.wait()
+
+    await stop_job_workers()
+    await close_history_writer()
+    await close_async_db_manager()
+    await close_transcriber()
+    await close_llm_registry()
+    close_collections()
+    shutdown_pools(wait=True)
+
+
+def main():
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="Run ingestion job workers without the web server")
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                        help="Jobs run at once by this process")
+    args = parser.parse_args()
+    asyncio.run(_serve(max(1, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""Async LLM providers behind a common interface (Groq or Ollama)."""
+import asyncio
+from typing import AsyncGenerator, Dict, List, Optional
+
+import httpx
+from groq import AsyncGroq
+from ollama import AsyncClient
+
+Messages = List[Dict[str, str]]
+
+
+class LLMProvider:
+    """Interface used by RetrievalManager for chat completions."""
+
+    name: str = "base"
+
+    def __init__(self, model: str, timeout: float):
+        self.model = model
+        self.timeout = timeout
+
+    async def complete(
+        self,
+        messages: Messages,
+        timeout: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        """Return the full completion for the messages."""
+        raise NotImplementedError
+
+    async def stream(self, messages: Messages, timeout: Optional[float] = None) -> AsyncGenerator[str, None]:
+        """
+        Yield completion tokens as they arrive.
+
+        Closing the generator (e.g. on client disconnect) closes the upstream
+        response so the provider stops generating tokens.
+        """
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    async def aclose(self):
+        """Release the underlying HTTP connections."""
+
+
+class GroqProvider(LLMProvider):
+    name = "groq"
+
+    def __init__(self, api_key: str, model: str, timeout: float, client: Optional[AsyncGroq] = None):
+        super().__init__(model, timeout)
+        self.client = client or AsyncGroq(api_key=api_key, timeout=timeout)
+
+    async def complete(
+        self,
+        messages: Messages,
+        timeout: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        # Omitted unless set: an explicit null is not the same as leaving the limit to the API
+        extra = {"max_tokens": max_tokens} if max_tokens else {}
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            timeout=timeout or self.timeout,
+            **extra
+        )
+        return response.choices[0].message.content
+
+    async def stream(self, messages: Messages, timeout: Optional[float] = None) -> AsyncGenerator[str, None]:
+        stream = await self.client.chat.completions.create(
+            model=self.model,
+            messages=messages,
+            stream=True,
+            timeout=timeout or self.timeout,
+        )
+        try:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        finally:
+            await stream.close()
+
+    async def aclose(self):
+        await self.client.close()
+
+
+class OllamaProvider(LLMProvider):
+    name = "ollama"
+
+    def __init__(self, host: str, api_key: str, model: str, timeout: float, client: Optional[AsyncClient] = None):
+        super().__init__(model, timeout)
+        # A shared client is closed by whoever owns it (LLMClientRegistry); our own through its transport
+        self._transport: Optional[httpx.AsyncHTTPTransport] = None
+        if client is None:
+            self._transport = httpx.AsyncHTTPTransport()
+            client = AsyncClient(
+                host,
+                headers={"Authorization": "Bearer " + (api_key or "")},
+                timeout=timeout,
+                transport=self._transport,
+            )
+        self.client = client
+
+    async def complete(
+        self,
+        messages: Messages,
+        timeout: Optional[float] = None,
+        max_tokens: Optional[int] = None
+    ) -> str:
+        options = {"num_predict": max_tokens} if max_tokens else None
+        response = await asyncio.wait_for(
+            self.client.chat(model=self.model, messages=messages, options=options),
+            timeout=timeout or self.timeout,
+        )
+        return response.message.content
+
+    async def stream(self, messages: Messages, timeout: Optional[float] = None) -> AsyncGenerator[str, None]:
+        stream = await asyncio.wait_for(
+            self.client.chat(model=self.model, messages=messages, stream=True),
+            timeout=timeout or self.timeout,
+        )
+        try:
+            async for chunk in stream:
+                if chunk.message.content:
+                    yield chunk.message.content
+        finally:
+            await stream.aclose()
+
+    async def aclose(self):
+        if self._transport is not None:
+            await self._transport.aclose()
+
+
+def create_llm_provider(
+    settings,
+    groq_client: Optional[AsyncGroq] = None,
+    ollama_client: Optional[AsyncClient] = None
+) -> LLMProvider:
+    """Build the provider selected by settings.LLM_PROVIDER, reusing shared clients if given."""
+    provider = (settings.LLM_PROVIDER or "groq").lower()
+    if provider == "groq":
+        return GroqProvider(
+            api_key=settings.GROQ_API_KEY,
+            model=settings.LLM_MODEL,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            client=groq_client,
+        )
+    if provider == "ollama":
+        return OllamaProvider(
+            host=settings.OLLAMA_HOST,
+            api_key=settings.OLLAMA_API_KEY,
+            model=settings.OLLAMA_MODEL,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            client=ollama_client,
+        )
+    raise ValueError(f"Unsupported LLM_PROVIDER: {settings.LLM_PROVIDER}")
@@ -0,0 +1,87 @@
+"""Process-wide LLM client registry, opened and closed by the FastAPI lifespan."""
+from typing import Optional
+
+import httpx
+from groq import AsyncGroq
+from ollama import AsyncClient
+
+from app.llm import LLMProvider, create_llm_provider
+
+_registry: Optional["LLMClientRegistry"] = None
+
+
+class LLMClientRegistry:
+    """
+    Holds the shared Groq/Ollama clients and their keep-alive connection pools.
+
+    Groq is always created because transcription uses it; Ollama only when it is
+    the configured chat provider.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._http_client = httpx.AsyncClient(**self._http_options())
+        self.groq = AsyncGroq(
+            api_key=settings.GROQ_API_KEY,
+            timeout=settings.LLM_TIMEOUT_SECONDS,
+            http_client=self._http_client,
+        )
+        self.ollama: Optional[AsyncClient] = None
+        # ollama's AsyncClient builds its own httpx client; we keep the transport (its connection pool) to close it
+        self._ollama_transport: Optional[httpx.AsyncHTTPTransport] = None
+        if (settings.LLM_PROVIDER or "").lower() == "ollama":
+            self._ollama_transport = httpx.AsyncHTTPTransport(
+                http2=settings.LLM_HTTP2,
+                limits=self._http_options()["limits"],
+            )
+            self.ollama = AsyncClient(
+                settings.OLLAMA_HOST,
+                headers={"Authorization": "Bearer " + (settings.OLLAMA_API_KEY or "")},
+                timeout=settings.LLM_TIMEOUT_SECONDS,
+                transport=self._ollama_transport,
+            )
+        self.provider: LLMProvider = create_llm_provider(
+            settings, groq_client=self.groq, ollama_client=self.ollama
+        )
+
+    def _http_options(self) -> dict:
+        return {
+            "http2": self.settings.LLM_HTTP2,
+            "timeout": self.settings.LLM_TIMEOUT_SECONDS,
+            "limits": httpx.Limits(
+                max_connections=self.settings.LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=self.settings.LLM_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=self.settings.LLM_KEEPALIVE_EXPIRY_SECONDS,
+            ),
+        }
+
+    async def aclose(self):
+        """Close every client so pooled connections are released cleanly."""
+        await self.groq.close()
+        if self._ollama_transport is not None:
+            await self._ollama_transport.aclose()
+
+
+def init_llm_registry(settings) -> LLMClientRegistry:
+    """Create the registry; called once from the application lifespan."""
+    global _registry
+    if _registry is None:
+        _registry = LLMClientRegistry(settings)
+        print(f"🔌 LLM clients ready (provider: {_registry.provider.name}, http2: {settings.LLM_HTTP2})")
+    return _registry
+
+
+def get_llm_registry() -> LLMClientRegistry:
+    """Return the shared registry, creating it lazily outside the app lifespan (scripts)."""
+    if _registry is None:
+        from config import get_settings
+        return init_llm_registry(get_settings())
+    return _registry
+
+
+async def close_llm_registry():
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
+        print("🔌 LLM clients closed")
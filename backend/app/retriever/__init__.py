@@ -1,264 +1,369 @@
 """Retrieve and Summarize texts based on similarity search in vector store."""
 from app.embeddings.vectorstore import VectorStore
-from app.utils import extract_video_id
-from app.db import DBManager
+from app.embeddings.batcher import get_query_batcher
+from app.utils import require_video_id
+from app.db import DBManager, AsyncDBManager
+from app.db.async_manager import get_async_db_manager
 from app.db.models import ChatHistory
 from app.schema import ChatHistorySchema
-from groq import Groq
-from ollama import Client
+from app.executors import run_io
+from app.llm import LLMProvider
+from app.retriever.summarizer import HierarchicalSummarizer
+from app.retriever.summary_cache import SummaryCache, get_summary_cache
+from app.retriever.history_writer import ChatHistoryWriter, get_history_writer
+from app.retriever.answer_cache import (AnswerProbe, SemanticAnswerCache, context_fingerprint, get_answer_cache,
+                                        is_context_dependent)
+from app.ingestion.manifest import ContentManifest
 from config import settings
+from collections import namedtuple
 from datetime import datetime, timezone
-from typing import List, Optional, AsyncGenerator
+from typing import Any, Awaitable, Callable, List, Optional, AsyncGenerator, Sequence, Tuple
+
+# Part of the summary cache key: bump when a summary prompt (or how it is built) changes
+YOUTUBE_SUMMARY_TEMPLATE_VERSION = "youtube-summary-v1"
+AUDIO_SUMMARY_TEMPLATE_VERSION = "audio-summary-v1"
+
+# Earlier messages sent with each chat turn (bounds prompt tokens)
+CHAT_CONTEXT_MESSAGES = 10
+HISTORY_COLUMNS = ("id", "role", "message", "file_id", "created_at")
+# Same shape as the rows select_page returns, for messages the history writer hasn't committed yet
+HistoryRow = namedtuple("HistoryRow", HISTORY_COLUMNS)
+
+
+def history_cursor(row) -> str:
+    """Keyset cursor pointing just before `row` (its created_at and id)."""
+    # Uncommitted rows have no id yet; 0 still pages back to everything older
+    return f"{row.created_at.isoformat()}|{row.id or 0}"
+
+
+def _naive_utc(moment: datetime) -> datetime:
+    """created_at as the (timezone-less) conversations column returns it."""
+    return moment.astimezone(timezone.utc).replace(tzinfo=None) if moment.tzinfo else moment
+
+
+def parse_history_cursor(cursor: str) -> Tuple[datetime, int]:
+    created_at, _, row_id = cursor.rpartition("|")
+    try:
+        return datetime.fromisoformat(created_at), int(row_id)
+    except ValueError:
+        raise ValueError(f"Invalid history cursor: {cursor!r}")
 
-groq_api_key = settings.GROQ_API_KEY
 
 class RetrievalManager:
-    def __init__(self, vector_store: VectorStore, db_manager: DBManager = None):
+    def __init__(self, vector_store: VectorStore, llm: LLMProvider, db_manager: DBManager = None,
+                 manifest: ContentManifest = None, summary_cache: SummaryCache = None,
+                 answer_cache: SemanticAnswerCache = None, history_writer: ChatHistoryWriter = None,
+                 async_db_manager: AsyncDBManager = None):
         self.vector_store = vector_store
-        self.groq_client = Groq(api_key=groq_api_key)
-        self.ollama_client = Client(settings.OLLAMA_HOST,
-                                    headers={'Authorization': 'Bearer ' + settings.OLLAMA_API_KEY})
-        self.ollama_model = settings.OLLAMA_MODEL
+        self.llm = llm
         self.db_manager = db_manager
+        # Chat history goes through asyncpg when DB_ASYNC is on
+        self.async_db_manager = async_db_manager or (get_async_db_manager() if db_manager else None)
+        self.manifest = manifest
+        # Summaries are only cached where they can be persisted
+        self.summary_cache = summary_cache or (get_summary_cache(db_manager) if db_manager else None)
+        # None when ANSWER_CACHE_ENABLED is off
+        self.answer_cache = answer_cache or get_answer_cache()
+        # None when CHAT_HISTORY_WRITE_BEHIND is off or there is no database
+        self.history_writer = history_writer or (get_history_writer(db_manager) if db_manager else None)
+        self.summarizer = HierarchicalSummarizer(
+            llm,
+            context_token_budget=settings.SUMMARY_CONTEXT_TOKEN_BUDGET,
+            group_token_budget=settings.SUMMARY_GROUP_TOKEN_BUDGET,
+            fan_out=settings.SUMMARY_FAN_OUT,
+            max_concurrency=settings.SUMMARY_MAX_CONCURRENCY,
+            partial_max_tokens=settings.SUMMARY_PARTIAL_MAX_TOKENS
+        )
+
+    async def _save_messages(self, file_id: Optional[str], *messages):
+        """
+        Persist (role, message) pairs to chat history if db_manager is available:
+        queued on the history writer (committed off the request path), or
+        inserted in one transaction when write-behind is off.
+        """
+        if not self.db_manager:
+            return
+        entries = [
+            ChatHistorySchema(
+                message=message,
+                role=role,
+                file_id=file_id,
+                created_at=datetime.now(timezone.utc)
+            )
+            for role, message in messages
+        ]
+        if self.history_writer is not None:
+            self.history_writer.enqueue(entries)
+        elif self.async_db_manager is not None:
+            await self.async_db_manager.bulk_insert(ChatHistory, entries)
+        else:
+            await run_io(self.db_manager.bulk_insert, ChatHistory, entries)
 
-    def summarize_youtube_video(self, video_url: str):
+    @property
+    def _model_key(self) -> str:
+        return f"{self.llm.name}:{self.llm.model}"
+
+    async def _retrieve(self, query: str, top_k: int, file_id: Optional[str], prompt: str,
+                        chat_history: Sequence[ChatHistory] = ()) -> Tuple[List[str], Optional[AnswerProbe]]:
         """
-        Summarizes the video based on the url link
+        Embed the query through the shared micro-batcher and search the vector
+        store, scoped to file_id when given.
+
+        Also returns the answer cache probe, or None when the answer must not be
+        cached (no cache, no file, no context, or a question that leans on
+        chat_history). On a cache hit probe.answer is set; with
+        ANSWER_CACHE_VERIFY_CONTEXT off the hit skips the search too.
         """
-        video_id = extract_video_id(video_url)
-        results = self.vector_store.query_by_metadata({"video_id": video_id})
-        context = "\n\n".join(results)
-        
-        prompt = f"""
+        query_embedding = await get_query_batcher().embed(query)
+
+        probe = None
+        if self.answer_cache is not None and file_id:
+            if is_context_dependent(query, chat_history):
+                self.answer_cache.bypass()
+            else:
+                probe = AnswerProbe(file_id, SemanticAnswerCache.unit(query_embedding), top_k, self._model_key,
+                                    prompt)
+                if not settings.ANSWER_CACHE_VERIFY_CONTEXT:
+                    probe.answer = self.answer_cache.lookup(probe)
+                    if probe.answer is not None:
+                        return [], probe
+
+        results = await run_io(
+            self.vector_store.similarity_search,
+            [query_embedding.tolist()],
+            top_k=top_k,
+            where=self.vector_store.file_filter(file_id) if file_id else None
+        )
+        if probe is not None:
+            if not results:
+                return results, None
+            if settings.ANSWER_CACHE_VERIFY_CONTEXT:
+                # Only reuse answers grounded on exactly these chunks
+                probe.fingerprint = context_fingerprint(results)
+                probe.answer = self.answer_cache.lookup(probe)
+        return results, probe
+
+    def _remember_answer(self, probe: Optional[AnswerProbe], query: str, answer: str):
+        if probe is not None and probe.answer is None:
+            self.answer_cache.store(probe, query, answer)
+
+    async def _cached_summary(self, file_id: str, template_version: str,
+                              generate: Callable[[], Awaitable[str]]) -> str:
+        """Return the cached summary for this prompt version and model, generating (and storing) it on a miss."""
+        if self.summary_cache is not None:
+            summary = await run_io(self.summary_cache.get, file_id, template_version, self._model_key)
+            if summary is not None:
+                return summary
+
+        summary = await generate()
+        if self.summary_cache is not None:
+            await run_io(self.summary_cache.put, file_id, template_version, self._model_key, summary)
+        # Save to chat history if db_manager is available
+        await self._save_messages(file_id, ("assistant", summary))
+        return summary
+
+    async def summarize_youtube_video(self, video_url: str):
+        """
+        Summarizes the video based on the url link; served from the summary cache when possible
+        """
+        video_id = require_video_id(video_url)
+        return await self._cached_summary(video_id, YOUTUBE_SUMMARY_TEMPLATE_VERSION,
+                                          lambda: self._generate_youtube_summary(video_id))
+
+    async def _generate_youtube_summary(self, video_id: str) -> str:
+        results = await run_io(self.vector_store.get_ordered_documents, {"video_id": video_id})
+
+        def build_messages(context: str):
+            prompt = f"""
             Generate a well-detailed summary of the YouTube video using the following context:
 
             {context}
 
             Please provide a comprehensive summary covering the main points and key takeaways.
             """
-        messages = [
-                {"role": "system", 
+            return [
+                {"role": "system",
                  "content": "You are a helpful assistant that summarizes YouTube videos based on their transcripts."
                 },
-                {"role": "user", 
+                {"role": "user",
                  "content": prompt}
             ]
-        
-
-        # Using Groq
-        response = self.groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-        )
-        summary = response.choices[0].message.content
-
 
-        # #Using Ollama
-        # response = self.ollama_client.chat(
-        #         model = self.ollama_model,
-        #         messages=messages
-        # )
-        # summary = response.message.content
+        # Long transcripts are summarized in parallel groups first (map-reduce)
+        return await self.summarizer.summarize(results, build_messages, source="YouTube video transcript")
 
-
-        # Save to chat history if db_manager is available
-        if self.db_manager:
-            chat_entry = ChatHistorySchema(
-                message=summary,
-                role="assistant",
-                file_id=video_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, chat_entry)
-        
-        return summary
-    
-    def summarize_audio_file(self, file_id: str):
+    async def summarize_audio_file(self, file_id: str):
         """
-        Summarizes the audio file based on file_id
+        Summarizes the audio file based on file_id; served from the summary cache when possible
         """
-        results = self.vector_store.query_by_metadata({"file_id": file_id})
-        context = "\n\n".join(results)
-        
-        prompt = f"""
+        return await self._cached_summary(file_id, AUDIO_SUMMARY_TEMPLATE_VERSION,
+                                          lambda: self._generate_audio_summary(file_id))
+
+    async def _generate_audio_summary(self, file_id: str) -> str:
+        results = await run_io(self.vector_store.get_ordered_documents, {"file_id": file_id})
+
+        def build_messages(context: str):
+            prompt = f"""
                 Generate a well-detailed summary of the audio transcript using the following context:
 
                 {context}
 
                 Please provide a comprehensive summary covering the main points and key takeaways.
                 """
-        
-        messages = [
-                {"role": "system", 
+            return [
+                {"role": "system",
                  "content": "You are a helpful assistant that summarizes audio transcripts."
                 },
-                {"role": "user", 
+                {"role": "user",
                  "content": prompt}
             ]
-        
-        # Using Groq
-        response = self.groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-        )
-        
-        summary = response.choices[0].message.content
-
-        # ## Using Ollama
-        # response = self.ollama_client.chat(
-        #         model = self.ollama_model,
-        #         messages=messages
-        # )
-
-        # summary = response.message.content
-        
-        
-        # Save to chat history if db_manager is available
-        if self.db_manager:
-            chat_entry = ChatHistorySchema(
-                message=summary,
-                role="assistant",
-                file_id=file_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, chat_entry)
-        
-        return summary
 
-    def search_and_summarize(self, query: str, top_k: int = 5, file_id: Optional[str] = None):
+        # Long transcripts are summarized in parallel groups first (map-reduce)
+        return await self.summarizer.summarize(results, build_messages, source="audio transcript")
+
+    async def search_and_summarize(self, query: str, top_k: int = 5, file_id: Optional[str] = None):
         """
         Retrieves and summarizes texts based on the query from the vector store.
         """
-        # results = self.vector_store.query(query_text=query, top_k=top_k)
-        # context = "\n\n".join(results)
-        
         full_context = ""
-        if file_id:
-            results = self.vector_store.query_by_metadata({"file_id": file_id})
-            results_2 = self.vector_store.query(query_text=query, top_k=top_k)
-            results.extend(results_2)
-        else:
-            results = self.vector_store.query(query_text=query, top_k=top_k)
+        # Scope the search to the file so top_k only comes from its own chunks
+        results, probe = await self._retrieve(query, top_k, file_id, "search")
+        if probe is not None and probe.answer is not None:
+            await self._save_messages(file_id, ("user", query), ("assistant", probe.answer))
+            return probe.answer
 
         # Use a generator expression to build the context string
         full_context = "\n\n".join(result for result in results)
         if not full_context:
             return "No relevant information found."
-        
+
         # Prepare messages for the LLM
         messages = [
-            {"role": "system", 
+            {"role": "system",
              "content": "You are a helpful assistant that answers questions based on the provided context."
             },
-            {"role": "user", 
+            {"role": "user",
              "content": f"Question: {query}\n\nContext:\n{full_context}\n\nPlease provide a detailed answer based on the context above."}
         ]
-        
-
-        # Using Groq
-        response = self.groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-        )
-        answer = response.choices[0].message.content
-
-
-        # ## Using Ollama
-        # response = self.ollama_client.chat(
-        #         model = self.ollama_model,
-        #         messages=messages
-        # )
-        # answer = response.message.content
 
+        answer = await self.llm.complete(messages)
+        self._remember_answer(probe, query, answer)
 
         # Save query and response to chat history if db_manager is available
-        if self.db_manager:
-            # Save user query
-            user_entry = ChatHistorySchema(
-                message=query,
-                role="user",
-                file_id=file_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, user_entry)
-            
-            # Save assistant response
-            assistant_entry = ChatHistorySchema(
-                message=answer,
-                role="assistant",
-                file_id=file_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, assistant_entry)
+        await self._save_messages(file_id, ("user", query), ("assistant", answer))
 
         return answer
-    
-    def get_chat_history(self, file_id: str, limit: int = 50) -> List[ChatHistory]:
+
+    def get_chat_history(self, file_id: str, limit: int = 50, before: Optional[str] = None) -> List[Any]:
         """
-        Retrieve chat history for a specific file_id (video_id or audio file_id)
+        Retrieve the last `limit` chat messages for a specific file_id (video_id or audio file_id), oldest first.
+
+        Rows are lightweight tuples of HISTORY_COLUMNS, read newest-first from
+        the (file_id, created_at, id) index. Pass history_cursor(history[0]) as
+        `before` to get the page of older messages. The first page includes
+        messages still queued on this process's history writer (id None).
         """
         if not self.db_manager:
             return []
-        
+
+        pending = self._pending_history(file_id, before)
         try:
-            history = self.db_manager.filter_data(
+            rows = self.db_manager.select_page(
                 ChatHistory,
+                HISTORY_COLUMNS,
+                order_by=("created_at", "id"),
+                limit=limit,
+                before=parse_history_cursor(before) if before else None,
                 file_id=file_id
             )
-            # Sort by created_at and limit
-            history.sort(key=lambda x: x.created_at)
-            return history[-limit:] if len(history) > limit else history
-        except Exception as e:
+        except RuntimeError as e:
             print(f"Error retrieving chat history: {e}")
+            rows = []
+        return self._with_pending(rows[::-1], pending, limit)
+
+    async def aget_chat_history(self, file_id: str, limit: int = 50, before: Optional[str] = None) -> List[Any]:
+        """get_chat_history without an I/O pool thread when the async engine is enabled."""
+        if self.async_db_manager is None:
+            return await run_io(self.get_chat_history, file_id, limit, before)
+
+        pending = self._pending_history(file_id, before)
+        try:
+            rows = await self.async_db_manager.select_page(
+                ChatHistory,
+                HISTORY_COLUMNS,
+                order_by=("created_at", "id"),
+                limit=limit,
+                before=parse_history_cursor(before) if before else None,
+                file_id=file_id
+            )
+        except RuntimeError as e:
+            print(f"Error retrieving chat history: {e}")
+            rows = []
+        return self._with_pending(rows[::-1], pending, limit)
+
+    def _pending_history(self, file_id: str, before: Optional[str]) -> List[Any]:
+        """Uncommitted messages for the first page; snapshot before the query so none is missed."""
+        if self.history_writer is None or before is not None:
             return []
-    
-    def chat_with_context(
-        self, 
-        query: str, 
+        return [
+            HistoryRow(None, entry.role, entry.message, entry.file_id, _naive_utc(entry.created_at))
+            for entry in self.history_writer.pending(file_id)
+        ]
+
+    @staticmethod
+    def _with_pending(rows: List[Any], pending: List[Any], limit: int) -> List[Any]:
+        # Read-your-writes: add uncommitted messages, minus any committed by the time the query ran
+        committed = {(row.created_at, row.role, row.message) for row in rows}
+        pending = [row for row in pending if (row.created_at, row.role, row.message) not in committed]
+        if pending:
+            rows = sorted(rows + pending, key=lambda row: row.created_at)[-limit:]
+        return rows
+
+    def _has_content(self, file_id: str) -> bool:
+        """Existence check from the manifest; without one, let the scoped search decide."""
+        if self.manifest is None:
+            return True
+        entry = self.manifest.get(file_id)
+        return entry is not None and entry.chunk_count != 0
+
+    async def _build_chat_messages(
+        self,
+        query: str,
         file_id: str,
-        include_vector_search: bool = True,
-        top_k: int = 3
+        include_vector_search: bool,
+        top_k: int
     ):
         """
-        Chat with the LLM using both chat history and vector search context.
-        
-        Args:
-            query: User's question
-            file_id: video_id or audio file_id to maintain context
-            include_vector_search: Whether to include vector search results
-            top_k: Number of relevant chunks to retrieve
+        Build the message list from chat history and optional vector search
+        context. Also returns the answer cache probe (see _retrieve).
         """
-        # Get chat history
-        chat_history = self.get_chat_history(file_id)
-        
+        # Get recent chat history (only what is sent, to avoid token limits)
+        recent_history = await self.aget_chat_history(file_id, CHAT_CONTEXT_MESSAGES)
+
         # Build messages array
         messages = [
-            {"role": "system", 
-             "content": """You are a helpful assistant that answers questions about a YouTube video or audio file. 
+            {"role": "system",
+             "content": """You are a helpful assistant that answers questions about a YouTube video or audio file.
                         Use the conversation history and provided context to give accurate, detailed answers."""
             }
         ]
-        
-        # Add recent chat history (last 10 messages to avoid token limits)
-        for chat in chat_history[-10:]:
+
+        # Add recent chat history
+        for chat in recent_history:
             messages.append({
                 "role": chat.role,
                 "content": chat.message
             })
-        
+
         # Add current query with optional vector search context
-        if include_vector_search:
-            # Search for relevant content
-            results = self.vector_store.query_by_metadata({"file_id": file_id})
-            if not results:
-                # Try with video_id for YouTube videos
-                results = self.vector_store.query_by_metadata({"video_id": file_id})
-            
-            if results:
-                # Also do semantic search on the query
-                semantic_results = self.vector_store.query(query_text=query, top_k=top_k)
+        probe = None
+        if include_vector_search and self._has_content(file_id):
+            # Semantic search on the query, scoped to this file
+            semantic_results, probe = await self._retrieve(query, top_k, file_id, "chat", recent_history)
+
+            if semantic_results:
                 context = "\n\n".join(semantic_results)
-                
+
                 user_message = f"""Question: {query}
                                     Relevant Context:
                                     {context}
@@ -267,177 +372,93 @@ class RetrievalManager:
                 user_message = query
         else:
             user_message = query
-        
+
         messages.append({"role": "user", "content": user_message})
-        
-        # Get response
+        return messages, probe
 
-        # Using Groq
-        response = self.groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-        )
-        
-        answer = response.choices[0].message.content
+    async def chat_with_context(
+        self,
+        query: str,
+        file_id: str,
+        include_vector_search: bool = True,
+        top_k: int = 3
+    ):
+        """
+        Chat with the LLM using both chat history and vector search context.
 
-        # ## Using Ollama
-        # response = self.ollama_client.chat(
-        #         model = self.ollama_model,
-        #         messages=messages
-        # )
-        # answer = response.message.content
+        Args:
+            query: User's question
+            file_id: video_id or audio file_id to maintain context
+            include_vector_search: Whether to include vector search results
+            top_k: Number of relevant chunks to retrieve
+        """
+        messages, probe = await self._build_chat_messages(query, file_id, include_vector_search, top_k)
+
+        if probe is not None and probe.answer is not None:
+            answer = probe.answer
+        else:
+            answer = await self.llm.complete(messages)
+            self._remember_answer(probe, query, answer)
 
         # Save to chat history
-        if self.db_manager:
-            # Save user query
-            user_entry = ChatHistorySchema(
-                message=query,
-                role="user",
-                file_id=file_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, user_entry)
-            
-            # Save assistant response
-            assistant_entry = ChatHistorySchema(
-                message=answer,
-                role="assistant",
-                file_id=file_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, assistant_entry)
+        await self._save_messages(file_id, ("user", query), ("assistant", answer))
 
         return answer
-    
+
     async def chat_with_context_streaming(
-        self, 
-        query: str, 
+        self,
+        query: str,
         file_id: str,
         include_vector_search: bool = True,
         top_k: int = 3
     ) -> AsyncGenerator[str, None]:
         """
         Stream chat responses with context (for real-time streaming in UI).
-        
+
+        If the consumer closes the generator before the stream finishes (client
+        disconnected), the upstream LLM stream is closed and nothing is saved.
+
         Args:
             query: User's question
             file_id: video_id or audio file_id to maintain context
             include_vector_search: Whether to include vector search results
             top_k: Number of relevant chunks to retrieve
         """
-        # Get chat history
-        chat_history = self.get_chat_history(file_id)
-        
-        # Build messages array
-        messages = [
-            {"role": "system", 
-             "content": "You are a helpful assistant that answers questions about a YouTube video or audio file. Use the conversation history and provided context to give accurate, detailed answers."
-            }
-        ]
-        
-        # Add recent chat history (last 10 messages)
-        for chat in chat_history[-10:]:
-            messages.append({
-                "role": chat.role,
-                "content": chat.message
-            })
-        
-        # Add current query with optional vector search context
-        if include_vector_search:
-            # Search for relevant content
-            results = self.vector_store.query_by_metadata({"file_id": file_id})
-            if not results:
-                results = self.vector_store.query_by_metadata({"video_id": file_id})
-            
-            if results:
-                semantic_results = self.vector_store.query(query_text=query, top_k=top_k)
-                context = "\n\n".join(semantic_results)
-                
-                user_message = f"""Question: {query}
-                                Relevant Context:
-                                {context}
-
-                                Please answer the question based on the context and our conversation history."""
-            else:
-                user_message = query
-        else:
-            user_message = query
-        
-        messages.append({"role": "user", "content": user_message})
-        
-        # Get streaming response
+        messages, probe = await self._build_chat_messages(query, file_id, include_vector_search, top_k)
 
+        if probe is not None and probe.answer is not None:
+            # Cached answer: one chunk, no LLM call
+            yield probe.answer
+            await self._save_messages(file_id, ("user", query), ("assistant", probe.answer))
+            return
 
-        # Using Groq
-        stream = self.groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-            stream=True,
-        )
-        
         # Collect full response for saving
         full_response = []
-        
-        # Stream chunks
-        for chunk in stream:
-            if chunk.choices[0].delta.content:
-                content = chunk.choices[0].delta.content
+
+        # Stream chunks; closing this generator closes the provider stream
+        stream = self.llm.stream(messages)
+        try:
+            async for content in stream:
                 full_response.append(content)
                 yield content
+        finally:
+            await stream.aclose()
 
-
-        # ## Using Ollama
-        # stream = self.ollama_client.chat(
-        #     model = self.ollama_model,
-        #     messages=messages,
-        #     stream=True
-        # )
-        
-        # # Collect full response for saving
-        # full_response = []
-        
-        # # Stream chunks
-        # for chunk in stream:
-        #     if chunk.message.content:
-        #         content = chunk.message.content
-        #         full_response.append(content)
-        #         yield content
-        
         # Save to chat history after streaming completes
-        if self.db_manager:
-            answer = "".join(full_response)
-            
-            # Save user query
-            user_entry = ChatHistorySchema(
-                message=query,
-                role="user",
-                file_id=file_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, user_entry)
-            
-            # Save assistant response
-            assistant_entry = ChatHistorySchema(
-                message=answer,
-                role="assistant",
-                file_id=file_id,
-                created_at=datetime.now(timezone.utc)
-            )
-            self.db_manager.insert_data(ChatHistory, assistant_entry)
-    
-    def clear_chat_history(self, file_id: str):
+        answer = "".join(full_response)
+        self._remember_answer(probe, query, answer)
+        await self._save_messages(file_id, ("user", query), ("assistant", answer))
+
+    def clear_chat_history(self, file_id: str) -> Optional[int]:
         """
-        Clear chat history for a specific file_id
+        Clear chat history for a specific file_id with a single DELETE.
+        Returns the number of messages deleted, or None if it failed.
         """
         if not self.db_manager:
-            return False
-        
+            return None
+
         try:
-            history = self.db_manager.filter_data(ChatHistory, file_id=file_id)
-            for chat in history:
-                self.db_manager.delete_data(ChatHistory, chat.id)
-            return True
-        except Exception as e:
+            return self.db_manager.delete_where(ChatHistory, file_id=file_id)
+        except RuntimeError as e:
             print(f"Error clearing chat history: {e}")
-            return False
-        
\ No newline at end of file
+            return None
@@ -0,0 +1,208 @@
+"""Per-file semantic cache of chat answers: near-identical questions reuse an earlier answer instead of an LLM call."""
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+_WORD = re.compile(r"[a-z']+")
+# "this video" names the file, not an earlier turn
+_CONTENT_REFERENCE = re.compile(
+    r"\b(?:this|that|the)\s+(?:video|audio|podcast|talk|episode|recording|file|transcript|lecture|speech|interview)\b"
+)
+_REFERENCE_WORDS = {
+    "it", "its", "this", "that", "these", "those", "he", "she", "they", "him", "her", "them", "his", "hers",
+    "their", "theirs", "above", "previous", "earlier", "again", "more", "else", "former", "latter", "same",
+}
+_FOLLOW_UP_OPENERS = {"and", "but", "so", "also", "then", "or", "why", "how about", "what about"}
+
+
+def is_context_dependent(query: str, chat_history: Sequence) -> bool:
+    """
+    Whether the answer may depend on earlier turns, so a cached answer could be wrong.
+
+    Without earlier user questions nothing can be referred back to. Otherwise
+    short questions, follow-up openers ("and why?", "what about...") and
+    pronouns or back-references ("it", "those", "the previous one") count as
+    context-dependent.
+    """
+    if not any(getattr(chat, "role", None) == "user" for chat in chat_history):
+        return False
+    text = _CONTENT_REFERENCE.sub(" ", query.lower())
+    words = _WORD.findall(text)
+    if len(words) < 3:
+        return True
+    if words[0] in _FOLLOW_UP_OPENERS or " ".join(words[:2]) in _FOLLOW_UP_OPENERS:
+        return True
+    return any(word in _REFERENCE_WORDS for word in words)
+
+
+def context_fingerprint(chunks: Sequence[str]) -> str:
+    """Order-insensitive hash of the retrieved chunks an answer was grounded on."""
+    digest = hashlib.sha256()
+    for chunk in sorted(chunks):
+        digest.update(hashlib.sha256(chunk.encode("utf-8")).digest())
+    return digest.hexdigest()
+
+
+@dataclass
+class AnswerProbe:
+    """One chat request's cache lookup; carries what is needed to store its answer afterwards."""
+    file_id: str
+    embedding: np.ndarray  # Unit length
+    top_k: int
+    model: str
+    prompt: str  # Which prompt produced the answer ("chat", "search")
+    fingerprint: Optional[str] = None
+    answer: Optional[str] = None  # Set on a hit
+
+
+@dataclass
+class _Entry:
+    query: str
+    embedding: np.ndarray
+    top_k: int
+    model: str
+    prompt: str
+    fingerprint: Optional[str]
+    answer: str
+    created_at: float
+
+
+class SemanticAnswerCache:
+    """
+    Answers keyed by query embedding, per file_id.
+
+    A lookup hits when an entry of the same file, top_k, model and prompt has
+    cosine similarity >= `similarity` and, if the probe carries a fingerprint,
+    was answered from the same retrieved chunks. Entries expire after ttl_seconds
+    and are evicted least-recently-used beyond max_entries overall or
+    max_per_file for one file. In-process only; each worker keeps its own.
+    """
+
+    def __init__(self, similarity: float = 0.92, ttl_seconds: float = 3600, max_entries: int = 2048,
+                 max_per_file: int = 64):
+        self.similarity = similarity
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_per_file = max_per_file
+        self._entries: "OrderedDict[Tuple[str, int], _Entry]" = OrderedDict()  # LRU over every file
+        self._by_file: Dict[str, List[int]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.similarities: List[float] = []  # Best score of recent lookups, to tune the threshold
+
+    @staticmethod
+    def unit(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32).ravel()
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm else vector
+
+    def _remove(self, key: Tuple[str, int]):
+        self._entries.pop(key, None)
+        ids = self._by_file.get(key[0])
+        if ids is not None:
+            ids.remove(key[1])
+            if not ids:
+                del self._by_file[key[0]]
+
+    def lookup(self, probe: AnswerProbe) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            best_key, best_score = None, -1.0
+            for entry_id in list(self._by_file.get(probe.file_id, [])):
+                key = (probe.file_id, entry_id)
+                entry = self._entries[key]
+                if now - entry.created_at > self.ttl_seconds:
+                    self._remove(key)
+                    continue
+                if (entry.top_k, entry.model, entry.prompt) != (probe.top_k, probe.model, probe.prompt):
+                    continue
+                if probe.fingerprint is not None and entry.fingerprint != probe.fingerprint:
+                    continue
+                score = float(entry.embedding @ probe.embedding)
+                if score > best_score:
+                    best_key, best_score = key, score
+
+            if best_key is not None:
+                self.similarities = (self.similarities + [round(best_score, 4)])[-100:]
+            if best_key is None or best_score < self.similarity:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            return self._entries[best_key].answer
+
+    def store(self, probe: AnswerProbe, query: str, answer: str):
+        if not answer:
+            return
+        with self._lock:
+            key = (probe.file_id, self._next_id)
+            self._next_id += 1
+            self._entries[key] = _Entry(query, probe.embedding, probe.top_k, probe.model, probe.prompt,
+                                        probe.fingerprint, answer, time.monotonic())
+            ids = self._by_file.setdefault(probe.file_id, [])
+            ids.append(key[1])
+            while len(ids) > self.max_per_file:
+                # Least recently used entry of this file
+                self._remove(next(k for k in self._entries if k[0] == probe.file_id))
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def bypass(self):
+        with self._lock:
+            self.bypassed += 1
+
+    def invalidate(self, file_id: str) -> int:
+        """Forget every answer about file_id (e.g. it was re-ingested)."""
+        with self._lock:
+            ids = list(self._by_file.get(file_id, []))
+            for entry_id in ids:
+                self._remove((file_id, entry_id))
+            return len(ids)
+
+    def stats(self) -> dict:
+        # Counters change under the lock on request threads, so read them consistently under it too
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "files": len(self._by_file),
+                "hits": self.hits,
+                "misses": self.misses,
+                "bypassed": self.bypassed,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "similarity_threshold": self.similarity,
+                "median_best_similarity": float(np.median(self.similarities)) if self.similarities else None,
+            }
+
+
+_answer_cache: Optional[SemanticAnswerCache] = None
+
+
+def get_answer_cache() -> Optional[SemanticAnswerCache]:
+    """Process-wide cache, or None when ANSWER_CACHE_ENABLED is off."""
+    global _answer_cache
+    from config import settings
+    if not settings.ANSWER_CACHE_ENABLED:
+        return None
+    if _answer_cache is None:
+        _answer_cache = SemanticAnswerCache(
+            similarity=settings.ANSWER_CACHE_SIMILARITY,
+            ttl_seconds=settings.ANSWER_CACHE_TTL_SECONDS,
+            max_entries=settings.ANSWER_CACHE_MAX_ENTRIES,
+            max_per_file=settings.ANSWER_CACHE_MAX_PER_FILE
+        )
+    return _answer_cache
+
+
+def peek_answer_cache() -> Optional[SemanticAnswerCache]:
+    """The cache if one was created, without creating it (for metrics and invalidation)."""
+    return _answer_cache
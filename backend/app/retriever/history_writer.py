@@ -0,0 +1,222 @@
+"""Write-behind persistence of chat history.
+
+Chat turns enqueue their messages and return; one worker task inserts them
+in batches (one executemany per batch) when max_batch_size are waiting or
+every flush_interval_ms. Queued and in-flight messages are visible through
+pending(), so reads merge them in and a client sees its own messages before
+they are committed. The queue is flushed on shutdown.
+
+Messages are acknowledged before they are durable: a crash or kill loses up
+to flush_interval_ms of them (more while the database is failing, up to
+max_retries flushes), and messages still failing after that are dropped.
+Hence CHAT_HISTORY_WRITE_BEHIND is off by default. Retries, dropped messages
+and messages lost at shutdown are logged and counted in stats().
+"""
+import asyncio
+import logging
+import threading
+import time
+from typing import List, Optional
+
+from app.db import DBManager, AsyncDBManager
+from app.db.async_manager import get_async_db_manager
+from app.db.models import ChatHistory
+from app.embeddings.batcher import Histogram
+from app.executors import run_io
+from app.schema import ChatHistorySchema
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ChatHistoryWriter:
+    def __init__(self, db_manager: DBManager, max_batch_size: int = 256, flush_interval_ms: float = 200.0,
+                 max_retries: int = 5, async_db_manager: Optional[AsyncDBManager] = None):
+        self.db_manager = db_manager
+        self.async_db_manager = async_db_manager
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self.max_retries = max_retries
+        # Both are read from executor threads by pending(), so guarded by a thread lock
+        self._queued: List[ChatHistorySchema] = []
+        self._in_flight: List[ChatHistorySchema] = []
+        self._discarded = set()  # file_ids being deleted: a failed in-flight batch must not requeue them
+        self._lock = threading.Lock()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flushing: Optional[asyncio.Lock] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._failures = 0  # Consecutive failed flushes of the head batch
+        # Counters are updated and read under the lock
+        self.written = 0
+        self.retries = 0  # Failed flushes that were requeued
+        self.dropped = 0  # Messages given up on after max_retries failed flushes
+        self.lost_at_shutdown = 0  # Messages still queued when aclose() gave up
+        self.batch_sizes = Histogram([1, 2, 4, 8, 16, 32, 64, 128, 256])
+        self.flush_ms = Histogram([1, 2, 5, 10, 25, 50, 100, 250, 1000])
+
+    def _ensure_worker(self):
+        if self._worker is None or self._worker.done():
+            self._wakeup = self._wakeup or asyncio.Event()
+            self._flushing = self._flushing or asyncio.Lock()
+            self._worker = asyncio.create_task(self._run())
+
+    def enqueue(self, entries: List[ChatHistorySchema]):
+        """Queue messages for insertion; returns immediately. Call from the event loop."""
+        self._ensure_worker()
+        with self._lock:
+            self._queued.extend(entries)
+            full = len(self._queued) >= self.max_batch_size
+        if full:
+            self._wakeup.set()
+
+    def pending(self, file_id: str) -> List[ChatHistorySchema]:
+        """
+        Messages of file_id not yet committed (queued or being inserted), oldest first.
+
+        Take this snapshot before querying the database: a message leaves it
+        only once committed, so every message is in the snapshot, the query
+        result, or both.
+        """
+        with self._lock:
+            return [entry for entry in self._in_flight + self._queued if entry.file_id == file_id]
+
+    async def discard(self, file_id: str) -> int:
+        """
+        Drop file_id's uncommitted messages because its history is being deleted.
+
+        Returns once a batch being inserted has finished, so a DELETE issued
+        afterwards also removes any of its rows; a failed batch is not retried
+        for this file_id. Returns the number of queued messages dropped.
+        """
+        with self._lock:
+            kept = [entry for entry in self._queued if entry.file_id != file_id]
+            dropped = len(self._queued) - len(kept)
+            self._queued = kept
+            self._discarded.add(file_id)
+        try:
+            if self._flushing is not None:
+                async with self._flushing:
+                    pass
+        finally:
+            with self._lock:
+                self._discarded.discard(file_id)
+        return dropped
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            await self.flush()
+
+    async def _flush_batch(self) -> bool:
+        """Insert the oldest batch; False if nothing was queued or the insert failed."""
+        with self._lock:
+            batch = self._queued[:self.max_batch_size]
+            del self._queued[:len(batch)]
+            self._in_flight = batch
+        if not batch:
+            return False
+
+        started = time.perf_counter()
+        try:
+            if self.async_db_manager is not None:
+                await self.async_db_manager.bulk_insert(ChatHistory, batch)
+            else:
+                await run_io(self.db_manager.bulk_insert, ChatHistory, batch)
+        except Exception as e:
+            self._failures += 1
+            with self._lock:
+                self._in_flight = []
+                # Messages of histories deleted meanwhile are not written back
+                batch = [entry for entry in batch if entry.file_id not in self._discarded]
+                if self._failures <= self.max_retries:
+                    # Put it back in front so order is kept; the next interval retries it
+                    self._queued[:0] = batch
+                    self.retries += 1
+                    logger.warning("Chat history flush failed (%d/%d), will retry: %s",
+                                   self._failures, self.max_retries, e)
+                else:
+                    self._failures = 0
+                    self.dropped += len(batch)
+                    logger.error("Dropped %d chat history messages after %d failed flushes: %s",
+                                 len(batch), self.max_retries + 1, e)
+            return False
+
+        with self._lock:
+            self._in_flight = []
+            self.written += len(batch)
+        self._failures = 0
+        self.batch_sizes.observe(len(batch))
+        self.flush_ms.observe((time.perf_counter() - started) * 1000)
+        return True
+
+    async def flush(self):
+        """Insert everything queued so far."""
+        if self._flushing is None:
+            return
+        async with self._flushing:
+            while await self._flush_batch():
+                pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "queued": len(self._queued) + len(self._in_flight),
+                "written": self.written,
+                "retries": self.retries,
+                "dropped": self.dropped,
+                "lost_at_shutdown": self.lost_at_shutdown,
+                "batch_size": self.batch_sizes.to_dict(),
+                "flush_ms": self.flush_ms.to_dict(),
+            }
+
+    async def aclose(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+        # Final flush: one attempt per batch, so shutdown doesn't hang on a dead database
+        self.max_retries = 0
+        await self.flush()
+        with self._lock:
+            remaining = len(self._queued)
+            self.lost_at_shutdown += remaining
+        if remaining:
+            logger.error("%d chat history messages not persisted at shutdown", remaining)
+
+
+_writer: Optional[ChatHistoryWriter] = None
+
+
+def get_history_writer(db_manager: DBManager) -> Optional[ChatHistoryWriter]:
+    """Process-wide writer, or None when CHAT_HISTORY_WRITE_BEHIND is off (messages are inserted inline)."""
+    global _writer
+    if not settings.CHAT_HISTORY_WRITE_BEHIND:
+        return None
+    if _writer is None:
+        _writer = ChatHistoryWriter(
+            db_manager,
+            max_batch_size=settings.CHAT_HISTORY_FLUSH_BATCH_SIZE,
+            flush_interval_ms=settings.CHAT_HISTORY_FLUSH_INTERVAL_MS,
+            max_retries=settings.CHAT_HISTORY_FLUSH_RETRIES,
+            async_db_manager=get_async_db_manager()
+        )
+    return _writer
+
+
+def peek_history_writer() -> Optional[ChatHistoryWriter]:
+    """The writer if one was created, without creating it (for metrics)."""
+    return _writer
+
+
+async def close_history_writer():
+    global _writer
+    if _writer is not None:
+        await _writer.aclose()
+        _writer = None
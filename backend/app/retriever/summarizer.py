@@ -0,0 +1,122 @@
+"""Map-reduce summarization for transcripts that don't fit in a single prompt."""
+import asyncio
+import hashlib
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+from app.llm import LLMProvider, Messages
+
+# Partial summaries shared across requests, keyed by model + prompt + group text
+_partial_cache: "OrderedDict[str, str]" = OrderedDict()
+# Caps map/reduce LLM calls across every request; RetrievalManager (and its summarizer) is built per request
+_llm_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_llm_semaphore(max_concurrency: int) -> asyncio.Semaphore:
+    """Process-wide semaphore, sized by the first summarizer that needs it."""
+    global _llm_semaphore
+    if _llm_semaphore is None:
+        _llm_semaphore = asyncio.Semaphore(max_concurrency)
+    return _llm_semaphore
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token for English text)."""
+    return max(1, len(text) // 4)
+
+
+class HierarchicalSummarizer:
+    """
+    Summarizes long transcripts by summarizing groups of chunks in parallel (map)
+    and then summarizing those summaries (reduce) until the result fits the
+    context budget of the final call.
+
+    Args:
+        llm: Provider used for every call
+        context_token_budget: Max context tokens sent to the final summary call
+        group_token_budget: Max tokens of transcript per map call
+        fan_out: Max number of partial summaries combined per reduce call
+        max_concurrency: Max LLM calls in flight at once, across all summarizers in the process
+        partial_max_tokens: Output token cap for each partial summary
+        cache_size: Number of partial summaries kept for reuse
+    """
+
+    def __init__(
+        self,
+        llm: LLMProvider,
+        context_token_budget: int = 8000,
+        group_token_budget: int = 3000,
+        fan_out: int = 6,
+        max_concurrency: int = 4,
+        partial_max_tokens: int = 400,
+        cache_size: int = 512
+    ):
+        if fan_out < 2:
+            raise ValueError("fan_out must be at least 2")
+        self.llm = llm
+        self.context_token_budget = context_token_budget
+        self.group_token_budget = group_token_budget
+        self.fan_out = fan_out
+        self.partial_max_tokens = partial_max_tokens
+        self.cache_size = cache_size
+        self._semaphore = _get_llm_semaphore(max_concurrency)
+
+    def _group(self, parts: List[str], token_budget: int, max_items: int) -> List[List[str]]:
+        """Split parts, in order, into groups that respect the token budget and size."""
+        groups, current, current_tokens = [], [], 0
+        for part in parts:
+            tokens = estimate_tokens(part)
+            if current and (current_tokens + tokens > token_budget or len(current) >= max_items):
+                groups.append(current)
+                current, current_tokens = [], 0
+            current.append(part)
+            current_tokens += tokens
+        if current:
+            groups.append(current)
+        return groups
+
+    async def _summarize_group(self, group: List[str], source: str, level: int) -> str:
+        text = "\n\n".join(group)
+        if level == 0:
+            instruction = (f"Summarize this section of a {source}. Keep every key point, name, "
+                           f"number and conclusion; omit filler.")
+        else:
+            instruction = (f"These are summaries of consecutive sections of a {source}. "
+                           f"Merge them into one summary that keeps every key point in order.")
+
+        key = hashlib.sha256(f"{self.llm.name}:{self.llm.model}:{instruction}:{text}".encode()).hexdigest()
+        if key in _partial_cache:
+            _partial_cache.move_to_end(key)
+            return _partial_cache[key]
+
+        messages = [
+            {"role": "system", "content": "You are a helpful assistant that writes faithful, dense summaries."},
+            {"role": "user", "content": f"{instruction}\n\n{text}"},
+        ]
+        async with self._semaphore:
+            summary = await self.llm.complete(messages, max_tokens=self.partial_max_tokens)
+
+        _partial_cache[key] = summary
+        while len(_partial_cache) > self.cache_size:
+            _partial_cache.popitem(last=False)
+        return summary
+
+    async def reduce_to_budget(self, chunks: List[str], source: str) -> List[str]:
+        """Return chunks unchanged if they fit the context budget, else their reduced summaries."""
+        parts = [chunk for chunk in chunks if chunk]
+        level = 0
+        while len(parts) > 1 and sum(estimate_tokens(p) for p in parts) > self.context_token_budget:
+            max_items = len(parts) if level == 0 else self.fan_out
+            groups = self._group(parts, self.group_token_budget, max_items)
+            if len(groups) == len(parts) and level > 0:
+                # Each summary alone exceeds the group budget; fall back to fan_out-sized groups
+                groups = [parts[i:i + self.fan_out] for i in range(0, len(parts), self.fan_out)]
+            print(f"🧩 Summarizing {len(parts)} parts in {len(groups)} groups (level {level})")
+            parts = await asyncio.gather(*[self._summarize_group(g, source, level) for g in groups])
+            level += 1
+        return parts
+
+    async def summarize(self, chunks: List[str], final_messages: Callable[[str], Messages], source: str) -> str:
+        """Reduce chunks to fit the budget, then run the final prompt built by final_messages(context)."""
+        parts = await self.reduce_to_budget(chunks, source)
+        return await self.llm.complete(final_messages("\n\n".join(parts)))
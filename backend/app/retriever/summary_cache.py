@@ -0,0 +1,125 @@
+"""Generated summaries cached by (file_id, prompt template version, model), in memory and in Postgres."""
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+
+from app.db import DBManager
+from app.db.models import Summary
+from app.schema import SummaryStoreSchema
+
+SummaryKey = Tuple[str, str, str]  # (file_id, template_version, model)
+
+
+class SummaryCache:
+    """
+    Read-through cache for default summaries. Blocking; call through run_io.
+
+    The summaries table is the source of truth and survives restarts. A small
+    LRU in front of it serves repeat requests without a query; its entries are
+    trusted for memory_ttl_seconds only, so an invalidation made by another
+    process is seen within that window. A new template version or model is a
+    different key, so old summaries are never served after a prompt change.
+    """
+
+    def __init__(self, db_manager: DBManager, ttl_seconds: int = 7 * 24 * 3600, memory_items: int = 256,
+                 memory_ttl_seconds: float = 300.0):
+        self.db_manager = db_manager
+        self.ttl_seconds = ttl_seconds
+        self.memory_items = memory_items
+        self.memory_ttl_seconds = memory_ttl_seconds
+        self._memory: "OrderedDict[SummaryKey, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    def _remember(self, key: SummaryKey, summary: str):
+        with self._lock:
+            self._memory[key] = (summary, time.monotonic())
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.memory_items:
+                self._memory.popitem(last=False)
+
+    def get(self, file_id: str, template_version: str, model: str) -> Optional[str]:
+        key = (file_id, template_version, model)
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.memory_ttl_seconds:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+            self._memory.pop(key, None)
+
+        record = self.db_manager.get_first(Summary, file_id=file_id, template_version=template_version, model=model)
+        if record is None or (record.expires_at and record.expires_at <= datetime.now(timezone.utc)):
+            self.misses += 1
+            return None
+        self.db_hits += 1
+        self._remember(key, record.summary)
+        return record.summary
+
+    def put(self, file_id: str, template_version: str, model: str, summary: str):
+        now = datetime.now(timezone.utc)
+        expires_at = now + timedelta(seconds=self.ttl_seconds) if self.ttl_seconds else None
+        self._remember((file_id, template_version, model), summary)
+        try:
+            record = self.db_manager.get_first(Summary, file_id=file_id, template_version=template_version,
+                                               model=model)
+            if record is None:
+                self.db_manager.insert_data(Summary, SummaryStoreSchema(
+                    file_id=file_id, template_version=template_version, model=model, summary=summary,
+                    created_at=now, expires_at=expires_at
+                ))
+            else:
+                self.db_manager.update(Summary, record.id, {"summary": summary, "created_at": now,
+                                                            "expires_at": expires_at})
+        except RuntimeError as e:
+            # Best effort: a concurrent writer of the same key wins, and the summary is still returned
+            print(f"⚠️  Summary not cached for {file_id}: {e}")
+
+    def invalidate(self, file_id: str) -> int:
+        """Drop every cached summary of file_id (all template versions and models); returns rows deleted."""
+        return self.invalidate_many([file_id])
+
+    def invalidate_many(self, file_ids: List[str]) -> int:
+        """invalidate() for a batch of files, with one DELETE."""
+        targets = set(file_ids)
+        with self._lock:
+            for key in [key for key in self._memory if key[0] in targets]:
+                del self._memory[key]
+        return self.db_manager.delete_where(Summary, file_id=list(targets)) if targets else 0
+
+    def stats(self) -> Dict[str, float]:
+        hits = self.memory_hits + self.db_hits
+        lookups = hits + self.misses
+        return {
+            "memory_items": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "db_hits": self.db_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+_summary_cache: Optional[SummaryCache] = None
+
+
+def get_summary_cache(db_manager: DBManager) -> SummaryCache:
+    """Process-wide cache, so hit rates and the memory tier are shared by every request."""
+    global _summary_cache
+    if _summary_cache is None:
+        from config import settings
+        _summary_cache = SummaryCache(
+            db_manager,
+            ttl_seconds=settings.SUMMARY_CACHE_TTL_SECONDS,
+            memory_items=settings.SUMMARY_CACHE_MEMORY_ITEMS,
+            memory_ttl_seconds=settings.SUMMARY_CACHE_MEMORY_TTL_SECONDS
+        )
+    return _summary_cache
+
+
+def peek_summary_cache() -> Optional[SummaryCache]:
+    """The cache if one was created, without creating it (for metrics)."""
+    return _summary_cache
@@ -2,6 +2,7 @@ from pydantic import BaseModel, Field
 from typing import List, Dict, Any, Optional
 from fastapi import UploadFile, File
 from datetime import datetime, timezone
+from config import settings
 
 
 
@@ -9,16 +10,33 @@ class YoutubeSchema(BaseModel):
     url: str
     query: Optional[str] = None
 
+class YoutubeBatchSchema(BaseModel):
+    """Videos to ingest: explicit URLs and/or playlist or channel URLs expanded with yt-dlp"""
+    urls: List[str] = Field(default_factory=list)
+    playlists: List[str] = Field(default_factory=list)
+    max_videos: Optional[int] = Field(None, ge=1, le=settings.BATCH_MAX_VIDEOS)  # None: BATCH_MAX_VIDEOS
+
 class YoutubeStoreSchema(BaseModel):
     url: str
     video_id :str
     content: str
+    chunk_count: Optional[int] = None
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class AudioStoreSchema(BaseModel):
     file_id: str
     content: str
+    content_hash: Optional[str] = None
+    chunk_count: Optional[int] = None
+    created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+
+class SummaryStoreSchema(BaseModel):
+    file_id: str
+    template_version: str
+    model: str
+    summary: str
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
+    expires_at: Optional[datetime] = None
 
 class AudioSchema(BaseModel):
     file: UploadFile = File
@@ -43,4 +61,5 @@ class ChatRequest(BaseModel):
 class ChatHistoryRequest(BaseModel):
     """Schema for retrieving chat history"""
     file_id: str
-    limit: int = 50
\ No newline at end of file
+    limit: int = Field(50, ge=1, le=500)
+    before: Optional[str] = None  # next_cursor of the previous (newer) page
\ No newline at end of file
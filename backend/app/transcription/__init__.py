@@ -0,0 +1,97 @@
+"""Speech-to-text providers and the shared transcript types."""
+import mmap
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+
+@dataclass
+class TranscriptSegment:
+    start: float  # Seconds from the start of the whole file
+    end: float
+    text: str
+
+
+@dataclass
+class TranscriptionResult:
+    text: str
+    segments: List[TranscriptSegment] = field(default_factory=list)
+    stats: Dict[str, Any] = field(default_factory=dict)
+
+
+class TranscriptionProvider:
+    """
+    Transcribes one audio payload; the chunked engine calls it once per segment.
+
+    `model` overrides the provider's default model for one request, trading
+    accuracy for throughput (e.g. a smaller local Whisper size).
+    """
+
+    name = "base"
+
+    async def transcribe(self, data: bytes, filename: str, language: Optional[str] = None,
+                         model: Optional[str] = None) -> TranscriptionResult:
+        raise NotImplementedError
+
+    async def transcribe_file(self, path: str, filename: str, language: Optional[str] = None,
+                              model: Optional[str] = None) -> TranscriptionResult:
+        """Transcribe a file on disk; by default the file is memory-mapped rather than read into RAM."""
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            return await self.transcribe(data, filename, language, model)
+
+    def stats(self) -> Dict[str, Any]:
+        return {}
+
+    async def aclose(self):
+        pass
+
+
+def _field(item: Any, key: str, default=None):
+    return item.get(key, default) if isinstance(item, dict) else getattr(item, key, default)
+
+
+class GroqTranscriptionProvider(TranscriptionProvider):
+    name = "groq"
+
+    def __init__(self, client, model: str = "whisper-large-v3"):
+        self.client = client  # AsyncGroq
+        self.model = model
+
+    async def transcribe(self, data, filename: str, language: Optional[str] = None,
+                         model: Optional[str] = None) -> TranscriptionResult:
+        """`data` may be bytes or an open binary file."""
+        response = await self.client.audio.transcriptions.create(
+            file=(filename, data),
+            model=model or self.model,
+            language=language,
+            response_format="verbose_json"  # Includes segment timestamps
+        )
+        raw_segments = _field(response, "segments") or (getattr(response, "model_extra", None) or {}).get("segments")
+        segments = [
+            TranscriptSegment(
+                start=float(_field(segment, "start", 0.0)),
+                end=float(_field(segment, "end", 0.0)),
+                text=(_field(segment, "text", "") or "").strip()
+            )
+            for segment in raw_segments or []
+        ]
+        return TranscriptionResult(text=(response.text or "").strip(), segments=segments)
+
+    async def transcribe_file(self, path: str, filename: str, language: Optional[str] = None,
+                              model: Optional[str] = None) -> TranscriptionResult:
+        # The HTTP client streams the open file into the multipart body
+        with open(path, "rb") as f:
+            return await self.transcribe(f, filename, language, model)
+
+
+def create_transcription_provider(settings, groq_client=None) -> TranscriptionProvider:
+    """Build the provider named by TRANSCRIPTION_PROVIDER."""
+    provider = (settings.TRANSCRIPTION_PROVIDER or "groq").lower()
+    if provider == "groq":
+        if groq_client is None:
+            from app.llm.registry import get_llm_registry
+            groq_client = get_llm_registry().groq
+        return GroqTranscriptionProvider(groq_client, model=settings.TRANSCRIPTION_MODEL)
+    if provider == "local":
+        from app.transcription.local import LocalWhisperProvider
+        return LocalWhisperProvider.from_settings(settings)
+    raise ValueError(f"Unsupported TRANSCRIPTION_PROVIDER: {settings.TRANSCRIPTION_PROVIDER}")
@@ -0,0 +1,185 @@
+"""Chunked transcription: split long audio at silences, transcribe segments concurrently, stitch the text back."""
+import asyncio
+import os
+import re
+import tempfile
+import time
+from typing import List, Optional, Tuple
+
+from app.embeddings.batcher import Histogram
+from app.executors import run_io
+from app.transcription import (TranscriptionProvider, TranscriptionResult, TranscriptSegment,
+                               create_transcription_provider)
+from app.transcription.segmenter import AudioSpan, export_span, plan_spans, probe_duration_ms
+from config import settings
+
+_NON_WORD = re.compile(r"[^\w']+")
+
+
+def _normalize(word: str) -> str:
+    return _NON_WORD.sub("", word.lower())
+
+
+def overlap_length(previous: List[str], following: List[str], max_words: int = 40, min_words: int = 2) -> int:
+    """Number of leading words of `following` that repeat the tail of `previous` (0 if none)."""
+    limit = min(len(previous), len(following), max_words)
+    tail = [_normalize(word) for word in previous[-limit:]] if limit else []
+    head = [_normalize(word) for word in following[:limit]]
+    for size in range(limit, min_words - 1, -1):
+        if tail[-size:] == head[:size]:
+            return size
+    return 0
+
+
+def _drop_leading_words(segments: List[TranscriptSegment], count: int) -> List[TranscriptSegment]:
+    kept = []
+    for segment in segments:
+        words = segment.text.split()
+        if count >= len(words):
+            count -= len(words)
+            continue
+        kept.append(TranscriptSegment(segment.start, segment.end, " ".join(words[count:])))
+        count = 0
+    return kept
+
+
+def stitch(parts: List[Tuple[AudioSpan, TranscriptionResult]]) -> Tuple[str, List[TranscriptSegment]]:
+    """
+    Join per-span transcripts in order, shifting timestamps to the whole file.
+
+    Overlap is removed twice: provider segments whose midpoint falls before
+    the span's nominal cut are dropped (the previous span owns them), then any
+    words still repeating the end of the text so far are trimmed.
+    """
+    words: List[str] = []
+    segments: List[TranscriptSegment] = []
+    for span, result in sorted(parts, key=lambda part: part[0].index):
+        offset = span.audio_start_ms / 1000
+        cut = span.start_ms / 1000
+        shifted = [TranscriptSegment(s.start + offset, s.end + offset, s.text) for s in result.segments]
+        if span.index:
+            shifted = [s for s in shifted if (s.start + s.end) / 2 >= cut]
+        new_words = (" ".join(s.text for s in shifted) if result.segments else result.text).split()
+
+        duplicated = overlap_length(words, new_words)
+        words.extend(new_words[duplicated:])
+        segments.extend(_drop_leading_words(shifted, duplicated))
+    return " ".join(words), segments
+
+
+class ChunkedTranscriber:
+    """
+    Transcribes long audio as silence-aligned, overlapping segments with at most
+    max_concurrency provider calls in flight. Audio no longer than
+    max_segment_seconds is sent as-is in a single call.
+
+    Works from a file on disk: only the segments in flight are decoded and
+    re-encoded (to temporary files), so memory does not grow with the upload.
+    """
+
+    def __init__(self, provider: TranscriptionProvider, target_segment_seconds: float = 300,
+                 max_segment_seconds: float = 600, overlap_seconds: float = 2.0, max_concurrency: int = 4,
+                 min_silence_ms: int = 500, silence_offset_db: float = -16.0):
+        self.provider = provider
+        self.target_ms = int(target_segment_seconds * 1000)
+        self.max_ms = int(max_segment_seconds * 1000)
+        self.overlap_ms = int(overlap_seconds * 1000)
+        self.max_concurrency = max_concurrency
+        self.min_silence_ms = min_silence_ms
+        self.silence_offset_db = silence_offset_db
+        self.segment_latency_ms = Histogram([500, 1000, 2500, 5000, 10000, 20000, 40000, 80000])
+
+    def _plan(self, path: str, duration_ms: int) -> List[AudioSpan]:
+        if duration_ms <= self.max_ms:  # Also covers an unknown (0) duration
+            return [AudioSpan(index=0, start_ms=0, end_ms=duration_ms, audio_start_ms=0)]
+        return plan_spans(path, duration_ms, self.target_ms, self.max_ms, self.overlap_ms,
+                          min_silence_ms=self.min_silence_ms, silence_offset_db=self.silence_offset_db)
+
+    async def _transcribe_span(self, path: str, span: AudioSpan, name: str, language, model) -> TranscriptionResult:
+        handle, segment_path = tempfile.mkstemp(suffix=".mp3", dir=os.path.dirname(path) or None)
+        os.close(handle)
+        try:
+            await run_io(export_span, path, span, segment_path)
+            return await self.provider.transcribe_file(segment_path, name, language, model)
+        finally:
+            os.remove(segment_path)
+
+    async def transcribe_file(self, path: str, filename: str, language: Optional[str] = None,
+                              model: Optional[str] = None) -> TranscriptionResult:
+        started = time.perf_counter()
+        duration_ms = await run_io(probe_duration_ms, path)
+        spans = await run_io(self._plan, path, duration_ms)
+        stem = os.path.splitext(filename or "audio")[0]
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        latencies = [0.0] * len(spans)
+
+        async def transcribe_span(span: AudioSpan):
+            async with semaphore:
+                start = time.perf_counter()
+                if len(spans) == 1:
+                    # Short files go up untouched, straight from the spooled file
+                    result = await self.provider.transcribe_file(path, filename, language, model)
+                else:
+                    # Segments are decoded and encoded only when their turn comes
+                    name = f"{stem}_{span.index:03d}.mp3"
+                    result = await self._transcribe_span(path, span, name, language, model)
+                latencies[span.index] = (time.perf_counter() - start) * 1000
+                self.segment_latency_ms.observe(latencies[span.index])
+                return span, result
+
+        parts = await asyncio.gather(*(transcribe_span(span) for span in spans))
+        text, segments = stitch(parts)
+        stats = {
+            "provider": self.provider.name,
+            "model": model,
+            "audio_seconds": round(duration_ms / 1000, 1),
+            "segments": len(spans),
+            "segment_latency_ms": [round(latency, 1) for latency in latencies],
+            "wall_seconds": round(time.perf_counter() - started, 3),
+        }
+        print(f"🎙️  Transcribed {stats['audio_seconds']}s of audio in {stats['segments']} segments "
+              f"({stats['wall_seconds']}s wall): {stats['segment_latency_ms']} ms")
+        return TranscriptionResult(text=text, segments=segments, stats=stats)
+
+    def stats(self) -> dict:
+        return {
+            "provider": self.provider.name,
+            "max_concurrency": self.max_concurrency,
+            "segment_latency_ms": self.segment_latency_ms.to_dict(),
+            **self.provider.stats(),
+        }
+
+
+def create_transcriber(provider: TranscriptionProvider) -> ChunkedTranscriber:
+    return ChunkedTranscriber(
+        provider,
+        target_segment_seconds=settings.TRANSCRIPTION_SEGMENT_SECONDS,
+        max_segment_seconds=settings.TRANSCRIPTION_MAX_SEGMENT_SECONDS,
+        overlap_seconds=settings.TRANSCRIPTION_OVERLAP_SECONDS,
+        max_concurrency=settings.TRANSCRIPTION_MAX_CONCURRENCY,
+        min_silence_ms=settings.TRANSCRIPTION_MIN_SILENCE_MS,
+        silence_offset_db=settings.TRANSCRIPTION_SILENCE_OFFSET_DB
+    )
+
+
+_transcriber: Optional[ChunkedTranscriber] = None
+
+
+def get_transcriber() -> ChunkedTranscriber:
+    """Process-wide transcriber over the configured provider."""
+    global _transcriber
+    if _transcriber is None:
+        _transcriber = create_transcriber(create_transcription_provider(settings))
+    return _transcriber
+
+
+def peek_transcriber() -> Optional[ChunkedTranscriber]:
+    """The transcriber if one was created, without creating it (for metrics)."""
+    return _transcriber
+
+
+async def close_transcriber():
+    global _transcriber
+    if _transcriber is not None:
+        await _transcriber.provider.aclose()
+        _transcriber = None
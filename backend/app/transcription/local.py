@@ -0,0 +1,116 @@
+"""Offline transcription with faster-whisper (CTranslate2, int8 on CPU) in a bounded process pool."""
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from app.executors import BoundedExecutor
+from app.transcription import TranscriptionProvider, TranscriptionResult, TranscriptSegment
+
+# Per worker process: model size -> loaded WhisperModel
+_worker_models: Dict[str, Any] = {}
+_worker_options: Dict[str, Any] = {}
+
+
+def _init_worker(options: Dict[str, Any], preload: Tuple[str, ...]):
+    _worker_options.update(options)
+    for model_size in preload:
+        _load_model(model_size)
+
+
+def _load_model(model_size: str):
+    if model_size not in _worker_models:
+        from faster_whisper import WhisperModel
+
+        _worker_models[model_size] = WhisperModel(
+            model_size,
+            device="cpu",
+            compute_type=_worker_options.get("compute_type", "int8"),
+            cpu_threads=_worker_options.get("cpu_threads", 2),
+            download_root=_worker_options.get("download_root") or None,
+        )
+    return _worker_models[model_size]
+
+
+def _worker_ready(model_size: str) -> int:
+    _load_model(model_size)
+    return os.getpid()
+
+
+def _transcribe_in_worker(source: Union[bytes, str], model_size: str, language: Optional[str],
+                          beam_size: int) -> Tuple[str, List[Tuple[float, float, str]], float]:
+    """`source` is the audio bytes or a file path the worker opens itself."""
+    model = _load_model(model_size)
+    audio = io.BytesIO(source) if isinstance(source, bytes) else source
+    segments, info = model.transcribe(audio, language=language, beam_size=beam_size, vad_filter=True)
+    # The segment generator does the decoding; consume it inside the worker
+    parts = [(segment.start, segment.end, segment.text.strip()) for segment in segments]
+    return " ".join(text for _, _, text in parts), parts, info.duration
+
+
+class LocalWhisperProvider(TranscriptionProvider):
+    """
+    Runs faster-whisper in worker processes (one model copy each), so
+    transcription never needs the network and does not hold the GIL of the API
+    process. Jobs beyond workers + max_queue are rejected with PoolSaturatedError.
+    """
+
+    name = "local"
+
+    def __init__(self, model_size: str = "base", workers: int = 0, cpu_threads: int = 2, max_queue: int = 16,
+                 compute_type: str = "int8", beam_size: int = 1, download_root: str = "",
+                 preload: bool = True):
+        self.model_size = model_size
+        self.cpu_threads = cpu_threads
+        self.workers = workers or max(1, (os.cpu_count() or 1) // max(1, cpu_threads))
+        self.beam_size = beam_size
+        options = {"compute_type": compute_type, "cpu_threads": cpu_threads, "download_root": download_root}
+        executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),  # Don't fork the API process's threads
+            initializer=_init_worker,
+            initargs=(options, (model_size,) if preload else ()),
+        )
+        self._pool = BoundedExecutor("whisper", self.workers, max_queue, executor=executor)
+
+    @classmethod
+    def from_settings(cls, settings) -> "LocalWhisperProvider":
+        return cls(
+            model_size=settings.LOCAL_WHISPER_MODEL,
+            workers=settings.LOCAL_WHISPER_WORKERS,
+            cpu_threads=settings.LOCAL_WHISPER_CPU_THREADS,
+            max_queue=settings.LOCAL_WHISPER_MAX_QUEUE,
+            compute_type=settings.LOCAL_WHISPER_COMPUTE_TYPE,
+            beam_size=settings.LOCAL_WHISPER_BEAM_SIZE,
+            download_root=settings.LOCAL_WHISPER_MODEL_DIR,
+            preload=settings.LOCAL_WHISPER_PRELOAD,
+        )
+
+    async def preload(self) -> List[int]:
+        """Start every worker and load the default model in each; returns the worker pids."""
+        return list(await asyncio.gather(*(self._pool.run(_worker_ready, self.model_size)
+                                           for _ in range(self.workers))))
+
+    async def transcribe(self, data: bytes, filename: str, language: Optional[str] = None,
+                         model: Optional[str] = None) -> TranscriptionResult:
+        return await self._run(bytes(data), model, language)
+
+    async def transcribe_file(self, path: str, filename: str, language: Optional[str] = None,
+                              model: Optional[str] = None) -> TranscriptionResult:
+        # Only the path crosses the process boundary; the worker reads the file
+        return await self._run(os.path.abspath(path), model, language)
+
+    async def _run(self, source: Union[bytes, str], model: Optional[str], language: Optional[str]):
+        text, parts, duration = await self._pool.run(
+            _transcribe_in_worker, source, model or self.model_size, language, self.beam_size
+        )
+        segments = [TranscriptSegment(start=start, end=end, text=part) for start, end, part in parts]
+        return TranscriptionResult(text=text, segments=segments, stats={"audio_seconds": duration})
+
+    def stats(self) -> Dict[str, Any]:
+        return {"model": self.model_size, "pool": self._pool.stats()}
+
+    async def aclose(self):
+        self._pool.shutdown(wait=False)
@@ -0,0 +1,81 @@
+"""Split long audio at silences into overlapping segments for parallel transcription.
+
+Audio is read from a file and decoded one window at a time (ffmpeg seeks to
+the window), so memory depends on the window and segment length, never on
+the length of the upload.
+"""
+from dataclasses import dataclass
+from typing import List
+
+from pydub import AudioSegment
+from pydub.silence import detect_silence
+from pydub.utils import mediainfo
+
+SAMPLE_RATE = 16000  # What Whisper resamples to anyway
+
+
+@dataclass
+class AudioSpan:
+    index: int
+    start_ms: int  # Nominal cut; text before it belongs to the previous span
+    end_ms: int
+    audio_start_ms: int  # start_ms minus the overlap actually sent to the provider
+
+
+def probe_duration_ms(path: str) -> int:
+    """Duration from ffprobe metadata, without decoding; 0 if unknown."""
+    try:
+        return int(float(mediainfo(path).get("duration") or 0) * 1000)
+    except (ValueError, OSError):
+        return 0
+
+
+def load_window(path: str, start_ms: int, end_ms: int) -> AudioSegment:
+    """Decode only [start_ms, end_ms) of the file, as 16 kHz mono."""
+    return AudioSegment.from_file(
+        path,
+        start_second=start_ms / 1000,
+        duration=(end_ms - start_ms) / 1000,
+        parameters=["-ac", "1", "-ar", str(SAMPLE_RATE)]
+    )
+
+
+def plan_spans(path: str, duration_ms: int, target_ms: int, max_ms: int, overlap_ms: int,
+               min_silence_ms: int = 500, silence_offset_db: float = -16.0,
+               search_ms: int = 30_000) -> List[AudioSpan]:
+    """
+    Choose cut points near every `target_ms`, preferring the silence closest to the target.
+
+    Silence is only searched in a decoded window around each target, relative
+    to that window's loudness. With no silence in the window, the cut falls at
+    the target. Every span after the first starts `overlap_ms` early, so a word
+    split by the cut is fully heard by one side.
+    """
+    cuts = []
+    position = 0
+    while duration_ms - position > max_ms:
+        target = position + target_ms
+        window_start = max(position + min_silence_ms, target - search_ms)
+        window_end = min(position + max_ms, target + search_ms)
+        window = load_window(path, window_start, window_end)
+        silences = detect_silence(window, min_silence_len=min_silence_ms,
+                                  silence_thresh=window.dBFS + silence_offset_db, seek_step=10)
+        if silences:
+            middles = [window_start + (start + end) // 2 for start, end in silences]
+            cut = min(middles, key=lambda middle: abs(middle - target))
+        else:
+            cut = target
+        cuts.append(cut)
+        position = cut
+
+    bounds = [0] + cuts + [duration_ms]
+    return [
+        AudioSpan(index=i, start_ms=start, end_ms=end, audio_start_ms=max(0, start - overlap_ms) if i else 0)
+        for i, (start, end) in enumerate(zip(bounds, bounds[1:]))
+    ]
+
+
+def export_span(path: str, span: AudioSpan, out_path: str, fmt: str = "mp3", bitrate: str = "64k") -> str:
+    """Decode one span (including its leading overlap) from `path` and encode it to `out_path`."""
+    load_window(path, span.audio_start_ms, span.end_ms).export(out_path, format=fmt, bitrate=bitrate)
+    return out_path
@@ -1,27 +1,94 @@
 from urllib.parse import urlparse, parse_qs
-import asyncio
+import hashlib
+import tempfile
+from dataclasses import dataclass
 from fastapi import UploadFile
 import os
-from groq import Groq
-from config import settings
+from typing import Optional
+from app.executors import run_io
 
-groq_api_key = settings.GROQ_API_KEY
-client = Groq(api_key=groq_api_key)
 content_type = ["video/mp4", "audio/mpeg", "audio/wav", "audio/mp3"]
 
 
-def extract_video_id(url: str) -> str:
-    """Extracts YouTube video ID from a URL like https://youtube.com/watch?v=jkotu123"""
+def extract_video_id(url: str) -> Optional[str]:
+    """Extracts YouTube video ID from a URL like https://youtube.com/watch?v=jkotu123 (None if there is none)"""
     parsed_url = urlparse(url)
     query = parse_qs(parsed_url.query)
-    return query.get("v", [None])[0]
-
-async def generate_audio_transcript(file: UploadFile):
-      data = await file.read()
-      response = client.audio.transcriptions.create(
-        file=(file.filename, data),
-        model="whisper-large-v3",
-        response_format="verbose_json"
-    )
-      return response
+    video_id = query.get("v", [None])[0]
+    if video_id:
+        return video_id
+    # Short links and embed/shorts paths: youtu.be/<id>, youtube.com/shorts/<id>
+    parts = [part for part in parsed_url.path.split("/") if part]
+    if parsed_url.netloc.endswith("youtu.be") and parts:
+        return parts[0]
+    if len(parts) >= 2 and parts[0] in ("shorts", "embed", "live", "v"):
+        return parts[1]
+    return None
+
+
+def require_video_id(url: str) -> str:
+    """extract_video_id, raising ValueError for URLs without a video ID."""
+    video_id = extract_video_id(url)
+    if not video_id:
+        raise ValueError(f"Not a YouTube video URL: {url}")
+    return video_id
+
+class UploadTooLargeError(Exception):
+    """Raised when an upload exceeds the configured maximum size."""
+
+    def __init__(self, max_bytes: int):
+        super().__init__(f"Upload exceeds the maximum size of {max_bytes // (1024 * 1024)} MB")
+        self.max_bytes = max_bytes
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    filename: str
+    size: int
+    sha256: str
+
+    def cleanup(self):
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+async def spool_upload(file: UploadFile, max_bytes: int, directory: Optional[str] = None,
+                       chunk_size: int = 1024 * 1024) -> SpooledUpload:
+    """
+    Copy an upload to a temp file in chunks, hashing it on the way.
+
+    Memory stays at one chunk whatever the upload size. Uploads larger than
+    max_bytes raise UploadTooLargeError and leave no file behind; the caller
+    owns the returned file and must call cleanup().
+    """
+    if max_bytes and file.size is not None and file.size > max_bytes:
+        raise UploadTooLargeError(max_bytes)  # Rejected before reading a byte
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    suffix = os.path.splitext(file.filename or "")[1]
+    handle, path = tempfile.mkstemp(prefix="upload_", suffix=suffix, dir=directory or None)
+    digest = hashlib.sha256()
+    size = 0
+    try:
+        with os.fdopen(handle, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                size += len(chunk)
+                if max_bytes and size > max_bytes:
+                    raise UploadTooLargeError(max_bytes)
+                digest.update(chunk)
+                await run_io(out.write, chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return SpooledUpload(path=path, filename=file.filename or os.path.basename(path), size=size,
+                         sha256=digest.hexdigest())
+
+async def generate_audio_transcript(upload: SpooledUpload, language: Optional[str] = None, model: Optional[str] = None):
+    """Transcribe a spooled upload; long audio is split at silences and transcribed in parallel segments."""
+    from app.transcription.engine import get_transcriber
+
+    return await get_transcriber().transcribe_file(upload.path, upload.filename, language, model)
 
@@ -1,145 +1,337 @@
-from fastapi import APIRouter, UploadFile, File, status, Depends
+import asyncio
+import json
+import time
+from dataclasses import asdict
+from fastapi import APIRouter, UploadFile, File, status, Depends, Request
 from fastapi.responses import JSONResponse, StreamingResponse
 from typing import Optional, Annotated
-from app.ingestion import IngestionManager
+from contextlib import aclosing
 from app.embeddings.vectorstore import VectorStore
 from app.embeddings import EmbeddingManager
-from app.retriever import RetrievalManager
-from app.utils import generate_audio_transcript, extract_video_id
-from app.schema import (YoutubeSchema, ChatRequest, ChatHistoryRequest)
+from app.retriever import RetrievalManager, history_cursor
+from app.utils import spool_upload, extract_video_id, UploadTooLargeError
+from app.schema import (YoutubeSchema, YoutubeBatchSchema, ChatRequest, ChatHistoryRequest)
 from app.enums import EmbedddingCollectionEnum
-from app.dependencies import get_embedding_manager, get_ingestion_manager, get_db_manager
+from app.dependencies import (get_embedding_manager, get_db_manager, get_llm_provider, get_content_manifest,
+                              get_ingestion_services, get_job_store)
+from app.ingestion.manifest import ContentManifest, ManifestEntry
+from app.jobs import JobStore, TERMINAL_STATUSES
+from app.jobs.tasks import IngestionServices, ingest_youtube, ingest_audio, ingest_youtube_batch
+from app.jobs.worker import get_job_workers
+from app.retriever.summary_cache import get_summary_cache
+from app.llm import LLMProvider
 from app.db import DBManager
+from app.executors import run_io, PoolSaturatedError
+from config import settings
 
 router = APIRouter()
 
 content_type = ["video/mp4", "audio/mpeg", "audio/wav", "audio/mp3", "audio/x-m4a"]
 
 
+def _busy_response(error: PoolSaturatedError) -> JSONResponse:
+    """Backpressure response when an executor pool is full."""
+    return JSONResponse(
+        content={"error": str(error), "status": "busy"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "1"}
+    )
+
+
+async def _resolve_content(file_id: str, manifest: ContentManifest, db_manager: DBManager) -> Optional[ManifestEntry]:
+    """Find the manifest entry for file_id; only unknown ids cost a database lookup."""
+    entry = manifest.get(file_id)
+    if entry is None:
+        entry = await run_io(manifest.lookup, db_manager, file_id)
+    return entry
+
+
+def _invalid_video_url_response(url: str) -> JSONResponse:
+    return JSONResponse(
+        content={"error": f"Not a YouTube video URL: {url}", "status": "failed"},
+        status_code=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def _chat_collection(entry: Optional[ManifestEntry], file_id: str) -> str:
+    """Collection to chat against; an unknown file_id is still answered, just without vector context."""
+    if entry is not None:
+        return entry.collection
+    # YouTube video IDs are typically 11 characters
+    if len(file_id) == 11:
+        return EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
+    return EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value
+
+
 @router.post("/ingest/youtube/")
 async def ingest_youtube_video(
     user_query: YoutubeSchema,
-    ingestion_manager: Annotated[IngestionManager, Depends(get_ingestion_manager)],
-    embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)],
-    db_manager: Annotated[DBManager, Depends(get_db_manager)]
+    services: Annotated[IngestionServices, Depends(get_ingestion_services)]
 ):
     """Endpoint to ingest a YouTube video by URL"""
+    if not extract_video_id(user_query.url):
+        return _invalid_video_url_response(user_query.url)
     try:
-        # Create vector store with db_manager
-        yt_vector_store = VectorStore(
-            embedding_manager=embedding_manager,
-            db_manager=db_manager,
-            collection_name=EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
-        )
-        
-        yt_retriever = RetrievalManager(
-            vector_store=yt_vector_store,
-            db_manager=db_manager
-        )
-        
-        # Load documents
-        documents = ingestion_manager.load_youtube_video(user_query.url)
-        
-        # Batch embeddings for efficiency
-        embeddings = embedding_manager.create_embeddings(
-            [doc.page_content for doc in documents]
-        )
-        
-        video_id = yt_vector_store.add_youtube_documents(
-            documents=documents, 
-            embeddings=embeddings
+        result = await ingest_youtube(services, user_query.url, user_query.query)
+        return JSONResponse(content={**result, "status": "success"}, status_code=status.HTTP_201_CREATED)
+    
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
+    except Exception as e:
+        return JSONResponse(
+            content={"error": str(e), "status": "failed"}, 
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
-        
-        # video_id = extract_video_id(user_query.url)
 
-        if user_query.query is None:
-            response = yt_retriever.summarize_youtube_video(user_query.url)
-        else:
-            response = yt_retriever.search_and_summarize(
-                user_query.query,
-                file_id=video_id
+
+@router.post("/ingest/youtube/batch/")
+async def ingest_youtube_batch_videos(
+    batch: YoutubeBatchSchema,
+    services: Annotated[IngestionServices, Depends(get_ingestion_services)]
+):
+    """Index many videos (URL list and/or playlists) in one run; returns per-video results, no summaries"""
+    try:
+        if not batch.urls and not batch.playlists:
+            return JSONResponse(
+                content={"error": "Provide at least one URL or playlist", "status": "failed"},
+                status_code=status.HTTP_400_BAD_REQUEST
             )
+        result = await ingest_youtube_batch(services, batch.urls, batch.playlists, batch.max_videos)
+        return JSONResponse(content={**result, "status": "success"}, status_code=status.HTTP_201_CREATED)
+
+    except PoolSaturatedError as e:
+        return _busy_response(e)
 
-        return JSONResponse(content={
-            "summary": response,
-            "video_id": video_id,
-            "status": "success"
-        },
-        status_code=status.HTTP_201_CREATED)
-    
     except Exception as e:
         return JSONResponse(
-            content={"error": str(e), "status": "failed"}, 
+            content={"error": str(e), "status": "failed"},
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
+def _unsupported_type_response(audio_file: UploadFile) -> JSONResponse:
+    return JSONResponse(
+        content={"error": f"Unsupported file type: {audio_file.content_type}", "status": "failed"},
+        status_code=status.HTTP_400_BAD_REQUEST
+    )
+
+
+def _too_large_response(error: UploadTooLargeError) -> JSONResponse:
+    return JSONResponse(
+        content={"error": str(error), "status": "failed"},
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    )
+
+
 @router.post("/ingest/audio/")
 async def ingest_audio_file(
-    ingestion_manager: Annotated[IngestionManager, Depends(get_ingestion_manager)],
-    embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)],
-    db_manager: Annotated[DBManager, Depends(get_db_manager)],
+    services: Annotated[IngestionServices, Depends(get_ingestion_services)],
     audio_file: UploadFile = File(...),
     query: Optional[str] = None,
+    transcription_model: Optional[str] = None,
 ):
     """Endpoint to ingest an audio file and process it"""
+    spooled = None
     try:
         if audio_file.content_type not in content_type:
+            return _unsupported_type_response(audio_file)
+
+        # Spool to disk (hashing on the way); identical uploads share a content hash
+        spooled = await spool_upload(audio_file, settings.MAX_UPLOAD_BYTES,
+                                     directory=settings.UPLOAD_SPOOL_DIR, chunk_size=settings.UPLOAD_CHUNK_BYTES)
+        result = await ingest_audio(services, spooled, query, transcription_model)
+        return JSONResponse(content={**result, "status": "success"})
+
+    except UploadTooLargeError as e:
+        return _too_large_response(e)
+
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
+    except Exception as e:
+        return JSONResponse(
+            content={"error": str(e), "status": "failed"}, 
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+    finally:
+        if spooled is not None:
+            spooled.cleanup()
+
+
+def _job_accepted_response(job: dict) -> JSONResponse:
+    # Wake this process's idle workers; dedicated worker processes pick it up on their next poll
+    workers = get_job_workers()
+    if workers is not None:
+        workers.notify()
+    return JSONResponse(
+        content={"job_id": job["job_id"], "status": job["status"], "status_url": f"/jobs/{job['job_id']}",
+                 "events_url": f"/jobs/{job['job_id']}/events"},
+        status_code=status.HTTP_202_ACCEPTED
+    )
+
+
+@router.post("/jobs/ingest/youtube/")
+async def submit_youtube_job(
+    user_query: YoutubeSchema,
+    job_store: Annotated[JobStore, Depends(get_job_store)]
+):
+    """Queue a YouTube ingestion; returns a job_id to poll at /jobs/{job_id} straight away."""
+    if not extract_video_id(user_query.url):
+        return _invalid_video_url_response(user_query.url)
+    try:
+        job = await run_io(job_store.create, "youtube", {"url": user_query.url, "query": user_query.query})
+        return _job_accepted_response(job)
+
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
+    except Exception as e:
+        return JSONResponse(
+            content={"error": str(e), "status": "failed"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
+
+@router.post("/jobs/ingest/youtube/batch/")
+async def submit_youtube_batch_job(
+    batch: YoutubeBatchSchema,
+    job_store: Annotated[JobStore, Depends(get_job_store)]
+):
+    """Queue a batch ingestion (URL list and/or playlists); per-video results land in the job's result."""
+    try:
+        if not batch.urls and not batch.playlists:
             return JSONResponse(
-                content={"error": f"Unsupported file type: {audio_file.content_type}", "status": "failed"},
+                content={"error": "Provide at least one URL or playlist", "status": "failed"},
                 status_code=status.HTTP_400_BAD_REQUEST
             )
-        
-        audio_vector_store = VectorStore(
-            collection_name=EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value,
-            embedding_manager=embedding_manager,
-            db_manager=db_manager
-        )
-        
-        audio_retriever = RetrievalManager(
-            vector_store=audio_vector_store,
-            db_manager=db_manager
-        )
-        
-        # Transcribe audio
-        response = await generate_audio_transcript(file=audio_file)
-        
-        # Split and embed
-        chunks = ingestion_manager.split_text(response.text)
-        embeddings = embedding_manager.create_embeddings(chunks)
-        
-        file_id = audio_vector_store.add_audio_documents(
-            filename=audio_file.filename,
-            documents=chunks,
-            embeddings=embeddings
+        job = await run_io(job_store.create, "youtube_batch", batch.model_dump())
+        return _job_accepted_response(job)
+
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
+    except Exception as e:
+        return JSONResponse(
+            content={"error": str(e), "status": "failed"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
-        
-        if query is None:
-            result = audio_retriever.summarize_audio_file(file_id)    
-        else:
-            result = audio_retriever.search_and_summarize(
-                query,
-                file_id=file_id
-            )
 
-        return JSONResponse(content={
-            "summary": result,
-            "file_id": file_id,
-            "status": "success"
-        })
-    
+
+@router.post("/jobs/ingest/audio/")
+async def submit_audio_job(
+    job_store: Annotated[JobStore, Depends(get_job_store)],
+    audio_file: UploadFile = File(...),
+    query: Optional[str] = None,
+    transcription_model: Optional[str] = None,
+):
+    """Spool the upload where workers can read it and queue its ingestion; returns a job_id."""
+    spooled = None
+    try:
+        if audio_file.content_type not in content_type:
+            return _unsupported_type_response(audio_file)
+
+        spooled = await spool_upload(audio_file, settings.MAX_UPLOAD_BYTES,
+                                     directory=settings.JOB_UPLOAD_DIR, chunk_size=settings.UPLOAD_CHUNK_BYTES)
+        payload = {"upload": asdict(spooled), "query": query, "transcription_model": transcription_model}
+        job = await run_io(job_store.create, "audio", payload)
+        return _job_accepted_response(job)  # The worker owns the spooled file from here
+
+    except UploadTooLargeError as e:
+        return _too_large_response(e)
+
+    except PoolSaturatedError as e:
+        if spooled is not None:
+            spooled.cleanup()
+        return _busy_response(e)
+
     except Exception as e:
+        if spooled is not None:
+            spooled.cleanup()
         return JSONResponse(
-            content={"error": str(e), "status": "failed"}, 
+            content={"error": str(e), "status": "failed"},
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
 
+def _job_not_found_response(job_id: str) -> JSONResponse:
+    return JSONResponse(
+        content={"error": f"No job found with job_id: {job_id}", "status": "failed"},
+        status_code=status.HTTP_404_NOT_FOUND
+    )
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: str,
+    job_store: Annotated[JobStore, Depends(get_job_store)]
+):
+    """Job status, per-stage progress and, once succeeded, the same result the synchronous endpoint returns."""
+    try:
+        job = await run_io(job_store.get, job_id)
+        if job is None:
+            return _job_not_found_response(job_id)
+        return JSONResponse(content=job)
+
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(
+    job_id: str,
+    request: Request,
+    job_store: Annotated[JobStore, Depends(get_job_store)]
+):
+    """
+    Server-sent events for one job: a `progress` event whenever its status or
+    stage changes, then a final `done` event once it succeeds or fails.
+    """
+    try:
+        job = await run_io(job_store.get, job_id)
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+    if job is None:
+        return _job_not_found_response(job_id)
+
+    async def generate():
+        nonlocal job
+        last_snapshot = None
+        last_sent = time.monotonic()
+        while True:
+            snapshot = (job["status"], job["stage"], job["progress"])
+            if snapshot != last_snapshot:
+                yield f"event: progress\ndata: {json.dumps(job)}\n\n"
+                last_snapshot, last_sent = snapshot, time.monotonic()
+            elif time.monotonic() - last_sent > 15:
+                yield ": keep-alive\n\n"  # Stops proxies from closing an idle stream
+                last_sent = time.monotonic()
+            if job["status"] in TERMINAL_STATUSES:
+                yield f"event: done\ndata: {json.dumps(job)}\n\n"
+                return
+            await asyncio.sleep(settings.JOB_EVENTS_POLL_SECONDS)
+            if await request.is_disconnected():
+                return
+            try:
+                job = await run_io(job_store.get, job_id) or job
+            except PoolSaturatedError:
+                pass  # Try again on the next tick
+
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.post("/chat/")
 async def chat_with_content(
     chat_request: ChatRequest,
     embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)],
-    db_manager: Annotated[DBManager, Depends(get_db_manager)]
+    db_manager: Annotated[DBManager, Depends(get_db_manager)],
+    llm: Annotated[LLMProvider, Depends(get_llm_provider)],
+    manifest: Annotated[ContentManifest, Depends(get_content_manifest)]
 ):
     """
     Chat with the content (YouTube video or audio file) using chat history.
@@ -149,25 +341,24 @@ async def chat_with_content(
     - file_id for audio files (returned from /ingest/audio/)
     """
     try:
-        # Determine collection based on file_id pattern
-        # YouTube video IDs are typically 11 characters
-        if len(chat_request.file_id) == 11:
-            collection_name = EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
-        else:
-            collection_name = EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value
+        # Look up the collection in the content manifest
+        entry = await _resolve_content(chat_request.file_id, manifest, db_manager)
         
-        vector_store = VectorStore(
-            collection_name=collection_name,
+        vector_store = await run_io(
+            VectorStore,
+            collection_name=_chat_collection(entry, chat_request.file_id),
             embedding_manager=embedding_manager,
             db_manager=db_manager
         )
         
         retriever = RetrievalManager(
             vector_store=vector_store,
-            db_manager=db_manager
+            llm=llm,
+            db_manager=db_manager,
+            manifest=manifest
         )
         
-        response = retriever.chat_with_context(
+        response = await retriever.chat_with_context(
             query=chat_request.query,
             file_id=chat_request.file_id,
             include_vector_search=chat_request.include_vector_search,
@@ -180,6 +371,9 @@ async def chat_with_content(
             "status": "success"
         })
     
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
     except Exception as e:
         return JSONResponse(
             content={"error": str(e), "status": "failed"}, 
@@ -190,44 +384,54 @@ async def chat_with_content(
 @router.post("/chat/stream/")
 async def chat_with_content_streaming(
     chat_request: ChatRequest,
+    request: Request,
     embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)],
-    db_manager: Annotated[DBManager, Depends(get_db_manager)]
+    db_manager: Annotated[DBManager, Depends(get_db_manager)],
+    llm: Annotated[LLMProvider, Depends(get_llm_provider)],
+    manifest: Annotated[ContentManifest, Depends(get_content_manifest)]
 ):
     """
     Stream chat responses with the content (YouTube video or audio file).
     """
     try:
-        # Determine collection based on file_id pattern
-        if len(chat_request.file_id) == 11:
-            collection_name = EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
-        else:
-            collection_name = EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value
+        # Look up the collection in the content manifest
+        entry = await _resolve_content(chat_request.file_id, manifest, db_manager)
         
-        vector_store = VectorStore(
-            collection_name=collection_name,
+        vector_store = await run_io(
+            VectorStore,
+            collection_name=_chat_collection(entry, chat_request.file_id),
             embedding_manager=embedding_manager,
             db_manager=db_manager
         )
         
         retriever = RetrievalManager(
             vector_store=vector_store,
-            db_manager=db_manager
+            llm=llm,
+            db_manager=db_manager,
+            manifest=manifest
         )
         
         async def generate():
-            async for chunk in retriever.chat_with_context_streaming(
+            # aclosing() guarantees the LLM stream is closed if we stop early
+            async with aclosing(retriever.chat_with_context_streaming(
                 query=chat_request.query,
                 file_id=chat_request.file_id,
                 include_vector_search=chat_request.include_vector_search,
                 top_k=chat_request.top_k
-            ):
-                yield chunk
+            )) as stream:
+                async for chunk in stream:
+                    if await request.is_disconnected():
+                        break
+                    yield chunk
         
         return StreamingResponse(
             generate(),
             media_type="text/plain"
         )
     
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
     except Exception as e:
         return JSONResponse(
             content={"error": str(e), "status": "failed"}, 
@@ -238,33 +442,24 @@ async def chat_with_content_streaming(
 @router.post("/chat/history/")
 async def get_chat_history(
     history_request: ChatHistoryRequest,
-    embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)],
-    db_manager: Annotated[DBManager, Depends(get_db_manager)]
+    db_manager: Annotated[DBManager, Depends(get_db_manager)],
+    llm: Annotated[LLMProvider, Depends(get_llm_provider)]
 ):
     """
     Retrieve chat history for a specific file_id (video_id or audio file_id).
     """
     try:
-        # Determine collection based on file_id pattern
-        if len(history_request.file_id) == 11:
-            collection_name = EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
-        else:
-            collection_name = EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value
-        
-        vector_store = VectorStore(
-            collection_name=collection_name,
-            embedding_manager=embedding_manager,
-            db_manager=db_manager
-        )
-        
+        # History only needs the database, not a vector store
         retriever = RetrievalManager(
-            vector_store=vector_store,
+            vector_store=None,
+            llm=llm,
             db_manager=db_manager
         )
         
-        history = retriever.get_chat_history(
+        history = await retriever.aget_chat_history(
             file_id=history_request.file_id,
-            limit=history_request.limit
+            limit=history_request.limit,
+            before=history_request.before
         )
         
         # Convert to dict for JSON response
@@ -282,9 +477,20 @@ async def get_chat_history(
         return JSONResponse(content={
             "history": history_data,
             "count": len(history_data),
+            # Send as `before` to page back; None once the oldest message is reached
+            "next_cursor": history_cursor(history[0]) if len(history) == history_request.limit else None,
             "status": "success"
         })
     
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
+    except ValueError as e:
+        return JSONResponse(
+            content={"error": str(e), "status": "failed"},
+            status_code=status.HTTP_400_BAD_REQUEST
+        )
+
     except Exception as e:
         return JSONResponse(
             content={"error": str(e), "status": "failed"}, 
@@ -295,35 +501,29 @@ async def get_chat_history(
 @router.delete("/chat/history/{file_id}")
 async def clear_chat_history(
     file_id: str,
-    embedding_manager: Annotated[EmbeddingManager, Depends(get_embedding_manager)],
-    db_manager: Annotated[DBManager, Depends(get_db_manager)]
+    db_manager: Annotated[DBManager, Depends(get_db_manager)],
+    llm: Annotated[LLMProvider, Depends(get_llm_provider)]
 ):
     """
     Clear chat history for a specific file_id.
     """
     try:
-        # Determine collection based on file_id pattern
-        if len(file_id) == 11:
-            collection_name = EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value
-        else:
-            collection_name = EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value
-        
-        vector_store = VectorStore(
-            collection_name=collection_name,
-            embedding_manager=embedding_manager,
-            db_manager=db_manager
-        )
-        
+        # History only needs the database, not a vector store
         retriever = RetrievalManager(
-            vector_store=vector_store,
+            vector_store=None,
+            llm=llm,
             db_manager=db_manager
         )
         
-        success = retriever.clear_chat_history(file_id)
+        # Drop queued messages and wait out an in-flight batch, or they would be written back after the delete
+        if retriever.history_writer is not None:
+            await retriever.history_writer.discard(file_id)
+        deleted = await run_io(retriever.clear_chat_history, file_id)
         
-        if success:
+        if deleted is not None:
             return JSONResponse(content={
                 "message": f"Chat history cleared for {file_id}",
+                "deleted": deleted,
                 "status": "success"
             })
         else:
@@ -332,8 +532,37 @@ async def clear_chat_history(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
     except Exception as e:
         return JSONResponse(
             content={"error": str(e), "status": "failed"}, 
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
\ No newline at end of file
+        )
+
+
+@router.delete("/summaries/{file_id}")
+async def invalidate_summaries(
+    file_id: str,
+    db_manager: Annotated[DBManager, Depends(get_db_manager)]
+):
+    """
+    Drop the cached summaries of a file_id; the next summary request regenerates it.
+    """
+    try:
+        deleted = await run_io(get_summary_cache(db_manager).invalidate, file_id)
+        return JSONResponse(content={
+            "message": f"Cached summaries cleared for {file_id}",
+            "deleted": deleted,
+            "status": "success"
+        })
+
+    except PoolSaturatedError as e:
+        return _busy_response(e)
+
+    except Exception as e:
+        return JSONResponse(
+            content={"error": str(e), "status": "failed"},
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
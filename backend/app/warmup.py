@@ -0,0 +1,142 @@
+"""Startup warmup: load the embedding model, run a dummy batch, open the vector store and DB pools
+and start local transcription workers.
+
+/ready reports 503 until every step has finished, so traffic is only
+routed to a backend that will not pay these costs on its first request.
+Failed attempts are retried with capped exponential backoff until one
+succeeds, so a backend whose dependencies come up late still becomes ready.
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+
+from app.dependencies import get_db_manager, get_embedding_manager
+from app.embeddings.backends import get_collection
+from app.enums import EmbedddingCollectionEnum
+from app.executors import run_cpu, run_io
+from config import Settings
+
+
+class WarmupState:
+    """Progress of the startup warmup, reported by /ready."""
+
+    def __init__(self):
+        self.ready = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.steps: Dict[str, dict] = {}
+        self.error: Optional[str] = None
+        self.attempts = 0
+
+    def to_dict(self) -> dict:
+        return {
+            "ready": self.ready,
+            "steps": self.steps,
+            "error": self.error,
+            "attempts": self.attempts,
+            "duration_seconds": round(self.finished_at - self.started_at, 3)
+            if self.started_at and self.finished_at else None,
+        }
+
+
+_state = WarmupState()
+
+
+def get_warmup_state() -> WarmupState:
+    return _state
+
+
+def _warm_embedding_model(batch_size: int) -> int:
+    model = get_embedding_manager().model  # Triggers the load
+    # Encode directly, not through the embedding cache, so the kernels actually run
+    model.encode(["warmup " * 16] * max(1, batch_size), show_progress_bar=False)
+    return batch_size
+
+
+def _warm_vector_store() -> int:
+    collections = (EmbedddingCollectionEnum.YOUTUBE_EMBEDDINGS.value,
+                   EmbedddingCollectionEnum.AUDIO_EMBEDDINGS.value)
+    return sum(get_collection(name).count() for name in collections)
+
+
+def _warm_database(settings: Settings) -> int:
+    return get_db_manager(settings).warm_pool(settings.WARMUP_DB_CONNECTIONS)
+
+
+async def _warm_async_database(settings: Settings) -> int:
+    """Open the asyncpg pool's connections too (no-op unless DB_ASYNC)."""
+    from app.db.async_manager import get_async_db_manager
+
+    manager = get_async_db_manager()
+    return await manager.warm_pool(settings.WARMUP_DB_CONNECTIONS) if manager else 0
+
+
+async def _warm_transcription() -> int:
+    """Start the local Whisper workers with their model loaded (no-op for API providers)."""
+    from app.transcription.engine import get_transcriber
+
+    provider = get_transcriber().provider
+    if not hasattr(provider, "preload"):
+        return 0
+    return len(await provider.preload())
+
+
+async def _run_step(name: str, func, *args, cpu: bool = False):
+    state = get_warmup_state()
+    start = time.perf_counter()
+    state.steps[name] = {"status": "running"}
+    try:
+        if asyncio.iscoroutinefunction(func):
+            result = await func(*args)
+        else:
+            result = await (run_cpu if cpu else run_io)(func, *args)
+    except Exception as e:
+        state.steps[name] = {"status": "failed", "error": str(e)}
+        raise
+    state.steps[name] = {
+        "status": "done",
+        "result": result,
+        "seconds": round(time.perf_counter() - start, 3),
+    }
+
+
+async def warm_up(settings: Settings):
+    """
+    Run every warmup step until an attempt succeeds, then mark the process ready.
+
+    Retries back off exponentially up to WARMUP_MAX_BACKOFF_SECONDS; after
+    WARMUP_RETRIES failed attempts each further failure is reported as an error.
+    """
+    state = get_warmup_state()
+    state.started_at = time.time()
+    if not settings.WARMUP_ENABLED:
+        state.ready = True
+        state.finished_at = time.time()
+        return
+
+    print("🔥 Warming up embedding model, vector store and database pool...")
+    attempt = 0
+    while True:
+        attempt += 1
+        state.attempts = attempt
+        try:
+            await asyncio.gather(
+                _run_step("embedding_model", _warm_embedding_model, settings.WARMUP_BATCH_SIZE, cpu=True),
+                _run_step("vector_store", _warm_vector_store),
+                _run_step("database", _warm_database, settings),
+                _run_step("async_database", _warm_async_database, settings),
+                _run_step("transcription", _warm_transcription),
+            )
+            state.ready = True
+            state.error = None
+            state.finished_at = time.time()
+            print(f"✅ Warmup finished in {state.finished_at - state.started_at:.1f}s")
+            return
+        except Exception as e:
+            state.error = f"{type(e).__name__}: {e}"
+            delay = min(2 ** attempt, settings.WARMUP_MAX_BACKOFF_SECONDS)
+            if attempt < settings.WARMUP_RETRIES:
+                print(f"⚠️  Warmup attempt {attempt}/{settings.WARMUP_RETRIES} failed: {state.error}")
+            else:
+                print(f"❌ Warmup attempt {attempt} failed, still not ready (retrying in {delay:.0f}s): {state.error}")
+            await asyncio.sleep(delay)
@@ -0,0 +1,100 @@
+"""Benchmark ingestion-time embedding: fixed batch_size=32 vs length-bucketed, token-budgeted batches.
+
+The fixture is a synthetic long podcast (default 3 hours), chunked two ways:
+
+- 30-second YouTube-style segments, whose length swings with speaking pace and pauses
+- ~1000-character audio chunks, as produced by IngestionManager.split_text
+
+Each mode is timed over the same texts. The benchmark reports:
+
+- real tokens/s
+- padded tokens, which measure padding waste
+- the largest cosine deviation between the two modes' vectors, to confirm that
+  bucketing reorders work without changing the output
+
+Usage (from the `backend` directory):
+    python -m benchmarks.bulk_embedding --hours 3 --budget 8192
+"""
+import argparse
+import random
+import time
+
+import numpy as np
+
+from app.embeddings.engines import encode_token_budgeted, load_encoder, plan_token_batches, token_lengths
+
+WORDS = ("so the thing about building these systems is that you really want to measure first and "
+         "then decide what matters because latency memory and cost all trade against each other "
+         "in ways that are not obvious until you look at real traffic from real users").split()
+
+
+def podcast_fixture(hours: float, seed: int = 0):
+    """Synthetic transcript: 30s segments (~150 wpm with pauses and rapid exchanges) plus 1000-char chunks."""
+    rng = random.Random(seed)
+    segments = []
+    for _ in range(int(hours * 120)):
+        pace = rng.choice((0.1, 0.4, 1.0, 1.0, 1.3, 1.8))  # Silence, slow, normal, fast talkers
+        segments.append(" ".join(rng.choices(WORDS, k=max(1, int(75 * pace)))))
+
+    transcript = " ".join(segments)
+    chunks, start = [], 0
+    while start < len(transcript):
+        end = transcript.rfind(" ", start, start + 1000)
+        end = len(transcript) if end <= start or start + 1000 >= len(transcript) else end
+        chunks.append(transcript[start:end].strip())
+        start = end + 1
+    return segments + chunks
+
+
+def padded_tokens(lengths, batches):
+    return sum(len(batch) * max(lengths[i] for i in batch) for batch in batches)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fixed vs token-budgeted bulk embedding throughput")
+    parser.add_argument("--engine", choices=["torch", "onnx"], default="torch")
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--onnx-dir", default="data/onnx/all-MiniLM-L6-v2")
+    parser.add_argument("--max-length", type=int, default=256)
+    parser.add_argument("--hours", type=float, default=3.0)
+    parser.add_argument("--budget", type=int, default=8192, help="Padded tokens per batch")
+    parser.add_argument("--max-batch-size", type=int, default=128)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    encoder = load_encoder(args.engine, args.model, onnx_dir=args.onnx_dir, max_length=args.max_length)
+    texts = podcast_fixture(args.hours)
+    lengths = token_lengths(encoder, texts, args.max_length)
+    real_tokens = sum(lengths)
+    encoder.encode(texts[:64], batch_size=32, show_progress_bar=False)  # Warmup
+
+    fixed_batches = [list(range(i, min(i + 32, len(texts)))) for i in range(0, len(texts), 32)]
+    budget_batches = plan_token_batches(lengths, args.budget, args.max_batch_size)
+
+    def fixed():
+        return np.asarray(encoder.encode(texts, batch_size=32, show_progress_bar=False), dtype=np.float32)
+
+    def budgeted():
+        return encode_token_budgeted(encoder, texts, args.budget, args.max_batch_size, args.max_length)
+
+    print(f"{len(texts)} texts, {real_tokens} tokens ({args.hours}h podcast fixture, engine={args.engine})")
+    print(f"{'mode':>9} | {'batches':>7} | {'padded tokens':>13} | {'best s':>7} | {'tokens/s':>9}")
+    outputs = {}
+    for name, run, batches in (("fixed-32", fixed, fixed_batches), ("budgeted", budgeted, budget_batches)):
+        timings = []
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            outputs[name] = run()
+            timings.append(time.perf_counter() - start)
+        best = min(timings)
+        # fixed-32 padding is an upper bound: SentenceTransformer also sorts each call by character length
+        print(f"{name:>9} | {len(batches):>7} | {padded_tokens(lengths, batches):>13} | "
+              f"{best:>7.2f} | {real_tokens / best:>9.0f}")
+
+    a, b = outputs["fixed-32"], outputs["budgeted"]
+    cosine = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    print(f"max cosine deviation between modes: {1 - cosine.min():.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""Load benchmark for concurrent /chat/ requests.
+
+Fires N concurrent /chat/ requests at a running backend while probing /health,
+then reports chat throughput, chat latency percentiles and /health latency under
+load. Run it against a build before and after a change to compare.
+
+Usage (from the `backend` directory, with the API running):
+    python -m benchmarks.chat_load --file-id <video_id> --concurrency 16 --requests 64
+"""
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def percentile(values, pct):
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def chat_worker(client, queue, args, latencies, statuses):
+    while True:
+        try:
+            queue.get_nowait()
+        except asyncio.QueueEmpty:
+            return
+        start = time.perf_counter()
+        try:
+            response = await client.post("/chat/", json={
+                "query": args.query,
+                "file_id": args.file_id,
+                "top_k": args.top_k,
+            })
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+        except httpx.HTTPError as e:
+            statuses[type(e).__name__] = statuses.get(type(e).__name__, 0) + 1
+        latencies.append(time.perf_counter() - start)
+
+
+async def health_probe(client, stop, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/health")
+        except httpx.HTTPError:
+            pass
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.25)
+
+
+async def run(args):
+    queue = asyncio.Queue()
+    for _ in range(args.requests):
+        queue.put_nowait(None)
+
+    chat_latencies, health_latencies, statuses = [], [], {}
+    stop = asyncio.Event()
+    limits = httpx.Limits(max_connections=args.concurrency + 1)
+
+    async with httpx.AsyncClient(base_url=args.url, timeout=args.timeout, limits=limits) as client:
+        probe = asyncio.create_task(health_probe(client, stop, health_latencies))
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            chat_worker(client, queue, args, chat_latencies, statuses)
+            for _ in range(args.concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+        stop.set()
+        await probe
+
+    print(f"Requests:        {args.requests} at concurrency {args.concurrency}")
+    print(f"Status codes:    {statuses}")
+    print(f"Wall clock:      {elapsed:.2f}s")
+    print(f"Throughput:      {args.requests / elapsed:.2f} req/s")
+    print(f"Chat latency:    p50={percentile(chat_latencies, 50):.3f}s "
+          f"p95={percentile(chat_latencies, 95):.3f}s max={max(chat_latencies, default=0):.3f}s")
+    if health_latencies:
+        print(f"/health latency: mean={statistics.mean(health_latencies) * 1000:.1f}ms "
+              f"max={max(health_latencies) * 1000:.1f}ms ({len(health_latencies)} probes)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent /chat/ throughput benchmark")
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--file-id", required=True, help="video_id or audio file_id that is already ingested")
+    parser.add_argument("--query", default="What are the key takeaways?")
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""Benchmark of the database side of a chat turn: sync engine vs asyncpg.
+
+Each turn does what /chat/ does against Postgres: read the last 10 messages
+of a file, then insert the user and assistant messages in one transaction.
+The sync engine runs them through the I/O thread pool (DBManager), the async
+engine awaits them directly (AsyncDBManager). Reports turns/s, latency
+percentiles and the pool metrics of each run. Rows are written under a
+throwaway file_id and deleted afterwards.
+
+Usage (from the `backend` directory, with DATABASE_URI set):
+    python -m benchmarks.db_chat_turn --engine both --concurrency 32 --turns 2000
+"""
+import argparse
+import asyncio
+import time
+import uuid
+from datetime import datetime, timezone
+
+from app.db import DBManager, AsyncDBManager, ChatHistory
+from app.executors import run_io, shutdown_pools
+from app.schema import ChatHistorySchema
+from benchmarks.chat_load import percentile
+from config import settings
+
+COLUMNS = ("id", "role", "message", "file_id", "created_at")
+
+
+def turn_messages(file_id: str, turn: int):
+    now = datetime.now(timezone.utc)
+    return [
+        ChatHistorySchema(role="user", message=f"Question {turn}?", file_id=file_id, created_at=now),
+        ChatHistorySchema(role="assistant", message=f"Answer {turn}. " * 20, file_id=file_id, created_at=now),
+    ]
+
+
+async def sync_turn(db_manager: DBManager, file_id: str, turn: int):
+    await run_io(db_manager.select_page, ChatHistory, COLUMNS, ("created_at", "id"), 10, file_id=file_id)
+    await run_io(db_manager.bulk_insert, ChatHistory, turn_messages(file_id, turn))
+
+
+async def async_turn(db_manager: AsyncDBManager, file_id: str, turn: int):
+    await db_manager.select_page(ChatHistory, COLUMNS, ("created_at", "id"), 10, file_id=file_id)
+    await db_manager.bulk_insert(ChatHistory, turn_messages(file_id, turn))
+
+
+async def run_turns(name: str, turn, db_manager, args):
+    # Spread turns over several files, as concurrent users would
+    file_ids = [f"bench-{uuid.uuid4().hex[:12]}" for _ in range(args.files)]
+    queue = asyncio.Queue()
+    for index in range(args.turns):
+        queue.put_nowait(index)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while True:
+            try:
+                index = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            try:
+                await turn(db_manager, file_ids[index % len(file_ids)], index)
+            except Exception:
+                errors += 1
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*[worker() for _ in range(args.concurrency)])
+    elapsed = time.perf_counter() - start
+
+    print(f"\n[{name}] {args.turns} turns at concurrency {args.concurrency}, {errors} errors")
+    print(f"Wall clock:  {elapsed:.2f}s")
+    print(f"Throughput:  {args.turns / elapsed:.1f} turns/s")
+    print(f"Latency:     p50={percentile(latencies, 50) * 1000:.1f}ms "
+          f"p95={percentile(latencies, 95) * 1000:.1f}ms max={max(latencies, default=0) * 1000:.1f}ms")
+    print(f"Pool:        {db_manager.pool_stats()}")
+    return file_ids
+
+
+async def run(args):
+    if args.engine in ("sync", "both"):
+        db_manager = DBManager(settings.DATABASE_URI)
+        db_manager.warm_pool(settings.DB_POOL_SIZE)
+        file_ids = await run_turns("sync engine + I/O pool", sync_turn, db_manager, args)
+        await run_io(db_manager.delete_where, ChatHistory, file_id=file_ids)
+
+    if args.engine in ("async", "both"):
+        db_manager = AsyncDBManager(settings.DATABASE_URI)
+        await db_manager.warm_pool(settings.DB_POOL_SIZE)
+        file_ids = await run_turns("async engine (asyncpg)", async_turn, db_manager, args)
+        await db_manager.delete_where(ChatHistory, file_id=file_ids)
+        await db_manager.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Chat-turn database throughput: sync engine vs asyncpg")
+    parser.add_argument("--engine", choices=("sync", "async", "both"), default="both")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--turns", type=int, default=2000)
+    parser.add_argument("--files", type=int, default=50, help="Distinct file_ids the turns are spread over")
+    asyncio.run(run(parser.parse_args()))
+    shutdown_pools(wait=True)
+
+
+if __name__ == "__main__":
+    main()
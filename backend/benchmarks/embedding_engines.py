@@ -0,0 +1,119 @@
+"""Benchmark the torch and int8 ONNX embedding engines and check that their vectors agree.
+
+Each engine runs in its own process, so peak RSS covers only that engine.
+For each engine the benchmark reports:
+
+- load time and peak RSS
+- bulk throughput (texts/s) over a synthetic chunk corpus
+- single-query latency p50/p95
+
+It then compares the two engines' vectors for the same corpus. The run exits
+non-zero if any pair's cosine similarity is below --tolerance, which means
+ONNX vectors would not be compatible with collections built by torch.
+
+Usage (from the `backend` directory, after `python -m app.embeddings.onnx_export`):
+    python -m benchmarks.embedding_engines --texts 512 --tolerance 0.98
+"""
+import argparse
+import multiprocessing as mp
+import random
+import resource
+import statistics
+import sys
+import time
+
+import numpy as np
+
+WORDS = ("the video explains how transformers attend to context while the speaker compares "
+         "retrieval augmented generation with fine tuning and walks through latency memory "
+         "tradeoffs for small models running on commodity cpus in production").split()
+
+
+def make_corpus(count, seed=0):
+    rng = random.Random(seed)
+    # Mix of short queries and chunk-sized passages
+    return [" ".join(rng.choices(WORDS, k=rng.choice((8, 32, 96, 180)))) for _ in range(count)]
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+
+def measure(engine, args, texts, queries, conn):
+    from app.embeddings.engines import load_encoder
+
+    start = time.perf_counter()
+    encoder = load_encoder(engine, args.model, onnx_dir=args.onnx_dir, max_length=args.max_length)
+    load_seconds = time.perf_counter() - start
+
+    encoder.encode(texts[:args.batch_size], batch_size=args.batch_size, show_progress_bar=False)  # Warmup
+
+    start = time.perf_counter()
+    vectors = encoder.encode(texts, batch_size=args.batch_size, show_progress_bar=False)
+    bulk_seconds = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        encoder.encode([query], show_progress_bar=False)
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    conn.send({
+        "engine": engine,
+        "load_s": load_seconds,
+        "texts_per_s": len(texts) / bulk_seconds,
+        "p50_ms": statistics.median(latencies),
+        "p95_ms": percentile(latencies, 95),
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,  # KiB on Linux
+        "vectors": np.asarray(vectors, dtype=np.float32),
+    })
+    conn.close()
+
+
+def run_engine(engine, args, texts, queries):
+    ctx = mp.get_context("spawn")
+    parent, child = ctx.Pipe(duplex=False)
+    process = ctx.Process(target=measure, args=(engine, args, texts, queries, child))
+    process.start()
+    result = parent.recv()
+    process.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Torch vs int8 ONNX embedding engine benchmark")
+    parser.add_argument("--engines", nargs="+", default=["torch", "onnx"], choices=["torch", "onnx"])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--onnx-dir", default="data/onnx/all-MiniLM-L6-v2")
+    parser.add_argument("--max-length", type=int, default=256)
+    parser.add_argument("--texts", type=int, default=512)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--tolerance", type=float, default=0.98,
+                        help="Minimum per-text cosine similarity between engines (EMBEDDING_ONNX_MIN_COSINE)")
+    args = parser.parse_args()
+
+    texts = make_corpus(args.texts)
+    queries = make_corpus(args.queries, seed=1)
+    results = [run_engine(engine, args, texts, queries) for engine in args.engines]
+
+    print(f"{'engine':>7} | {'load s':>7} | {'texts/s':>8} | {'query p50/p95 ms':>17} | {'peak RSS MB':>11}")
+    for r in results:
+        print(f"{r['engine']:>7} | {r['load_s']:>7.2f} | {r['texts_per_s']:>8.1f} | "
+              f"{r['p50_ms']:>7.2f} / {r['p95_ms']:<7.2f} | {r['peak_rss_mb']:>11.0f}")
+
+    if len(results) < 2:
+        return
+    a, b = results[0]["vectors"], results[1]["vectors"]
+    cosine = np.sum(a * b, axis=1) / (np.linalg.norm(a, axis=1) * np.linalg.norm(b, axis=1))
+    print(f"cosine {results[0]['engine']} vs {results[1]['engine']}: "
+          f"min {cosine.min():.4f}, mean {cosine.mean():.4f} (tolerance {args.tolerance})")
+    if cosine.min() < args.tolerance:
+        print("❌ Vectors differ beyond tolerance; do not mix these engines in one collection")
+        sys.exit(1)
+    print("✅ Vectors are compatible within tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""Benchmark file-scoped top-k search latency as a collection grows.
+
+Fills a local (on-disk) Chroma or FAISS collection with random 384-d chunks spread over
+many file_ids, and at each checkpoint times the same query two ways:
+
+- unfiltered: top_k over the whole collection (the old chat behaviour)
+- filtered:   top_k with a file_id `where` predicate pushed into the query
+
+With the predicate in the index query, filtered latency should stay flat as
+the collection grows, because only one file's chunks are scored.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.filtered_search --sizes 10000 100000 1000000
+    python -m benchmarks.filtered_search --backend faiss --index-type hnsw
+"""
+import argparse
+import shutil
+import statistics
+import tempfile
+import time
+
+import chromadb
+import numpy as np
+
+DIM = 384
+
+
+def timed_queries(collection, queries, top_k, where_fn):
+    latencies = []
+    for i, query in enumerate(queries):
+        start = time.perf_counter()
+        collection.query(query_embeddings=[query.tolist()], n_results=top_k, where=where_fn(i))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies), sorted(latencies)[int(0.95 * (len(latencies) - 1))]
+
+
+def open_collection(backend, path, index_type):
+    if backend == "faiss":
+        from app.embeddings.faiss_store import FaissCollection
+        return FaissCollection("bench", path, index_type=index_type)
+    client = chromadb.PersistentClient(path=path)
+    return client.create_collection("bench")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Filtered vs unfiltered top-k latency by collection size")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--chunks-per-file", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--top-k", type=int, default=3)
+    parser.add_argument("--backend", choices=["chroma", "faiss"], default="chroma")
+    parser.add_argument("--index-type", choices=["flat", "hnsw", "ivf"], default="hnsw",
+                        help="FAISS index type (ignored for chroma)")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    path = tempfile.mkdtemp(prefix=f"{args.backend}-bench-")
+    collection = open_collection(args.backend, path, args.index_type)
+
+    queries = rng.standard_normal((args.queries, DIM)).astype(np.float32)
+    inserted = 0
+    print(f"{'chunks':>10} | {'unfiltered p50/p95 ms':>22} | {'filtered p50/p95 ms':>20}")
+    try:
+        for size in sorted(args.sizes):
+            while inserted < size:
+                count = min(args.batch_size, size - inserted)
+                ids = [f"chunk_{inserted + i}" for i in range(count)]
+                metadatas = [{"file_id": f"file_{(inserted + i) // args.chunks_per_file}"} for i in range(count)]
+                vectors = rng.standard_normal((count, DIM)).astype(np.float32)
+                collection.add(ids=ids, embeddings=vectors.tolist(), metadatas=metadatas)
+                inserted += count
+
+            n_files = max(1, inserted // args.chunks_per_file)
+            unfiltered = timed_queries(collection, queries, args.top_k, lambda i: None)
+            filtered = timed_queries(collection, queries, args.top_k,
+                                     lambda i: {"file_id": f"file_{i % n_files}"})
+            print(f"{inserted:>10} | {unfiltered[0]:>10.2f} / {unfiltered[1]:<9.2f} | "
+                  f"{filtered[0]:>9.2f} / {filtered[1]:<9.2f}")
+    finally:
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Benchmark local faster-whisper transcription: real-time factor per model size.
+
+RTF = transcription wall time / audio duration. An RTF below 1.0 means the
+model transcribes faster than real time. With --reference, the benchmark also
+reports word error rate, so speed can be weighed against accuracy when
+choosing LOCAL_WHISPER_MODEL or a per-request transcription_model.
+
+Usage (from the `backend` directory):
+    python -m benchmarks.transcription_rtf --audio sample.mp3 --models tiny base small
+    python -m benchmarks.transcription_rtf --audio sample.mp3 --reference sample.txt --cpu-threads 4
+"""
+import argparse
+import re
+import time
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    ref = re.findall(r"[\w']+", reference.lower())
+    hyp = re.findall(r"[\w']+", hypothesis.lower())
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ref_word != hyp_word))
+        previous = current
+    return previous[-1] / max(1, len(ref))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real-time factor of faster-whisper by model size")
+    parser.add_argument("--audio", required=True)
+    parser.add_argument("--models", nargs="+", default=["tiny", "base", "small"])
+    parser.add_argument("--compute-type", default="int8")
+    parser.add_argument("--cpu-threads", type=int, default=2)
+    parser.add_argument("--beam-size", type=int, default=1)
+    parser.add_argument("--repeats", type=int, default=2)
+    parser.add_argument("--reference", help="Text file with the reference transcript, to report WER")
+    args = parser.parse_args()
+
+    from faster_whisper import WhisperModel
+
+    reference = open(args.reference).read() if args.reference else None
+    print(f"{'model':>10} | {'load s':>7} | {'audio s':>8} | {'best s':>7} | {'RTF':>6} | {'WER':>6}")
+    for model_size in args.models:
+        start = time.perf_counter()
+        model = WhisperModel(model_size, device="cpu", compute_type=args.compute_type, cpu_threads=args.cpu_threads)
+        load_seconds = time.perf_counter() - start
+
+        timings, text, duration = [], "", 0.0
+        for _ in range(args.repeats):
+            start = time.perf_counter()
+            segments, info = model.transcribe(args.audio, beam_size=args.beam_size, vad_filter=True)
+            text = " ".join(segment.text.strip() for segment in segments)  # Decoding happens here
+            timings.append(time.perf_counter() - start)
+            duration = info.duration
+
+        best = min(timings)
+        wer = f"{word_error_rate(reference, text):.3f}" if reference else "-"
+        print(f"{model_size:>10} | {load_seconds:>7.2f} | {duration:>8.1f} | {best:>7.2f} | "
+              f"{best / max(duration, 1e-9):>6.3f} | {wer:>6}")
+        del model
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,88 @@
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import Optional
+from typing import Dict, Optional
 
 
 class Settings(BaseSettings):
-    # Chroma settings (Required)
-    CHROMA_API_KEY: str
-    CHROMA_TENANT: str
-    CHROMA_DATABASE: str
+    # Chroma settings (Required when VECTOR_BACKEND is "chroma")
+    CHROMA_API_KEY: Optional[str] = ""
+    CHROMA_TENANT: Optional[str] = ""
+    CHROMA_DATABASE: Optional[str] = ""
+
+    # Vector backend: "chroma" (Chroma Cloud) or "faiss" (local, on disk)
+    VECTOR_BACKEND: str = "chroma"
+    FAISS_INDEX_DIR: str = "data/faiss"
+    FAISS_INDEX_TYPE: str = "hnsw"  # "flat", "hnsw" or "ivf"
+    FAISS_HNSW_M: int = 32
+    FAISS_HNSW_EF_SEARCH: int = 64
+    FAISS_IVF_NLIST: int = 1024
+    FAISS_IVF_NPROBE: int = 16
+    FAISS_PERSIST_EVERY: int = 50000  # Changed vectors before the index file is rewritten
+    FAISS_PERSIST_SECONDS: float = 60.0  # Or after this long; always on shutdown
+
+    # Embedding engine: "torch" (SentenceTransformer) or "onnx" (int8 ONNX Runtime export)
+    EMBEDDING_ENGINE: str = "torch"
+    EMBEDDING_ONNX_DIR: str = "data/onnx/all-MiniLM-L6-v2"
+    EMBEDDING_ONNX_THREADS: int = 0  # 0 lets ONNX Runtime choose
+    EMBEDDING_ONNX_MIN_COSINE: float = 0.98  # Required torch/ONNX agreement (tests/test_onnx_engine.py)
+    EMBEDDING_MAX_SEQ_LENGTH: int = 256  # all-MiniLM-L6-v2's max_seq_length
+    EMBEDDING_BULK_TOKEN_BUDGET: int = 8192  # Padded tokens per batch for ingestion-time embedding
+    EMBEDDING_BULK_MAX_BATCH_SIZE: int = 128
+
+    # Transcription: long audio is split at silences and transcribed in parallel segments
+    TRANSCRIPTION_PROVIDER: str = "groq"
+    TRANSCRIPTION_MODEL: str = "whisper-large-v3"
+    TRANSCRIPTION_SEGMENT_SECONDS: float = 300.0  # Target segment length; cuts snap to nearby silence
+    TRANSCRIPTION_MAX_SEGMENT_SECONDS: float = 600.0  # Audio up to this length is sent in one call
+    TRANSCRIPTION_OVERLAP_SECONDS: float = 2.0
+    TRANSCRIPTION_MAX_CONCURRENCY: int = 4
+    TRANSCRIPTION_MIN_SILENCE_MS: int = 500
+    TRANSCRIPTION_SILENCE_OFFSET_DB: float = -16.0  # Silence threshold relative to the file's average loudness
+
+    # Local transcription (TRANSCRIPTION_PROVIDER="local"): faster-whisper in a process pool
+    LOCAL_WHISPER_MODEL: str = "base"  # tiny, base, small, medium, large-v3 ...
+    LOCAL_WHISPER_MODEL_DIR: str = ""  # Download/cache dir; pre-populate it for air-gapped hosts
+    LOCAL_WHISPER_COMPUTE_TYPE: str = "int8"
+    LOCAL_WHISPER_WORKERS: int = 0  # 0 = cores // LOCAL_WHISPER_CPU_THREADS
+    LOCAL_WHISPER_CPU_THREADS: int = 2
+    LOCAL_WHISPER_MAX_QUEUE: int = 16
+    LOCAL_WHISPER_BEAM_SIZE: int = 1
+    LOCAL_WHISPER_PRELOAD: bool = True
+
+    # Uploads are spooled to disk in chunks; larger ones are rejected with 413
+    MAX_UPLOAD_BYTES: int = 200 * 1024 * 1024
+    UPLOAD_SPOOL_DIR: str = ""  # Empty uses the system temp dir
+    UPLOAD_CHUNK_BYTES: int = 1024 * 1024
+
+    # Background ingestion jobs, persisted in Postgres (POST /jobs/ingest/..., GET /jobs/{job_id})
+    JOB_WORKERS: int = 2  # Jobs run concurrently inside the API process; 0 leaves them to `python -m app.jobs.worker`
+    JOB_WORKER_CONCURRENCY: int = 4  # Default for dedicated worker processes
+    JOB_POLL_SECONDS: float = 1.0  # Idle workers check for queued jobs this often
+    JOB_HEARTBEAT_SECONDS: float = 15.0
+    JOB_STALE_SECONDS: float = 120.0  # Running jobs without a heartbeat this long are requeued
+    JOB_MAX_ATTEMPTS: int = 3
+    JOB_UPLOAD_DIR: str = "data/uploads"  # Spooled audio for queued jobs; share it with worker processes
+    JOB_EVENTS_POLL_SECONDS: float = 0.5  # SSE progress refresh interval
+
+    # Streaming ingestion: chunks per batch and batches buffered between stages
+    INGEST_BATCH_SIZE: int = 64
+    INGEST_QUEUE_SIZE: int = 4
+
+    # Batch (URL list / playlist) ingestion
+    BATCH_MAX_VIDEOS: int = 500
+    BATCH_INGEST_BATCH_SIZE: int = 256  # Chunks per embed/upsert batch, shared across videos
+    BATCH_FETCH_CONCURRENCY: int = 8  # Transcripts fetched at once
+    BATCH_HOST_RATE_PER_SECOND: float = 2.0  # Fetches per second per host; 0 disables the limit
+    BATCH_HOST_BURST: int = 4
+    BATCH_HOST_RATE_OVERRIDES: Dict[str, float] = {}  # e.g. {"youtube.com": 1.0}
+
+    # Query embedding micro-batching
+    EMBED_BATCH_MAX_SIZE: int = 32
+    EMBED_BATCH_MAX_WAIT_MS: float = 5.0
+
+    # Embedding cache: in-memory LRU, plus float16 vectors on disk when a directory is set
+    EMBEDDING_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    EMBEDDING_CACHE_DIR: str = ""
 
     # LLM Settings (Required)
     GROQ_API_KEY: str
@@ -17,6 +92,42 @@ class Settings(BaseSettings):
     OLLAMA_HOST: Optional[str] = "http://localhost:11434"
     OLLAMA_MODEL: Optional[str] = "llama3"
 
+    # Chat completion provider: "groq" or "ollama"
+    LLM_PROVIDER: str = "groq"
+    LLM_MODEL: str = "llama-3.3-70b-versatile"  # Groq model; Ollama uses OLLAMA_MODEL
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_HTTP2: bool = True
+    LLM_MAX_CONNECTIONS: int = 20
+    LLM_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    LLM_KEEPALIVE_EXPIRY_SECONDS: float = 120.0
+
+    # Hierarchical (map-reduce) summarization of long transcripts
+    SUMMARY_CONTEXT_TOKEN_BUDGET: int = 8000  # Above this the transcript is reduced first
+    SUMMARY_GROUP_TOKEN_BUDGET: int = 3000  # Transcript tokens per map call
+    SUMMARY_FAN_OUT: int = 6  # Partial summaries merged per reduce call
+    SUMMARY_MAX_CONCURRENCY: int = 4
+    SUMMARY_PARTIAL_MAX_TOKENS: int = 400
+
+    # Generated summaries, keyed by (file_id, prompt template version, model)
+    SUMMARY_CACHE_TTL_SECONDS: int = 7 * 24 * 3600  # 0 keeps summaries until invalidated
+    SUMMARY_CACHE_MEMORY_ITEMS: int = 256  # In-process tier in front of the summaries table
+    SUMMARY_CACHE_MEMORY_TTL_SECONDS: float = 300.0  # Bounds staleness after another process invalidates
+
+    # Semantic answer cache: near-duplicate questions about a file reuse an earlier answer (per process)
+    ANSWER_CACHE_ENABLED: bool = True
+    ANSWER_CACHE_SIMILARITY: float = 0.92  # Cosine similarity between query embeddings
+    ANSWER_CACHE_TTL_SECONDS: float = 3600.0
+    ANSWER_CACHE_MAX_ENTRIES: int = 2048
+    ANSWER_CACHE_MAX_PER_FILE: int = 64
+    ANSWER_CACHE_VERIFY_CONTEXT: bool = True  # Hit only if the same chunks were retrieved (costs the search)
+
+    # Chat history write-behind: messages are queued and inserted in batches off the request path.
+    # Off by default: a crash loses the messages queued at that moment (see app.retriever.history_writer)
+    CHAT_HISTORY_WRITE_BEHIND: bool = False
+    CHAT_HISTORY_FLUSH_BATCH_SIZE: int = 256
+    CHAT_HISTORY_FLUSH_INTERVAL_MS: float = 200.0
+    CHAT_HISTORY_FLUSH_RETRIES: int = 5  # Failed flushes of a batch before it is dropped
+
     # Database Settings
     DATABASE_URI: str  # Main connection string (Required)
     
@@ -27,6 +138,28 @@ class Settings(BaseSettings):
     POSTGRES_DB: Optional[str] = "summarizer_db"
     POSTGRES_HOST: Optional[str] = "localhost"
 
+    # Connection pool, shared by the sync engine and the async (asyncpg) one
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT_SECONDS: float = 30.0  # Wait for a free connection before failing
+    DB_POOL_RECYCLE_SECONDS: int = 3600
+    DB_POOL_PRE_PING: bool = True  # One round trip per checkout; turn off on a reliable network
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 keeps the server default
+    DB_ASYNC: bool = False  # Chat history through asyncpg instead of I/O pool threads
+
+    # Executor pools for blocking work called from async endpoints
+    CPU_POOL_WORKERS: int = 1  # Embedding; torch already uses intra-op threads
+    CPU_POOL_MAX_QUEUE: int = 8
+    IO_POOL_WORKERS: int = 16  # LLM, Chroma and database calls
+    IO_POOL_MAX_QUEUE: int = 64
+
+    # Startup warmup; /ready fails until it completes
+    WARMUP_ENABLED: bool = True
+    WARMUP_BATCH_SIZE: int = 8  # Dummy batch size used to allocate model kernels
+    WARMUP_DB_CONNECTIONS: int = 5  # Matches DB_POOL_SIZE
+    WARMUP_RETRIES: int = 3  # Failed attempts before failures are reported as errors; retries continue
+    WARMUP_MAX_BACKOFF_SECONDS: float = 60.0
+
     class Config:
         env_file = ".env"
         case_sensitive = True
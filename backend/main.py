@@ -1,25 +1,61 @@
 """Main FastAPI application for the Summarizer backend."""
+import asyncio
 import time
 from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.views.endpoints import router
 from contextlib import asynccontextmanager
-from app.dependencies import get_embedding_manager
+from app.dependencies import get_embedding_manager, get_db_manager
+from app.ingestion.manifest import get_content_manifest
+from app.executors import shutdown_pools, pool_stats, run_io
+from app.llm.registry import init_llm_registry, close_llm_registry
+from app.embeddings.backends import close_collections
+from app.embeddings.cache import peek_embedding_cache
+from app.embeddings.batcher import peek_query_batcher, close_query_batcher
+from app.warmup import warm_up, get_warmup_state
+from app.transcription.engine import peek_transcriber, close_transcriber
+from app.jobs.worker import start_job_workers, stop_job_workers, get_job_workers
+from app.retriever.summary_cache import peek_summary_cache
+from app.retriever.answer_cache import peek_answer_cache
+from app.retriever.history_writer import peek_history_writer, close_history_writer
+from app.db.async_manager import peek_async_db_manager, close_async_db_manager
+from config import get_settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     print("🚀 Starting Summarizer API...")
-    
-    # # Pre-load embedding model at startup
-    # print("📦 Pre-loading embedding model...")
-    # embedding_manager = get_embedding_manager()
-    # _ = embedding_manager.model  # Trigger model loading
-    # print("✅ Embedding model loaded successfully!")
-    
+    init_llm_registry(get_settings())
+
+    # Load the content manifest so chat requests don't probe the vector store
+    try:
+        await run_io(get_content_manifest().load, get_db_manager(get_settings()))
+    except Exception as e:
+        print(f"⚠️  Content manifest not loaded, falling back to lookups: {e}")
+
+    # Warm up in the background; /ready stays 503 until it finishes
+    warmup_task = asyncio.create_task(warm_up(get_settings()))
+
+    # In-process ingestion job workers (JOB_WORKERS=0 leaves jobs to `python -m app.jobs.worker`)
+    try:
+        await start_job_workers(get_settings())
+    except Exception as e:
+        print(f"⚠️  Job workers not started, queued jobs wait for a worker process: {e}")
+
     yield
     
     print("👋 Shutting down Summarizer API...")
+    warmup_task.cancel()
+    await stop_job_workers()
+    # Commit queued chat messages while the I/O pool is still up
+    await close_history_writer()
+    await close_async_db_manager()
+    await close_query_batcher()
+    await close_transcriber()
+    await close_llm_registry()
+    close_collections()
+    shutdown_pools(wait=True)
 
 app = FastAPI(title="Summarizer API", lifespan=lifespan)
 
@@ -42,6 +78,15 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/ready")
+async def readiness_check():
+    """Readiness: 200 once the model, vector store and DB pool are warm, 503 before."""
+    state = get_warmup_state()
+    return JSONResponse(
+        status_code=200 if state.ready else 503,
+        content={"status": "ready" if state.ready else "warming_up", **state.to_dict()}
+    )
+
 # Add this to backend/main.py
 
 @app.get("/test/chroma")
@@ -91,5 +136,17 @@ async def get_metrics():
     return {
         "embedding_manager_loaded": _embedding_manager is not None,
         "db_manager_loaded": _db_manager is not None,
-        "model_cached": _embedding_manager._model is not None if _embedding_manager else False
+        "model_cached": _embedding_manager._model is not None if _embedding_manager else False,
+        "manifest_entries": len(get_content_manifest()),
+        "embedding_cache": peek_embedding_cache().stats() if peek_embedding_cache() else None,
+        "query_batcher": peek_query_batcher().stats() if peek_query_batcher() else None,
+        "summary_cache": peek_summary_cache().stats() if peek_summary_cache() else None,
+        "answer_cache": peek_answer_cache().stats() if peek_answer_cache() else None,
+        "history_writer": peek_history_writer().stats() if peek_history_writer() else None,
+        "transcription": peek_transcriber().stats() if peek_transcriber() else None,
+        "executor_pools": pool_stats(),
+        "db_pool": _db_manager.pool_stats() if _db_manager else None,
+        "async_db_pool": peek_async_db_manager().pool_stats() if peek_async_db_manager() else None,
+        "warmup": get_warmup_state().to_dict(),
+        "job_workers": get_job_workers().stats() if get_job_workers() else None
     }
\ No newline at end of file
@@ -0,0 +1,27 @@
+"""
+Migration script to add the (file_id, created_at, id) index on conversations,
+used by the newest-first, keyset-paginated chat history query.
+
+The index is built CONCURRENTLY, so chats keep being written while it runs.
+
+Usage (from the `backend` directory):
+    python -m migrations.chat_history_index
+"""
+
+from sqlalchemy import text
+
+from migrations.ingestion_cache import engine
+
+
+def create_chat_history_index():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("""
+            CREATE INDEX CONCURRENTLY IF NOT EXISTS ix_conversations_file_id_created_at
+            ON conversations(file_id, created_at, id)
+        """))
+    print("✅ Index on conversations(file_id, created_at, id) ready")
+
+
+if __name__ == "__main__":
+    create_chat_history_index()
@@ -0,0 +1,30 @@
+"""
+Migration script to add chunk_count to the youtube and audio tables,
+used by the in-process content manifest.
+
+Rows ingested before this migration keep chunk_count NULL, which the
+manifest treats as "has content, count unknown".
+
+Usage (from the `backend` directory):
+    python -m migrations.content_manifest
+"""
+
+from sqlalchemy import text
+
+from migrations.ingestion_cache import engine, check_column_exists
+
+
+def add_chunk_count_columns():
+    for table_name in ("youtube", "audio"):
+        if check_column_exists(table_name, "chunk_count"):
+            print(f"✅ {table_name}.chunk_count already exists")
+            continue
+
+        with engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN chunk_count INTEGER"))
+            conn.commit()
+        print(f"✅ Added {table_name}.chunk_count")
+
+
+if __name__ == "__main__":
+    add_chunk_count_columns()
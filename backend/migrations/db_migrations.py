@@ -5,7 +5,7 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from sqlalchemy import create_engine
 from app.db.sql_alchelmy import Base
-from app.db.models import ChatHistory, Youtube, Audio  # Import your models
+from app.db.models import ChatHistory, Youtube, Audio, Summary, IngestionJob  # Import your models
 
 load_dotenv()
 
@@ -0,0 +1,87 @@
+"""
+Migration script to add the ingestion cache column audio.content_hash (unique).
+
+Run this AFTER updating the models.py file.
+"""
+
+import sys
+import os
+from dotenv import load_dotenv
+
+# Add parent directory to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import create_engine, text
+
+load_dotenv()
+
+DATABASE_URI = os.getenv("DATABASE_URI")
+if not DATABASE_URI:
+    raise ValueError("DATABASE_URI not set in environment variables")
+
+engine = create_engine(DATABASE_URI)
+
+COLUMNS = [
+    ("audio", "content_hash", "VARCHAR"),
+]
+
+
+def check_column_exists(table_name: str, column_name: str) -> bool:
+    """Check if a column exists in a table"""
+    with engine.connect() as conn:
+        result = conn.execute(text("""
+            SELECT column_name
+            FROM information_schema.columns
+            WHERE table_name = :table_name
+            AND column_name = :column_name
+        """), {"table_name": table_name, "column_name": column_name})
+        return result.fetchone() is not None
+
+
+def add_columns():
+    """Add the cache columns if they don't exist"""
+    for table_name, column_name, column_type in COLUMNS:
+        if check_column_exists(table_name, column_name):
+            print(f"✅ {table_name}.{column_name} already exists")
+            continue
+
+        with engine.connect() as conn:
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_name} {column_type}"))
+            conn.commit()
+        print(f"✅ Added {table_name}.{column_name}")
+
+
+def add_indexes():
+    """Unique index so one upload hash maps to one file_id"""
+    with engine.connect() as conn:
+        conn.execute(text("""
+            CREATE UNIQUE INDEX IF NOT EXISTS ix_audio_content_hash
+            ON audio(content_hash)
+        """))
+        conn.commit()
+    print("✅ Index on audio.content_hash ready")
+
+
+def run_migration():
+    """Run the complete migration"""
+    print("=" * 60)
+    print("Starting Ingestion Cache Migration")
+    print("=" * 60)
+
+    try:
+        add_columns()
+        add_indexes()
+
+        print("\n" + "=" * 60)
+        print("✅ Migration completed successfully!")
+        print("=" * 60)
+
+    except Exception as e:
+        print("\n" + "=" * 60)
+        print(f"❌ Migration failed: {e}")
+        print("=" * 60)
+        raise
+
+
+if __name__ == "__main__":
+    run_migration()
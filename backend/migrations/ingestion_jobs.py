@@ -0,0 +1,22 @@
+"""
+Migration script to create the ingestion_jobs table used by the background
+ingestion job queue (POST /jobs/ingest/..., GET /jobs/{job_id}).
+
+Usage (from the `backend` directory):
+    python -m migrations.ingestion_jobs
+"""
+
+from app.db.sql_alchelmy import Base
+from app.db.models import IngestionJob
+
+from migrations.ingestion_cache import engine
+
+
+def create_jobs_table():
+    # checkfirst: existing tables (and their indexes) are left alone
+    Base.metadata.create_all(bind=engine, tables=[IngestionJob.__table__], checkfirst=True)
+    print("✅ ingestion_jobs table ready")
+
+
+if __name__ == "__main__":
+    create_jobs_table()
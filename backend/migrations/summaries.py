@@ -0,0 +1,35 @@
+"""
+Migration script to create the summaries table used by the summary cache
+(keyed by file_id, prompt template version and model), and to drop the
+youtube.summary and audio.summary columns it replaces.
+
+Usage (from the `backend` directory):
+    python -m migrations.summaries
+"""
+
+from sqlalchemy import text
+
+from app.db.sql_alchelmy import Base
+from app.db.models import Summary
+
+from migrations.ingestion_cache import engine
+
+
+def create_summaries_table():
+    # checkfirst: existing tables (and their indexes) are left alone
+    Base.metadata.create_all(bind=engine, tables=[Summary.__table__], checkfirst=True)
+    print("✅ summaries table ready")
+
+
+def drop_summary_columns():
+    """Summaries now live in the summaries table; nothing reads these columns."""
+    with engine.connect() as conn:
+        for table_name in ("youtube", "audio"):
+            conn.execute(text(f"ALTER TABLE {table_name} DROP COLUMN IF EXISTS summary"))
+        conn.commit()
+    print("✅ youtube.summary and audio.summary dropped")
+
+
+if __name__ == "__main__":
+    create_summaries_table()
+    drop_summary_columns()
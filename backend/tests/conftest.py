@@ -0,0 +1,5 @@
+"""Tests run offline: required settings get placeholder values (nothing here connects to them)."""
+import os
+
+os.environ.setdefault("DATABASE_URI", "postgresql://summarizer@localhost/summarizer_test")
+os.environ.setdefault("GROQ_API_KEY", "test")
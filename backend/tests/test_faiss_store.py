@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from app.embeddings.faiss_store import FaissCollection
+
+DIM = 16
+
+
+def vectors(count: int, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).normal(size=(count, DIM)).astype(np.float32)
+
+
+def chunks(file_id: str, embeddings: np.ndarray):
+    ids = [f"{file_id}_{i}" for i in range(len(embeddings))]
+    metadatas = [{"file_id": file_id, "chunk_index": i} for i in range(len(embeddings))]
+    documents = [f"{file_id} chunk {i}" for i in range(len(embeddings))]
+    return ids, metadatas, documents
+
+
+@pytest.fixture(params=["flat", "hnsw", "ivf"])
+def index_type(request):
+    return request.param
+
+
+def open_collection(path, index_type: str, **kwargs) -> FaissCollection:
+    # A small nlist so the IVF collection trains (39 * nlist vectors) within the test
+    return FaissCollection("test", str(path), index_type=index_type, ivf_nlist=2, ivf_nprobe=2, **kwargs)
+
+
+def test_upsert_query_filter_delete(tmp_path, index_type):
+    collection = open_collection(tmp_path, index_type)
+    a, b = vectors(60, seed=1), vectors(40, seed=2)
+    ids, metadatas, documents = chunks("a", a)
+    collection.upsert(ids=ids, embeddings=a, metadatas=metadatas, documents=documents)
+    ids, metadatas, documents = chunks("b", b)
+    collection.upsert(ids=ids, embeddings=b, metadatas=metadatas, documents=documents)
+    assert collection.count() == 100
+
+    # A stored vector is its own nearest neighbour
+    result = collection.query(query_embeddings=[a[7]], n_results=3)
+    assert result["ids"][0][0] == "a_7"
+    assert result["distances"][0][0] == pytest.approx(0.0, abs=1e-5)
+
+    # Filtering by file_id only returns that file's chunks, even for another file's vector
+    result = collection.query(query_embeddings=[a[7]], n_results=5, where={"file_id": "b"})
+    assert len(result["ids"][0]) == 5
+    assert all(metadata["file_id"] == "b" for metadata in result["metadatas"][0])
+
+    # Upserting an existing id replaces it instead of adding a second copy
+    collection.upsert(ids=["b_0"], embeddings=b[:1], metadatas=[{"file_id": "b"}], documents=["replaced"])
+    assert collection.count() == 100
+    assert collection.get(ids=["b_0"])["documents"] == ["replaced"]
+
+    collection.delete(where={"file_id": "a"})
+    assert collection.count() == 40
+    result = collection.query(query_embeddings=[a[7]], n_results=5)
+    assert all(doc_id.startswith("b_") for doc_id in result["ids"][0])
+    assert collection.query(query_embeddings=[a[7]], n_results=5, where={"file_id": "a"})["ids"] == [[]]
+    collection.close()
+
+
+def test_reopen_from_disk(tmp_path, index_type):
+    collection = open_collection(tmp_path, index_type)
+    embeddings = vectors(100, seed=3)
+    ids, metadatas, documents = chunks("a", embeddings)
+    collection.upsert(ids=ids, embeddings=embeddings, metadatas=metadatas, documents=documents)
+    collection.delete(ids=["a_1"])
+    collection.close()
+
+    reopened = open_collection(tmp_path, index_type)
+    assert reopened.count() == 99
+    result = reopened.query(query_embeddings=[embeddings[42]], n_results=1, where={"file_id": "a"})
+    assert result["ids"] == [["a_42"]]
+    assert reopened.get(ids=["a_1"])["ids"] == []
+
+    # Still writable after reopening (mmap-opened IVF is reloaded in memory)
+    reopened.upsert(ids=["a_1"], embeddings=embeddings[1:2], metadatas=[{"file_id": "a"}], documents=["again"])
+    assert reopened.query(query_embeddings=[embeddings[1]], n_results=1)["ids"] == [["a_1"]]
+    reopened.close()
+
+
+def test_unpersisted_rows_dropped_after_crash(tmp_path):
+    collection = open_collection(tmp_path, "flat", persist_every=10_000, persist_seconds=3600)
+    embeddings = vectors(20, seed=4)
+    ids, metadatas, documents = chunks("a", embeddings)
+    collection.upsert(ids=ids[:10], embeddings=embeddings[:10], metadatas=metadatas[:10], documents=documents[:10])
+    collection.flush()
+    collection.upsert(ids=ids[10:], embeddings=embeddings[10:], metadatas=metadatas[10:], documents=documents[10:])
+    # Simulated crash: the sidecar is closed without writing the index
+    collection._db.close()
+
+    reopened = open_collection(tmp_path, "flat")
+    assert reopened.count() == 10
+    assert reopened.query(query_embeddings=[embeddings[15]], n_results=1)["ids"][0][0] in ids[:10]
+    reopened.close()
+
+
+@pytest.mark.parametrize("index_type", ["flat", "ivf"])
+def test_crash_during_reingest_keeps_persisted_chunks(tmp_path, index_type):
+    collection = open_collection(tmp_path, index_type, persist_every=10_000, persist_seconds=3600)
+    old, new = vectors(100, seed=5), vectors(100, seed=6)
+    ids, metadatas, documents = chunks("a", old)
+    collection.upsert(ids=ids, embeddings=old, metadatas=metadatas, documents=documents)
+    collection.flush()
+    # Re-ingest removes the old vectors and rows, then crashes before the index is written
+    collection.upsert(ids=ids, embeddings=new, metadatas=metadatas, documents=["new"] * len(ids))
+    collection._db.close()
+
+    reopened = open_collection(tmp_path, index_type)
+    assert reopened.count() == 100
+    result = reopened.query(query_embeddings=[old[42]], n_results=1, where={"file_id": "a"})
+    assert result["ids"] == [["a_42"]]
+    assert result["documents"] == [["a chunk 42"]]
+    reopened.close()
+
+
+def test_ingested_row_implies_durable_vectors(tmp_path, monkeypatch):
+    """A crash right after ingestion: if the audio row was recorded, its vectors survive."""
+    import asyncio
+
+    from app.embeddings import vectorstore
+    from app.ingestion.pipeline import IngestionPipeline, ingest_text_stream
+
+    class Embedder:
+        def create_embeddings_bulk(self, texts):
+            return vectors(len(texts), seed=len(texts))
+
+    class Splitter:
+        def iter_text_chunks(self, text):
+            return iter(text.split("|"))
+
+    class Rows:
+        def __init__(self):
+            self.rows = []
+
+        def insert_ignore(self, model, data):
+            self.rows.append(data)
+            return True
+
+    collection = open_collection(tmp_path, "flat", persist_every=10_000, persist_seconds=3600)
+    monkeypatch.setattr(vectorstore, "get_collection", lambda name: collection)
+    rows = Rows()
+    store = vectorstore.VectorStore("audio", db_manager=rows)
+    text = "|".join(f"sentence {i}" for i in range(150))
+    result = asyncio.run(ingest_text_stream("talk.mp3", text, "abcdef0123456789", Splitter(), store,
+                                            IngestionPipeline(Embedder(), batch_size=64)))
+    collection._db.close()  # Crash: nothing else is written
+
+    reopened = open_collection(tmp_path, "flat")
+    assert [row.file_id for row in rows.rows] == [result["file_id"]]
+    assert reopened.count() == result["chunk_count"] == 150
+    reopened.close()
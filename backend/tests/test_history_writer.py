@@ -0,0 +1,77 @@
+"""ChatHistoryWriter against an in-memory stand-in for DBManager.bulk_insert."""
+import asyncio
+import time
+
+from app.retriever.history_writer import ChatHistoryWriter
+from app.schema import ChatHistorySchema
+
+
+class FlakyDB:
+    """Records inserted rows; fails the first `failures` inserts, each after `delay` seconds."""
+
+    def __init__(self, failures: int = 0, delay: float = 0.0):
+        self.failures = failures
+        self.delay = delay
+        self.rows = []
+
+    def bulk_insert(self, model, items):
+        time.sleep(self.delay)
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("Failed to insert data: connection lost")
+        self.rows.extend(items)
+        return len(items)
+
+
+def message(file_id: str, text: str) -> ChatHistorySchema:
+    return ChatHistorySchema(role="user", message=text, file_id=file_id)
+
+
+def test_flush_writes_in_order_and_pending_empties():
+    async def scenario():
+        db = FlakyDB()
+        writer = ChatHistoryWriter(db, flush_interval_ms=10_000)
+        writer.enqueue([message("a", "1"), message("b", "2"), message("a", "3")])
+        assert [entry.message for entry in writer.pending("a")] == ["1", "3"]
+        await writer.flush()
+        assert writer.pending("a") == []
+        await writer.aclose()
+        return db
+
+    db = asyncio.run(scenario())
+    assert [row.message for row in db.rows] == ["1", "2", "3"]
+
+
+def test_discard_drops_queued_and_failed_in_flight_rows():
+    async def scenario():
+        # The in-flight batch fails once; its retry must not bring back the deleted file's rows
+        db = FlakyDB(failures=1, delay=0.05)
+        writer = ChatHistoryWriter(db, flush_interval_ms=10_000)
+        writer.enqueue([message("gone", "1"), message("kept", "2")])
+        flushing = asyncio.create_task(writer.flush())
+        await asyncio.sleep(0.01)  # First batch is now in flight
+        writer.enqueue([message("gone", "3")])
+        assert await writer.discard("gone") == 1
+        await flushing
+        await writer.flush()
+        await writer.aclose()
+        return db
+
+    db = asyncio.run(scenario())
+    assert [(row.file_id, row.message) for row in db.rows] == [("kept", "2")]
+
+
+def test_dropped_and_shutdown_losses_are_counted():
+    async def scenario():
+        db = FlakyDB(failures=3)
+        writer = ChatHistoryWriter(db, max_batch_size=2, flush_interval_ms=10_000, max_retries=1)
+        writer.enqueue([message("a", "1"), message("a", "2")])
+        await writer.flush()  # Fails and is requeued
+        await writer.flush()  # Fails again and is dropped
+        writer.enqueue([message("a", "3"), message("a", "4"), message("a", "5")])
+        await writer.aclose()  # The one attempt at shutdown drops its batch; the rest is never tried
+        return db, writer.stats()
+
+    db, stats = asyncio.run(scenario())
+    assert db.rows == []
+    assert (stats["retries"], stats["dropped"], stats["lost_at_shutdown"]) == (1, 4, 1)
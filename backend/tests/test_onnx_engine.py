@@ -0,0 +1,51 @@
+"""The int8 ONNX export must produce vectors interchangeable with the torch model's."""
+import os
+
+import numpy as np
+import pytest
+
+from app.embeddings.engines import ONNX_MODEL_FILE, load_encoder
+from config import settings
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+CORPUS = [
+    "The speaker explains how transformers attend to context.",
+    "Retrieval augmented generation is compared with fine tuning.",
+    "Latency and memory tradeoffs for small models on commodity CPUs.",
+    "In this episode we interview the founder about the first product launch.",
+    "Photosynthesis converts light energy into chemical energy stored in glucose.",
+    "The lecture walks through the proof of the central limit theorem step by step.",
+    "Short query",
+    " ".join(["a much longer transcript chunk that goes past the truncation length"] * 40),
+]
+
+
+@pytest.fixture(scope="module")
+def onnx_encoder():
+    if not os.path.exists(os.path.join(settings.EMBEDDING_ONNX_DIR, ONNX_MODEL_FILE)):
+        pytest.skip(f"No ONNX export in {settings.EMBEDDING_ONNX_DIR} (run app.embeddings.onnx_export)")
+    pytest.importorskip("onnxruntime")
+    return load_encoder("onnx", MODEL_NAME, settings.EMBEDDING_ONNX_DIR, settings.EMBEDDING_MAX_SEQ_LENGTH)
+
+
+@pytest.fixture(scope="module")
+def torch_encoder():
+    pytest.importorskip("sentence_transformers")
+    try:
+        encoder = load_encoder("torch", MODEL_NAME)
+    except OSError as e:  # Model not in the local cache and no network
+        pytest.skip(f"{MODEL_NAME} not available: {e}")
+    encoder.max_seq_length = settings.EMBEDDING_MAX_SEQ_LENGTH
+    return encoder
+
+
+def test_onnx_vectors_match_torch(onnx_encoder, torch_encoder):
+    onnx_vectors = onnx_encoder.encode(CORPUS, batch_size=4)
+    torch_vectors = np.asarray(torch_encoder.encode(CORPUS, batch_size=4, normalize_embeddings=True),
+                               dtype=np.float32)
+    assert onnx_vectors.shape == torch_vectors.shape
+
+    # Both are unit length, so the row-wise dot product is the cosine similarity
+    cosine = (onnx_vectors * torch_vectors).sum(axis=1)
+    assert cosine.min() >= settings.EMBEDDING_ONNX_MIN_COSINE, f"cosine per text: {np.round(cosine, 4)}"
@@ -201,6 +201,44 @@ def stream_chat_response(query:str, file_id: str,
         yield f"Error: {str(e)}"
 
 
+# Ingestion job stages reported by the backend -> (label, progress %)
+JOB_STAGES = {
+    "queued": ("⏳ Waiting for a worker...", 5),
+    "checking_cache": ("🔎 Checking for earlier results...", 10),
+    "transcribing": ("🎙️ Transcribing audio...", 30),
+    "ingesting": ("📥 Fetching transcript and indexing...", 55),
+    "summarizing": ("✍️ Generating summary...", 80),
+}
+
+
+def run_ingestion_job(endpoint: str, progress_bar, status_text,
+                      max_wait: int = 1800, **kwargs) -> Optional[Dict[Any, Any]]:
+    """Submit an ingestion job, then poll it (short requests) until it finishes"""
+    job = make_request("POST", endpoint, **kwargs)
+    if not job or not job.get("job_id"):
+        return None
+
+    job_id = job["job_id"]
+    deadline = time.time() + max_wait
+    while time.time() < deadline:
+        job = make_request("GET", f"/jobs/{job_id}")
+        if job is None:
+            return None
+        if job["status"] == "succeeded":
+            return {**job["result"], "status": "success"}
+        if job["status"] == "failed":
+            st.error(f"❌ {job.get('error')}")
+            return None
+
+        label, percent = JOB_STAGES.get(job.get("stage") or job["status"], ("⚙️ Processing...", 50))
+        status_text.text(label)
+        progress_bar.progress(percent)
+        time.sleep(1)
+
+    st.error(f"⏱️ Still processing after {max_wait // 60} minutes (job {job_id}). Please try again later.")
+    return None
+
+
 # Sidebar
 with st.sidebar:
     st.markdown("<div class='main-header'>🎥 Smart Summarizer</div>", unsafe_allow_html=True)
@@ -412,18 +450,12 @@ else:
                     progress_bar = st.progress(0)
                     status_text = st.empty()
 
-                    status_text.text("📥 Fetching video transcript...")
-                    progress_bar.progress(25)
-
                     with st.spinner("Processing..."):
-                        result = make_request("POST", "/ingest/youtube/",
-                                              json={
-                                                  "url": youtube_url,
-                                                  "query": youtube_query or None
-                                              })
-                        
-                        progress_bar.progress(75)
-                        status_text.text("Generating summary...")
+                        result = run_ingestion_job("/jobs/ingest/youtube/", progress_bar, status_text,
+                                                   json={
+                                                       "url": youtube_url,
+                                                       "query": youtube_query or None
+                                                   })
 
                         if result and result.get("status") == "success":
                             progress_bar.progress(100)
@@ -480,9 +512,6 @@ else:
                     progress_bar = st.progress(0)
                     status_text = st.empty()
 
-                    status_text.text("🎙️ Transcribing audio...")
-                    progress_bar.progress(25)
-
                     try:
                         # Reset file pointer to beginning
                         audio_file.seek(0)
@@ -495,9 +524,8 @@ else:
                         
                         with st.spinner("This may take a few minutes..."):
 
-                            result = make_request("POST", "/ingest/audio/", files=files, data=data)
-                            progress_bar.progress(75)
-                            status_text.text("Generating summary...")
+                            result = run_ingestion_job("/jobs/ingest/audio/", progress_bar, status_text,
+                                                       files=files, data=data)
 
                             if result and result.get("status") == "success":
                                 progress_bar.progress(100)